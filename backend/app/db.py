@@ -1,56 +1,313 @@
 from __future__ import annotations
 
 import json
+import os
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
-DB_PATH = Path(__file__).resolve().parent.parent / "data.sqlite"
+from app.config import get_float, get_int
 
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data.sqlite"
+# Scripts and tests set this to pick a database; otherwise DB_PATH from the
+# environment applies.
+DB_PATH: Path | None = None
+DEFAULT_USER_ID = "default"
+SCHEMA_VERSION = 2
 
-def get_conn() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+DEFAULT_POOL_SIZE = 8
+DEFAULT_POOL_TIMEOUT = 10.0
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_CACHE_KB = 16384
+
+PROFILE_COLUMNS = (
+    "id, user_id, name, coins, level, xp, hunger, energy, hygiene, fun, mood, "
+    "last_updated"
+)
+PROFILE_TABLE = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        name TEXT NOT NULL,
+        coins INTEGER NOT NULL,
+        level INTEGER NOT NULL,
+        xp INTEGER NOT NULL,
+        hunger REAL NOT NULL,
+        energy REAL NOT NULL,
+        hygiene REAL NOT NULL,
+        fun REAL NOT NULL,
+        mood REAL NOT NULL,
+        last_updated TEXT NOT NULL
+    )
+"""
+
+
+class ConnectionPool:
+    def __init__(
+        self, path: Path, size: int, timeout: float, busy_timeout_ms: int, cache_kb: int
+    ) -> None:
+        self.path = path
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_kb = cache_kb
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections hop between threadpool workers, but only one holds a
+        # connection at a time, so the same-thread check is not needed.
+        conn = sqlite3.connect(
+            self.path, timeout=self.busy_timeout_ms / 1000, check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_kb)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._connect()
+                except BaseException:
+                    self._created -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Timed out waiting for a database connection")
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def db_path() -> Path:
+    # Resolved on use rather than at import, so DB_PATH from .env (loaded
+    # after the app modules are imported) still applies.
+    if DB_PATH is not None:
+        return DB_PATH
+    return Path(os.getenv("DB_PATH") or DEFAULT_DB_PATH)
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    path = db_path()
+    with _pool_lock:
+        if _pool is None or _pool.path != path:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(
+                path,
+                size=get_int("DB_POOL_SIZE", DEFAULT_POOL_SIZE),
+                timeout=get_float("DB_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT),
+                busy_timeout_ms=get_int("DB_BUSY_TIMEOUT_MS", DEFAULT_BUSY_TIMEOUT_MS),
+                cache_kb=get_int("DB_CACHE_KB", DEFAULT_CACHE_KB),
+            )
+        return _pool
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+@contextmanager
+def get_conn() -> Iterator[sqlite3.Connection]:
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        with conn:
+            yield conn
+    finally:
+        pool.release(conn)
+
+
+@contextmanager
+def write_transaction() -> Iterator[sqlite3.Connection]:
+    # BEGIN IMMEDIATE takes the write lock before the profile is read, so two
+    # requests on the same profile serialize instead of losing an update.
+    with get_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        yield conn
 
 
 def init_db() -> None:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    db_path().parent.mkdir(parents=True, exist_ok=True)
     with get_conn() as conn:
+        conn.execute(PROFILE_TABLE.format(name="profile"))
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS inventory (
+                profile_id INTEGER NOT NULL,
+                item_id TEXT NOT NULL,
+                PRIMARY KEY (profile_id, item_id)
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS equipment (
+                profile_id INTEGER NOT NULL,
+                slot TEXT NOT NULL,
+                item_id TEXT NOT NULL,
+                PRIMARY KEY (profile_id, slot)
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS profile_event (
+                profile_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                at TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (profile_id, seq)
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS profile_snapshot (
+                profile_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                PRIMARY KEY (profile_id, seq)
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS chat_session (
+                id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                summary TEXT NOT NULL DEFAULT '',
+                summarized_seq INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
         conn.execute(
             """
-            CREATE TABLE IF NOT EXISTS profile (
-                id INTEGER PRIMARY KEY,
-                name TEXT NOT NULL,
-                coins INTEGER NOT NULL,
-                level INTEGER NOT NULL,
-                xp INTEGER NOT NULL,
-                hunger REAL NOT NULL,
-                energy REAL NOT NULL,
-                hygiene REAL NOT NULL,
-                fun REAL NOT NULL,
-                mood REAL NOT NULL,
-                last_updated TEXT NOT NULL,
-                owned_items TEXT NOT NULL,
-                equipped_items TEXT NOT NULL
+            CREATE TABLE IF NOT EXISTS chat_message (
+                session_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                at TEXT NOT NULL,
+                PRIMARY KEY (session_id, seq)
             )
             """
         )
-        conn.commit()
+        _migrate(conn)
 
 
-def row_to_profile(row: sqlite3.Row) -> dict[str, Any]:
+def _migrate(conn: sqlite3.Connection) -> None:
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version < 1:
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(profile)")}
+        if "user_id" not in columns:
+            conn.execute("ALTER TABLE profile ADD COLUMN user_id TEXT")
+        # The single pre-existing profile becomes the default player.
+        conn.execute(
+            "UPDATE profile SET user_id = ? WHERE id = 1 AND user_id IS NULL",
+            (DEFAULT_USER_ID,),
+        )
+        conn.execute(
+            "UPDATE profile SET user_id = 'legacy-' || id WHERE user_id IS NULL"
+        )
+        conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_profile_user_id ON profile(user_id)"
+        )
+    if version < 2:
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(profile)")}
+        if "owned_items" in columns:
+            _migrate_item_blobs(conn)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def _migrate_item_blobs(conn: sqlite3.Connection) -> None:
+    # Moves the JSON item columns into the inventory/equipment tables, then
+    # rebuilds the profile table without them.
+    rows = conn.execute("SELECT id, owned_items, equipped_items FROM profile").fetchall()
+    for row in rows:
+        conn.executemany(
+            "INSERT OR IGNORE INTO inventory (profile_id, item_id) VALUES (?, ?)",
+            [(row["id"], item_id) for item_id in json.loads(row["owned_items"])],
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO equipment (profile_id, slot, item_id) VALUES (?, ?, ?)",
+            [
+                (row["id"], slot, item_id)
+                for slot, item_id in json.loads(row["equipped_items"]).items()
+            ],
+        )
+    conn.execute("DROP INDEX IF EXISTS idx_profile_user_id")
+    conn.execute(PROFILE_TABLE.format(name="profile_new"))
+    conn.execute(
+        f"INSERT INTO profile_new ({PROFILE_COLUMNS}) SELECT {PROFILE_COLUMNS} FROM profile"
+    )
+    conn.execute("DROP TABLE profile")
+    conn.execute("ALTER TABLE profile_new RENAME TO profile")
+    conn.execute("CREATE UNIQUE INDEX idx_profile_user_id ON profile(user_id)")
+
+
+def row_to_profile(conn: sqlite3.Connection, row: sqlite3.Row) -> dict[str, Any]:
     profile = dict(row)
-    profile["owned_items"] = json.loads(profile["owned_items"])
-    profile["equipped_items"] = json.loads(profile["equipped_items"])
+    profile["owned_items"] = [
+        item["item_id"]
+        for item in conn.execute(
+            "SELECT item_id FROM inventory WHERE profile_id = ? ORDER BY rowid",
+            (profile["id"],),
+        )
+    ]
+    profile["equipped_items"] = {
+        item["slot"]: item["item_id"]
+        for item in conn.execute(
+            "SELECT slot, item_id FROM equipment WHERE profile_id = ?", (profile["id"],)
+        )
+    }
     return profile
 
 
-def default_profile() -> dict[str, Any]:
+def default_profile(user_id: str = DEFAULT_USER_ID) -> dict[str, Any]:
     now = datetime.now(timezone.utc).isoformat()
     return {
-        "id": 1,
+        "id": None,
+        "user_id": user_id,
         "name": "Tom",
         "coins": 120,
         "level": 1,
@@ -66,30 +323,239 @@ def default_profile() -> dict[str, Any]:
     }
 
 
-def get_or_create_profile(conn: sqlite3.Connection) -> dict[str, Any]:
-    row = conn.execute("SELECT * FROM profile WHERE id = 1").fetchone()
-    if row:
-        return row_to_profile(row)
-    profile = default_profile()
-    upsert_profile(conn, profile)
+def load_profile(conn: sqlite3.Connection, user_id: str) -> dict[str, Any] | None:
+    row = conn.execute("SELECT * FROM profile WHERE user_id = ?", (user_id,)).fetchone()
+    return row_to_profile(conn, row) if row else None
+
+
+def profile_stamp(conn: sqlite3.Connection, user_id: str) -> str | None:
+    # Every mutation rewrites last_updated, so it doubles as a change marker.
+    row = conn.execute(
+        "SELECT last_updated FROM profile WHERE user_id = ?", (user_id,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def user_exists(conn: sqlite3.Connection, user_id: str) -> bool:
+    row = conn.execute("SELECT 1 FROM profile WHERE user_id = ?", (user_id,)).fetchone()
+    return row is not None
+
+
+def get_or_create_profile(conn: sqlite3.Connection, user_id: str) -> dict[str, Any]:
+    profile = load_profile(conn, user_id)
+    if profile is not None:
+        return profile
+    profile = default_profile(user_id)
+    if not insert_profile(conn, profile):
+        # A concurrent request created this user first.
+        return load_profile(conn, user_id)
     return profile
 
 
-def upsert_profile(conn: sqlite3.Connection, profile: dict[str, Any]) -> None:
-    conn.execute(
+def insert_profile(conn: sqlite3.Connection, profile: dict[str, Any]) -> bool:
+    cursor = conn.execute(
         """
-        INSERT OR REPLACE INTO profile (
-            id, name, coins, level, xp, hunger, energy, hygiene, fun, mood,
-            last_updated, owned_items, equipped_items
+        INSERT OR IGNORE INTO profile (
+            user_id, name, coins, level, xp, hunger, energy, hygiene, fun, mood,
+            last_updated
         ) VALUES (
-            :id, :name, :coins, :level, :xp, :hunger, :energy, :hygiene, :fun, :mood,
-            :last_updated, :owned_items, :equipped_items
+            :user_id, :name, :coins, :level, :xp, :hunger, :energy, :hygiene, :fun,
+            :mood, :last_updated
         )
         """,
-        {
-            **profile,
-            "owned_items": json.dumps(profile["owned_items"]),
-            "equipped_items": json.dumps(profile["equipped_items"]),
-        },
+        profile,
+    )
+    if cursor.rowcount == 0:
+        return False
+    profile["id"] = cursor.lastrowid
+    for item_id in profile["owned_items"]:
+        add_owned_item(conn, profile["id"], item_id)
+    for slot, item_id in profile["equipped_items"].items():
+        set_equipped_item(conn, profile["id"], slot, item_id)
+    return True
+
+
+def save_stats(conn: sqlite3.Connection, profile: dict[str, Any]) -> None:
+    conn.execute(
+        """
+        UPDATE profile SET
+            coins = :coins, level = :level, xp = :xp, hunger = :hunger,
+            energy = :energy, hygiene = :hygiene, fun = :fun, mood = :mood,
+            last_updated = :last_updated
+        WHERE id = :id
+        """,
+        profile,
+    )
+
+
+def add_owned_item(conn: sqlite3.Connection, profile_id: int, item_id: str) -> None:
+    conn.execute(
+        "INSERT OR IGNORE INTO inventory (profile_id, item_id) VALUES (?, ?)",
+        (profile_id, item_id),
+    )
+
+
+def set_equipped_item(
+    conn: sqlite3.Connection, profile_id: int, slot: str, item_id: str
+) -> None:
+    conn.execute(
+        """
+        INSERT INTO equipment (profile_id, slot, item_id) VALUES (?, ?, ?)
+        ON CONFLICT (profile_id, slot) DO UPDATE SET item_id = excluded.item_id
+        """,
+        (profile_id, slot, item_id),
+    )
+
+
+def last_event_seq(conn: sqlite3.Connection, profile_id: int) -> int | None:
+    row = conn.execute(
+        "SELECT MAX(seq) FROM profile_event WHERE profile_id = ?", (profile_id,)
+    ).fetchone()
+    return row[0]
+
+
+def append_events(
+    conn: sqlite3.Connection,
+    profile_id: int,
+    events: list[tuple[int, str, str, dict[str, Any]]],
+) -> None:
+    conn.executemany(
+        """
+        INSERT INTO profile_event (profile_id, seq, at, kind, payload)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        [
+            (profile_id, seq, at, kind, json.dumps(payload, separators=(",", ":")))
+            for seq, at, kind, payload in events
+        ],
+    )
+
+
+def load_events(
+    conn: sqlite3.Connection, profile_id: int, after_seq: int
+) -> list[tuple[int, str, str, dict[str, Any]]]:
+    rows = conn.execute(
+        """
+        SELECT seq, at, kind, payload FROM profile_event
+        WHERE profile_id = ? AND seq > ? ORDER BY seq
+        """,
+        (profile_id, after_seq),
+    )
+    return [
+        (row["seq"], row["at"], row["kind"], json.loads(row["payload"])) for row in rows
+    ]
+
+
+def save_snapshot(
+    conn: sqlite3.Connection, profile_id: int, seq: int, profile: dict[str, Any]
+) -> None:
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO profile_snapshot (profile_id, seq, state)
+        VALUES (?, ?, ?)
+        """,
+        (profile_id, seq, json.dumps(profile)),
+    )
+
+
+def load_snapshot(
+    conn: sqlite3.Connection, profile_id: int
+) -> tuple[int, dict[str, Any]] | None:
+    row = conn.execute(
+        """
+        SELECT seq, state FROM profile_snapshot
+        WHERE profile_id = ? ORDER BY seq DESC LIMIT 1
+        """,
+        (profile_id,),
+    ).fetchone()
+    return (row["seq"], json.loads(row["state"])) if row else None
+
+
+def load_chat_session(
+    conn: sqlite3.Connection, session_id: str, user_id: str
+) -> sqlite3.Row | None:
+    return conn.execute(
+        """
+        SELECT id, summary, summarized_seq FROM chat_session
+        WHERE id = ? AND user_id = ?
+        """,
+        (session_id, user_id),
+    ).fetchone()
+
+
+def load_chat_summary(conn: sqlite3.Connection, session_id: str) -> tuple[str, int]:
+    row = conn.execute(
+        "SELECT summary, summarized_seq FROM chat_session WHERE id = ?", (session_id,)
+    ).fetchone()
+    return row["summary"], row["summarized_seq"]
+
+
+def create_chat_session(
+    conn: sqlite3.Connection, session_id: str, user_id: str, at: str
+) -> None:
+    conn.execute(
+        "INSERT INTO chat_session (id, user_id, updated_at) VALUES (?, ?, ?)",
+        (session_id, user_id, at),
+    )
+
+
+def append_chat_message(
+    conn: sqlite3.Connection, session_id: str, role: str, content: str, at: str
+) -> int:
+    # Callers hold a write transaction, so MAX(seq) cannot move underneath.
+    row = conn.execute(
+        "SELECT MAX(seq) FROM chat_message WHERE session_id = ?", (session_id,)
+    ).fetchone()
+    seq = (row[0] or 0) + 1
+    conn.execute(
+        """
+        INSERT INTO chat_message (session_id, seq, role, content, at)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        (session_id, seq, role, content, at),
+    )
+    conn.execute("UPDATE chat_session SET updated_at = ? WHERE id = ?", (at, session_id))
+    return seq
+
+
+def load_recent_chat_messages(
+    conn: sqlite3.Connection, session_id: str, after_seq: int, limit: int
+) -> list[sqlite3.Row]:
+    """The newest ``limit`` messages after ``after_seq``, newest first."""
+    return conn.execute(
+        """
+        SELECT seq, role, content FROM chat_message
+        WHERE session_id = ? AND seq > ? ORDER BY seq DESC LIMIT ?
+        """,
+        (session_id, after_seq, limit),
+    ).fetchall()
+
+
+def load_chat_messages(
+    conn: sqlite3.Connection, session_id: str, after_seq: int, upto_seq: int
+) -> list[sqlite3.Row]:
+    return conn.execute(
+        """
+        SELECT seq, role, content FROM chat_message
+        WHERE session_id = ? AND seq > ? AND seq <= ? ORDER BY seq
+        """,
+        (session_id, after_seq, upto_seq),
+    ).fetchall()
+
+
+def save_chat_summary(
+    conn: sqlite3.Connection,
+    session_id: str,
+    summary: str,
+    summarized_seq: int,
+    expected_seq: int,
+) -> bool:
+    # Only applies on top of the summary it was built from.
+    cursor = conn.execute(
+        """
+        UPDATE chat_session SET summary = ?, summarized_seq = ?
+        WHERE id = ? AND summarized_seq = ?
+        """,
+        (summary, summarized_seq, session_id, expected_seq),
     )
-    conn.commit()
+    return cursor.rowcount == 1
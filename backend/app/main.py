@@ -1,47 +1,98 @@
 from __future__ import annotations
 
-import io
+import asyncio
+import base64
+import json
 import logging
+import re
+import secrets
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any, AsyncIterator
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
-from fastapi.responses import StreamingResponse
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Response, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
-from app.db import get_conn, init_db
+from app.config import get_int
+from app.db import (
+    DEFAULT_USER_ID,
+    close_pool,
+    get_conn,
+    get_or_create_profile,
+    init_db,
+    profile_stamp,
+    user_exists,
+    write_transaction,
+)
 from app.models import (
     ActionResponse,
     ActionFeedbackRequest,
+    AttentionOut,
     BuyRequest,
+    CacheStatsResponse,
+    ChatMessage,
     ChatRequest,
     ChatResponse,
+    ChatResult,
     EquipRequest,
+    LLMBackendStats,
     MiniGameResult,
     ProfileOut,
+    SayRequest,
     ShopResponse,
     SFXRequest,
     STTResponse,
     TTSRequest,
+    UserOut,
 )
 from app.services import chat as chat_service
+from app.services import chat_sessions
+from app.services.animations import ANIMATIONS_DIR
 from app.services.chat import ChatServiceError
+from app.services import clients
+from app.services import decay
+from app.services import feedback_pool
 from app.services import game
+from app.services import llm_router
+from app.services import profile_events
+from app.services.profile_events import sse_event
+from app.services import reminder_bank
+from app.services import speech_pipeline
 from app.services import voice as voice_service
 
 logger = logging.getLogger(__name__)
-app = FastAPI(title="Talking Tom Hackathon API")
+
+USER_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+DEFAULT_TTS_PIPELINE_CONCURRENCY = 2
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    init_db()
+    await clients.startup()
+    reminder_bank.start()
+    try:
+        yield
+    finally:
+        await reminder_bank.stop()
+        await clients.shutdown()
+        close_pool()
+
+
+app = FastAPI(title="Talking Tom Hackathon API", lifespan=lifespan)
 
 _ROOT = Path(__file__).resolve().parents[2]
 load_dotenv(_ROOT / ".env", override=False)
 load_dotenv(_ROOT / "backend" / ".env", override=False)
 
-_ANIMATIONS_DIR = _ROOT / "external_assets" / "animations_cat"
-if _ANIMATIONS_DIR.exists():
+if ANIMATIONS_DIR.exists():
     app.mount(
         "/assets/animations_cat",
-        StaticFiles(directory=str(_ANIMATIONS_DIR)),
+        StaticFiles(directory=str(ANIMATIONS_DIR)),
         name="animations-cat",
     )
 
@@ -54,64 +105,163 @@ app.add_middleware(
 )
 
 
-@app.on_event("startup")
-def on_startup() -> None:
-    init_db()
+# Issued or stored ids this worker has already checked; ids are never deleted.
+_known_users: set[str] = set()
+
+
+def _known_user(user_id: str) -> str:
+    if user_id == DEFAULT_USER_ID or user_id in _known_users:
+        return user_id
+    with get_conn() as conn:
+        known = user_exists(conn, user_id)
+    if not known:
+        raise HTTPException(
+            status_code=401, detail="Unknown user id; request one from POST /api/users"
+        )
+    _known_users.add(user_id)
+    return user_id
+
+
+def current_user(x_user_id: str | None = Header(default=None)) -> str:
+    """The user a request acts for.
+
+    There are no accounts: the id is a bearer token, so whoever holds a
+    user's id can read and change that user's profile and chat sessions.
+    Ids are random, issued by POST /api/users, and ids the server never
+    issued are rejected, so a client cannot pick someone else's. Requests
+    without an id share the default profile.
+    """
+    if not x_user_id:
+        return DEFAULT_USER_ID
+    if not USER_ID_PATTERN.fullmatch(x_user_id):
+        raise HTTPException(status_code=400, detail="Invalid X-User-Id header")
+    return _known_user(x_user_id)
+
+
+def stream_user(user_id: str | None = Query(default=None)) -> str:
+    # EventSource cannot send headers, so streams take the id as a query param.
+    if not user_id:
+        return DEFAULT_USER_ID
+    if not USER_ID_PATTERN.fullmatch(user_id):
+        raise HTTPException(status_code=400, detail="Invalid user_id")
+    return _known_user(user_id)
+
+
+@app.post("/api/users", response_model=UserOut)
+def create_user() -> UserOut:
+    # 24 random bytes encode to 32 URL-safe characters, within USER_ID_PATTERN.
+    user_id = secrets.token_urlsafe(24)
+    with write_transaction() as conn:
+        get_or_create_profile(conn, user_id)
+    _known_users.add(user_id)
+    return UserOut(user_id=user_id)
+
+
+def _profile_changed(user_id: str, profile: dict[str, Any]) -> None:
+    profile_events.get_events().publish(user_id, profile)
+    reminder_bank.get_bank().invalidate(user_id)
 
 
 @app.get("/api/profile", response_model=ProfileOut)
-def get_profile() -> ProfileOut:
+def get_profile(user_id: str = Depends(current_user)) -> ProfileOut:
     with get_conn() as conn:
-        profile = game.fetch_profile(conn)
+        profile = game.fetch_profile(conn, user_id)
+    reminder_bank.get_bank().touch(user_id)
     return ProfileOut(**profile)
 
 
+@app.get("/api/profile/attention", response_model=AttentionOut)
+def get_attention(user_id: str = Depends(current_user)) -> AttentionOut:
+    with get_conn() as conn:
+        profile = game.fetch_profile(conn, user_id)
+    attention = decay.next_attention(profile)
+    return AttentionOut(
+        low_stats=attention["low_stats"],
+        next_at=attention["next_at"].isoformat() if attention["next_at"] else None,
+        next_stats=attention["next_stats"],
+        crossings={
+            stat: moment.isoformat() for stat, moment in attention["crossings"].items()
+        },
+    )
+
+
+@app.get("/api/profile/stream")
+async def stream_profile(user_id: str = Depends(stream_user)) -> StreamingResponse:
+    stamp, profile = await run_in_threadpool(_load_stream_profile, user_id)
+    bank = reminder_bank.get_bank()
+    bank.touch(user_id)
+    events = profile_events.get_events().stream(
+        user_id,
+        profile,
+        on_heartbeat=lambda: bank.touch(user_id),
+        stamp=stamp,
+        poll=lambda seen: _poll_profile(user_id, seen),
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/api/shop", response_model=ShopResponse)
 def get_shop() -> ShopResponse:
     return ShopResponse(items=game.get_shop_items())
 
 
 @app.post("/api/actions/{action}", response_model=ActionResponse)
-def take_action(action: str) -> ActionResponse:
+def take_action(action: str, user_id: str = Depends(current_user)) -> ActionResponse:
     allowed = {"feed", "sleep", "clean", "play"}
     if action not in allowed:
         raise HTTPException(status_code=400, detail="Unknown action")
-    with get_conn() as conn:
-        profile = game.update_action(conn, action)
+    with write_transaction() as conn:
+        profile = game.update_action(conn, user_id, action)
+    _profile_changed(user_id, profile)
     return ActionResponse(profile=ProfileOut(**profile), message=f"Action {action} applied.")
 
 
 @app.post("/api/shop/buy", response_model=ActionResponse)
-def buy_item(payload: BuyRequest) -> ActionResponse:
+def buy_item(payload: BuyRequest, user_id: str = Depends(current_user)) -> ActionResponse:
     try:
-        with get_conn() as conn:
-            profile = game.update_buy(conn, payload.item_id)
+        with write_transaction() as conn:
+            profile = game.update_buy(conn, user_id, payload.item_id)
+        _profile_changed(user_id, profile)
         return ActionResponse(profile=ProfileOut(**profile), message="Item purchased.")
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @app.post("/api/shop/equip", response_model=ActionResponse)
-def equip_item(payload: EquipRequest) -> ActionResponse:
+def equip_item(payload: EquipRequest, user_id: str = Depends(current_user)) -> ActionResponse:
     try:
-        with get_conn() as conn:
-            profile = game.update_equip(conn, payload.item_id)
+        with write_transaction() as conn:
+            profile = game.update_equip(conn, user_id, payload.item_id)
+        _profile_changed(user_id, profile)
         return ActionResponse(profile=ProfileOut(**profile), message="Item equipped.")
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @app.post("/api/minigame/result", response_model=ActionResponse)
-def submit_minigame(payload: MiniGameResult) -> ActionResponse:
-    with get_conn() as conn:
-        profile = game.update_minigame(conn, payload.score, payload.duration_ms)
+def submit_minigame(
+    payload: MiniGameResult, user_id: str = Depends(current_user)
+) -> ActionResponse:
+    with write_transaction() as conn:
+        profile = game.update_minigame(conn, user_id, payload.score, payload.duration_ms)
+    _profile_changed(user_id, profile)
     return ActionResponse(profile=ProfileOut(**profile), message="Mini-game rewards applied.")
 
 
+def _audio_response(audio: voice_service.AudioSource) -> Response:
+    if isinstance(audio, Path):
+        return FileResponse(audio, media_type="audio/mpeg")
+    return StreamingResponse(audio, media_type="audio/mpeg")
+
+
 @app.post("/api/tts")
-def text_to_speech(payload: TTSRequest) -> StreamingResponse:
+async def text_to_speech(payload: TTSRequest) -> Response:
     try:
-        audio = voice_service.text_to_speech(payload.text)
+        audio = await voice_service.cached_text_to_speech(payload.text)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except RuntimeError as exc:
@@ -120,13 +270,13 @@ def text_to_speech(payload: TTSRequest) -> StreamingResponse:
         logger.exception("Text-to-speech failed")
         raise HTTPException(status_code=502, detail="Text-to-speech failed") from exc
 
-    return StreamingResponse(io.BytesIO(audio), media_type="audio/mpeg")
+    return _audio_response(audio)
 
 
 @app.post("/api/sfx")
-def sound_effects(payload: SFXRequest) -> StreamingResponse:
+async def sound_effects(payload: SFXRequest) -> Response:
     try:
-        audio = voice_service.text_to_sound_effects(payload.prompt)
+        audio = await voice_service.library_sound_effect(payload.prompt)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except RuntimeError as exc:
@@ -135,7 +285,32 @@ def sound_effects(payload: SFXRequest) -> StreamingResponse:
         logger.exception("Sound-effects generation failed")
         raise HTTPException(status_code=502, detail="Sound-effects failed") from exc
 
-    return StreamingResponse(io.BytesIO(audio), media_type="audio/mpeg")
+    return _audio_response(audio)
+
+
+@app.get("/api/cache/stats", response_model=CacheStatsResponse)
+def cache_stats() -> CacheStatsResponse:
+    coalescing = {
+        "tts": voice_service.tts_flight.stats(),
+        "sfx": voice_service.sfx_flight.stats(),
+        "reminder": chat_service.reminder_flight.stats(),
+    }
+    pool = feedback_pool.get_pool()
+    if pool is not None:
+        coalescing["feedback"] = pool.flight.stats()
+    return CacheStatsResponse(
+        tts=voice_service.tts_cache().stats(),
+        sfx=voice_service.sfx_library().stats(),
+        coalescing=coalescing,
+    )
+
+
+@app.get("/api/llm/stats", response_model=list[LLMBackendStats])
+def llm_stats() -> list[LLMBackendStats]:
+    return [
+        LLMBackendStats(**backend)
+        for backend in llm_router.snapshot(chat_service.backends())
+    ]
 
 
 @app.post("/api/stt", response_model=STTResponse)
@@ -146,7 +321,7 @@ async def speech_to_text(audio: UploadFile = File(...)) -> STTResponse:
     if not audio_bytes:
         raise HTTPException(status_code=400, detail="Audio file is empty")
     try:
-        text = voice_service.speech_to_text(audio_bytes, filename=audio.filename)
+        text = await voice_service.speech_to_text(audio_bytes, filename=audio.filename)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except RuntimeError as exc:
@@ -157,111 +332,369 @@ async def speech_to_text(audio: UploadFile = File(...)) -> STTResponse:
     return STTResponse(text=text)
 
 
-@app.post("/api/chat", response_model=ChatResponse)
-def chat(payload: ChatRequest) -> ChatResponse:
+def _load_profile(user_id: str) -> dict[str, Any]:
     with get_conn() as conn:
-        profile = game.fetch_profile(conn)
-        shop_items = game.get_shop_items()
-        hat_ids = [item["id"] for item in shop_items if item["type"] == "hat"]
-        background_ids = [
-            item["id"] for item in shop_items if item["type"] == "background"
-        ]
-        item_map = {item["id"]: item for item in shop_items}
+        return game.fetch_profile(conn, user_id)
 
-        try:
-            result = chat_service.chat_with_cat(
-                messages=payload.messages[-12:],
-                profile=profile,
-                hat_ids=hat_ids,
-                background_ids=background_ids,
-            )
-        except ChatServiceError as exc:
-            logger.info("Chat service error: %s", exc)
-            raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
-        except RuntimeError as exc:
-            raise HTTPException(status_code=500, detail=str(exc)) from exc
-        except Exception as exc:
-            logger.exception("Chat request failed")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Chat failed: {str(exc)}",
-            ) from exc
 
+def _load_stream_profile(user_id: str) -> tuple[str | None, dict[str, Any]]:
+    # Stamp first: a commit landing in between makes the first poll reload.
+    with get_conn() as conn:
+        stamp = profile_stamp(conn, user_id)
+        return stamp, game.fetch_profile(conn, user_id)
+
+
+def _poll_profile(
+    user_id: str, seen: str | None
+) -> tuple[str | None, dict[str, Any]] | None:
+    # Catches mutations handled by other workers.
+    with get_conn() as conn:
+        stamp = profile_stamp(conn, user_id)
+        if stamp == seen:
+            return None
+        return stamp, game.fetch_profile(conn, user_id)
+
+
+def _apply_chat_result(
+    user_id: str, result: ChatResult, item_map: dict[str, Any]
+) -> dict[str, Any]:
+    with game.unit_of_work(user_id) as unit:
         if result.action != "none":
-            profile = game.update_action(conn, result.action)
+            unit.action(result.action)
 
         equip = result.equip
         if equip:
             for item_id in [equip.hat_id, equip.background_id]:
                 if not item_id or item_id not in item_map:
                     continue
-                if item_id not in profile["owned_items"]:
+                if not unit.owns(item_id):
                     try:
-                        profile = game.update_buy(conn, item_id)
+                        unit.buy(item_id)
                     except ValueError:
                         continue
-                if item_id in profile["owned_items"]:
-                    profile = game.update_equip(conn, item_id)
+                if unit.owns(item_id):
+                    unit.equip(item_id)
+    _profile_changed(user_id, unit.profile)
+    return unit.profile
 
-    return ChatResponse(response=result, profile=ProfileOut(**profile))
 
+def _begin_chat(
+    user_id: str, payload: ChatRequest
+) -> tuple[chat_sessions.Turn | None, list[ChatMessage]]:
+    if payload.message is None:
+        if not payload.messages:
+            raise HTTPException(status_code=400, detail="No message to send")
+        return None, payload.messages[-12:]
+    if payload.message.role != "user":
+        raise HTTPException(status_code=400, detail="Only user messages can be sent")
+    turn = chat_sessions.begin_turn(user_id, payload.session_id, payload.message)
+    return turn, turn.messages
 
-@app.post("/api/action-feedback", response_model=ChatResponse)
-def action_feedback(payload: ActionFeedbackRequest) -> ChatResponse:
-    with get_conn() as conn:
-        profile = game.fetch_profile(conn)
-        shop_items = game.get_shop_items()
-        hat_ids = [item["id"] for item in shop_items if item["type"] == "hat"]
-        background_ids = [
-            item["id"] for item in shop_items if item["type"] == "background"
-        ]
+
+async def _end_chat(turn: chat_sessions.Turn | None, result: ChatResult) -> None:
+    if turn is None:
+        return
+    await run_in_threadpool(chat_sessions.end_turn, turn, result.reply)
+    chat_sessions.schedule_summary(turn)
+
+
+@app.post("/api/chat", response_model=ChatResponse)
+async def chat(payload: ChatRequest, user_id: str = Depends(current_user)) -> ChatResponse:
+    turn, messages = await run_in_threadpool(_begin_chat, user_id, payload)
+    profile = await run_in_threadpool(_load_profile, user_id)
+    shop_items = game.get_shop_items()
+    hat_ids = [item["id"] for item in shop_items if item["type"] == "hat"]
+    background_ids = [item["id"] for item in shop_items if item["type"] == "background"]
+    item_map = {item["id"]: item for item in shop_items}
+
+    try:
+        result = await chat_service.chat_with_cat(
+            messages=messages,
+            profile=profile,
+            hat_ids=hat_ids,
+            background_ids=background_ids,
+        )
+    except ChatServiceError as exc:
+        logger.info("Chat service error: %s", exc)
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    except Exception as exc:
+        logger.exception("Chat request failed")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Chat failed: {str(exc)}",
+        ) from exc
+
+    await _end_chat(turn, result)
+    if result.action != "none" or result.equip:
+        profile = await run_in_threadpool(_apply_chat_result, user_id, result, item_map)
+
+    return ChatResponse(
+        response=result,
+        profile=ProfileOut(**profile),
+        usage=result.usage,
+        session_id=turn.session_id if turn else None,
+    )
+
+
+async def _chat_events(
+    user_id: str,
+    profile: dict[str, Any],
+    item_map: dict[str, Any],
+    events: AsyncIterator[tuple[str, Any]],
+    speak: bool,
+    turn: chat_sessions.Turn | None = None,
+) -> AsyncIterator[str]:
+    # LLM events and speech segments finish independently, so both feed one
+    # queue and are forwarded in arrival order.
+    queue: asyncio.Queue[Any] = asyncio.Queue()
+    pipeline = (
+        speech_pipeline.SpeechPipeline(
+            queue, get_int("TTS_PIPELINE_CONCURRENCY", DEFAULT_TTS_PIPELINE_CONCURRENCY)
+        )
+        if speak
+        else None
+    )
+
+    async def produce() -> None:
         try:
-            result = chat_service.action_feedback(
+            async for kind, value in events:
+                if kind == "reply_end":
+                    # The reply is done long before the other fields; speak
+                    # its last sentence now rather than after the result.
+                    if pipeline is not None:
+                        pipeline.flush()
+                    continue
+                if kind == "reply" and pipeline is not None:
+                    pipeline.feed(value)
+                await queue.put((kind, value))
+            if pipeline is not None:
+                await pipeline.finish()
+        except Exception as exc:
+            await queue.put(("error", exc))
+        finally:
+            await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    result: ChatResult | None = None
+    try:
+        while (item := await queue.get()) is not None:
+            kind, value = item[0], item[1]
+            if kind == "reply":
+                yield sse_event("reply", {"delta": value})
+            elif kind == "field":
+                yield sse_event("field", {"name": value[0], "value": value[1]})
+            elif kind == "audio":
+                _, index, text, audio = item
+                yield sse_event(
+                    "audio",
+                    {
+                        "index": index,
+                        "text": text,
+                        "audio": base64.b64encode(audio).decode("ascii") if audio else None,
+                    },
+                )
+            elif kind == "result":
+                result = value
+                await _end_chat(turn, result)
+                if result.action != "none" or result.equip:
+                    profile = await run_in_threadpool(
+                        _apply_chat_result, user_id, result, item_map
+                    )
+                response = ChatResponse(
+                    response=result,
+                    profile=ProfileOut(**profile),
+                    usage=result.usage,
+                    session_id=turn.session_id if turn else None,
+                )
+                yield sse_event("done", response.model_dump(mode="json"))
+            elif kind == "error":
+                raise value
+        if result is None:
+            raise ChatServiceError("Chat stream ended without a result.", status_code=502)
+        if pipeline is not None:
+            yield sse_event("audio_end", {"segments": pipeline.segments})
+    except ChatServiceError as exc:
+        logger.info("Chat service error: %s", exc)
+        yield sse_event("error", {"status": exc.status_code, "detail": str(exc)})
+    except Exception as exc:
+        logger.exception("Chat stream failed")
+        yield sse_event("error", {"status": 500, "detail": f"Chat failed: {str(exc)}"})
+    finally:
+        producer.cancel()
+        if pipeline is not None:
+            pipeline.cancel()
+
+
+@app.post("/api/chat/stream")
+async def chat_stream(
+    payload: ChatRequest, user_id: str = Depends(current_user)
+) -> StreamingResponse:
+    turn, messages = await run_in_threadpool(_begin_chat, user_id, payload)
+    profile = await run_in_threadpool(_load_profile, user_id)
+    shop_items = game.get_shop_items()
+    hat_ids = [item["id"] for item in shop_items if item["type"] == "hat"]
+    background_ids = [item["id"] for item in shop_items if item["type"] == "background"]
+    item_map = {item["id"]: item for item in shop_items}
+    events = chat_service.stream_chat_with_cat(
+        messages=messages,
+        profile=profile,
+        hat_ids=hat_ids,
+        background_ids=background_ids,
+    )
+    return StreamingResponse(
+        _chat_events(user_id, profile, item_map, events, payload.speak, turn),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/action-feedback", response_model=ChatResponse)
+async def action_feedback(
+    payload: ActionFeedbackRequest, user_id: str = Depends(current_user)
+) -> ChatResponse:
+    profile = await run_in_threadpool(_load_profile, user_id)
+    pool = feedback_pool.get_pool()
+    pooled = pool.take(payload.action, profile) if pool else None
+    if pooled is not None:
+        return ChatResponse(response=pooled, profile=ProfileOut(**profile))
+    try:
+        if pool is not None:
+            # The refill runs in the background; the miss itself costs one call.
+            result = await pool.fetch(payload.action, profile)
+        else:
+            shop_items = game.get_shop_items()
+            hat_ids = [item["id"] for item in shop_items if item["type"] == "hat"]
+            background_ids = [
+                item["id"] for item in shop_items if item["type"] == "background"
+            ]
+            result = await chat_service.action_feedback(
                 action=payload.action,
                 profile=profile,
                 hat_ids=hat_ids,
                 background_ids=background_ids,
             )
-        except ChatServiceError as exc:
-            logger.info("Chat service error: %s", exc)
-            raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
-        except RuntimeError as exc:
-            raise HTTPException(status_code=500, detail=str(exc)) from exc
-        except Exception as exc:
-            logger.exception("Action feedback failed")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Action feedback failed: {str(exc)}",
-            ) from exc
-
-    return ChatResponse(response=result, profile=ProfileOut(**profile))
+    except ChatServiceError as exc:
+        logger.info("Chat service error: %s", exc)
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    except Exception as exc:
+        logger.exception("Action feedback failed")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Action feedback failed: {str(exc)}",
+        ) from exc
+
+    return ChatResponse(
+        response=result, profile=ProfileOut(**profile), usage=result.usage
+    )
 
 
 @app.post("/api/reminder", response_model=ChatResponse)
-def reminder() -> ChatResponse:
-    with get_conn() as conn:
-        profile = game.fetch_profile(conn)
-        shop_items = game.get_shop_items()
-        hat_ids = [item["id"] for item in shop_items if item["type"] == "hat"]
-        background_ids = [
-            item["id"] for item in shop_items if item["type"] == "background"
-        ]
+async def reminder(user_id: str = Depends(current_user)) -> ChatResponse:
+    profile = await run_in_threadpool(_load_profile, user_id)
+    banked = reminder_bank.get_bank().take(user_id, profile)
+    if banked is not None:
+        return ChatResponse(response=banked, profile=ProfileOut(**profile))
+    shop_items = game.get_shop_items()
+    hat_ids = [item["id"] for item in shop_items if item["type"] == "hat"]
+    background_ids = [item["id"] for item in shop_items if item["type"] == "background"]
+    try:
+        result = await chat_service.reminder_with_cat(
+            profile=profile,
+            hat_ids=hat_ids,
+            background_ids=background_ids,
+        )
+    except ChatServiceError as exc:
+        logger.info("Chat service error: %s", exc)
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    except Exception as exc:
+        logger.exception("Reminder failed")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Reminder failed: {str(exc)}",
+        ) from exc
+
+    return ChatResponse(
+        response=result, profile=ProfileOut(**profile), usage=result.usage
+    )
+
+
+SAY_MEDIA_TYPE = "application/x-kit-frames"
+
+
+def _frame(kind: str, payload: bytes = b"") -> bytes:
+    header = json.dumps({"type": kind, "length": len(payload)})
+    return header.encode("utf-8") + b"\n" + payload
+
+
+async def _say_frames(response: ChatResponse) -> AsyncIterator[bytes]:
+    yield _frame("result", response.model_dump_json().encode("utf-8"))
+
+    queue: asyncio.Queue[tuple[str, bytes | None]] = asyncio.Queue(maxsize=64)
+
+    async def pump(part: str, text: str | None) -> None:
         try:
-            result = chat_service.reminder_with_cat(
-                profile=profile,
-                hat_ids=hat_ids,
-                background_ids=background_ids,
-            )
-        except ChatServiceError as exc:
-            logger.info("Chat service error: %s", exc)
-            raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
-        except RuntimeError as exc:
-            raise HTTPException(status_code=500, detail=str(exc)) from exc
+            if not text or not text.strip():
+                return
+            if part == "tts":
+                audio = await voice_service.cached_text_to_speech(text)
+            else:
+                audio = await voice_service.library_sound_effect(text)
+            if isinstance(audio, Path):
+                await queue.put((part, await asyncio.to_thread(audio.read_bytes)))
+            else:
+                async for chunk in audio:
+                    await queue.put((part, chunk))
         except Exception as exc:
-            logger.exception("Reminder failed")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Reminder failed: {str(exc)}",
-            ) from exc
-
-    return ChatResponse(response=result, profile=ProfileOut(**profile))
+            logger.warning("Say: %s failed: %s", part, exc)
+            detail = json.dumps({"part": part, "detail": str(exc) or type(exc).__name__})
+            await queue.put(("error", detail.encode("utf-8")))
+        finally:
+            await queue.put((part, None))
+
+    result = response.response
+    tasks = [
+        asyncio.create_task(pump("tts", result.reply)),
+        asyncio.create_task(pump("sfx", result.sfx_prompt)),
+    ]
+    pending = len(tasks)
+    try:
+        while pending:
+            part, chunk = await queue.get()
+            if chunk is None:
+                pending -= 1
+                yield _frame(f"{part}_end")
+            else:
+                yield _frame(part, chunk)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@app.post("/api/say")
+async def say(payload: SayRequest, user_id: str = Depends(current_user)) -> StreamingResponse:
+    if payload.kind == "chat":
+        if not payload.messages and payload.message is None:
+            raise HTTPException(status_code=400, detail="Messages are required")
+        response = await chat(
+            ChatRequest(
+                session_id=payload.session_id,
+                message=payload.message,
+                messages=payload.messages,
+            ),
+            user_id,
+        )
+    elif payload.kind == "action_feedback":
+        if payload.action is None:
+            raise HTTPException(status_code=400, detail="Action is required")
+        response = await action_feedback(
+            ActionFeedbackRequest(action=payload.action), user_id
+        )
+    else:
+        response = await reminder(user_id)
+    return StreamingResponse(_say_frames(response), media_type=SAY_MEDIA_TYPE)
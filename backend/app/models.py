@@ -2,11 +2,12 @@ from __future__ import annotations
 
 from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class ProfileOut(BaseModel):
     id: int
+    user_id: str
     name: str
     coins: int
     level: int
@@ -21,6 +22,13 @@ class ProfileOut(BaseModel):
     equipped_items: dict[str, str]
 
 
+class AttentionOut(BaseModel):
+    low_stats: list[str]
+    next_at: str | None = None
+    next_stats: list[str]
+    crossings: dict[str, str]
+
+
 class ShopItem(BaseModel):
     id: str
     name: str
@@ -69,7 +77,19 @@ class ChatEquip(BaseModel):
 
 
 class ChatRequest(BaseModel):
-    messages: list[ChatMessage]
+    # Either the new message of a server-side session, or (older clients)
+    # the whole history.
+    session_id: str | None = None
+    message: ChatMessage | None = None
+    messages: list[ChatMessage] = Field(default_factory=list)
+    # Only used by /api/chat/stream: also stream the reply as speech.
+    speak: bool = False
+
+
+class TokenUsage(BaseModel):
+    input_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
 
 
 class ChatResult(BaseModel):
@@ -80,6 +100,13 @@ class ChatResult(BaseModel):
     animation: str | None = None
     sfx_prompt: str | None = None
 
+    # Kept out of the schema sent to the LLM as response_schema.
+    _usage: TokenUsage | None = PrivateAttr(default=None)
+
+    @property
+    def usage(self) -> TokenUsage | None:
+        return self._usage
+
 
 class TTSRequest(BaseModel):
     text: str = Field(..., min_length=1)
@@ -93,10 +120,60 @@ class ActionFeedbackRequest(BaseModel):
     action: Literal["feed", "sleep", "clean", "play"]
 
 
+class SayRequest(BaseModel):
+    kind: Literal["chat", "action_feedback", "reminder"] = "chat"
+    session_id: str | None = None
+    message: ChatMessage | None = None
+    messages: list[ChatMessage] = Field(default_factory=list)
+    action: Literal["feed", "sleep", "clean", "play"] | None = None
+
+
 class STTResponse(BaseModel):
     text: str
 
 
+class UserOut(BaseModel):
+    user_id: str
+
+
 class ChatResponse(BaseModel):
     response: ChatResult
     profile: ProfileOut
+    usage: TokenUsage | None = None
+    session_id: str | None = None
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    max_bytes: int
+    clusters: int | None = None
+
+
+class FlightStats(BaseModel):
+    calls: int
+    coalesced: int
+    in_flight: int
+
+
+class CacheStatsResponse(BaseModel):
+    tts: CacheStats
+    sfx: CacheStats
+    # Requests that shared another identical in-flight provider call.
+    coalescing: dict[str, FlightStats]
+
+
+class LatencyStats(BaseModel):
+    samples: int
+    p50: float | None
+    p95: float | None
+    error_rate: float
+
+
+class LLMBackendStats(BaseModel):
+    name: str
+    circuit: Literal["closed", "open", "half_open"]
+    stats: dict[str, LatencyStats]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+ANIMATIONS_DIR = Path(__file__).resolve().parents[3] / "external_assets" / "animations_cat"
+CATALOG_PATH = ANIMATIONS_DIR / "cat_videos.json"
+CHECK_INTERVAL = 1.0
+
+
+class AnimationCatalog:
+    def __init__(self, path: Path, check_interval: float = CHECK_INTERVAL) -> None:
+        self.path = path
+        self.check_interval = check_interval
+        self.options: list[dict[str, str]] = []
+        self.prompt_list = "none"
+        self.schema_enum: list[str | None] = [None]
+        self._aliases: dict[str, str] = {}
+        self._mtime: float | None = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = self.path.stat().st_mtime
+            except OSError:
+                mtime = None
+            if mtime == self._mtime:
+                return
+            self._mtime = mtime
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        options = []
+        for item in data.get("cats", []):
+            video = item.get("video")
+            if not video:
+                continue
+            if not (self.path.parent / video).is_file():
+                logger.warning("Animation %s is listed in %s but missing", video, self.path.name)
+                continue
+            options.append({"video": video, "description": item.get("description", "")})
+
+        aliases: dict[str, str] = {}
+        for item in options:
+            video = item["video"]
+            stem = video.rsplit(".", 1)[0]
+            for alias in (video, stem, f"{stem}.mp4", f"{stem}.webm"):
+                aliases.setdefault(alias.lower(), video)
+
+        self.options = options
+        self.prompt_list = (
+            "; ".join(f"{item['video']} ({item['description']})" for item in options)
+            or "none"
+        )
+        self.schema_enum = [item["video"] for item in options] + [None]
+        self._aliases = aliases
+        logger.info("Loaded %d animations from %s", len(options), self.path)
+
+    def normalize(self, selection: str | None) -> str | None:
+        if not selection:
+            return None
+        self.refresh()
+        return self._aliases.get(selection.strip().lower())
+
+
+catalog = AnimationCatalog(CATALOG_PATH)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+CACHE_ROOT = Path(__file__).resolve().parents[2] / "cache"
+EVICT_TO_RATIO = 0.9
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def cache_key(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class AudioCache:
+    """Content-addressed audio files with LRU eviction by mtime.
+
+    The byte total is counted once at startup and then kept up to date on
+    each write, so writes never scan the directory. Files written by other
+    workers are only counted again when eviction rescans the directory.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, suffix: str = ".mp3") -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._evicting = False
+        entries = self._entries()
+        self._entry_count = len(entries)
+        self._bytes = sum(size for _, size, _ in entries)
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> Path | None:
+        path = self.path_for(key)
+        try:
+            # mtime doubles as the LRU clock, shared by every worker process.
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def _publish(self, tmp_name: str, path: Path, size: int) -> bool:
+        """Moves a finished file into place; True if the cache is now over its cap."""
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = None
+        os.replace(tmp_name, path)
+        with self._lock:
+            if replaced is None:
+                self._entry_count += 1
+                self._bytes += size
+            else:
+                self._bytes += size - replaced
+            return self._bytes > self.max_bytes
+
+    def put(self, key: str, data: bytes) -> Path:
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            over = self._publish(tmp_name, path, len(data))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        if over:
+            self.evict()
+        return path
+
+    async def tee(self, key: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        # Yields chunks to the caller while spooling them to disk; the entry is
+        # only published if the whole stream was consumed without errors.
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".part")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                async for chunk in chunks:
+                    handle.write(chunk)
+                    size += len(chunk)
+                    yield chunk
+            over = self._publish(tmp_name, path, size)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        if over:
+            await asyncio.to_thread(self.evict)
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.directory.glob(f"*/*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self) -> None:
+        # Blocking directory scan: callers on the event loop run it in a thread.
+        with self._lock:
+            if self._evicting:
+                return
+            self._evicting = True
+        try:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            count = len(entries)
+            if total > self.max_bytes:
+                target = int(self.max_bytes * EVICT_TO_RATIO)
+                entries.sort()
+                for _, size, path in entries:
+                    if total <= target:
+                        break
+                    try:
+                        path.unlink()
+                    except FileNotFoundError:
+                        # Another worker evicted it first.
+                        pass
+                    else:
+                        with self._lock:
+                            self.evictions += 1
+                    total -= size
+                    count -= 1
+                logger.info("Audio cache %s evicted down to %d bytes", self.directory, total)
+            with self._lock:
+                self._bytes = total
+                self._entry_count = count
+        finally:
+            self._evicting = False
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": self._entry_count,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
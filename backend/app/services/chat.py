@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+import functools
 import json
 import logging
 import os
-import time
-from pathlib import Path
-from typing import Iterable, Literal
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, NamedTuple
 
-from google import genai
 from google.genai import errors, types
-from openai import OpenAI
+from openai import AsyncOpenAI
 
-from app.models import ChatMessage, ChatResult
+from app.config import get_float, get_int
+from app.models import ChatMessage, ChatResult, TokenUsage
+from app.services.animations import catalog
+from app.services.audio_cache import cache_key
+from app.services.clients import get_clients
+from app.services.json_stream import ObjectStreamParser
+from app.services import llm_router
+from app.services.llm_router import Backend, CircuitBreaker, NoBackendAvailable, Router
+from app.services.model_tiers import ModelTier, get_tier
+from app.services.single_flight import SingleFlight
 
 
 DEFAULT_OPENAI_MODEL = "gpt-5"
@@ -19,6 +26,7 @@ DEFAULT_REASONING_EFFORT = "medium"
 DEFAULT_OPENAI_TEMPERATURE = 0.9
 DEFAULT_GEMINI_MODEL = "gemini-2.5-flash"
 DEFAULT_GEMINI_TEMPERATURE = 1.0
+DOWNGRADE_PROBE_EVERY = 10
 
 
 class ChatServiceError(RuntimeError):
@@ -30,62 +38,139 @@ class ChatServiceError(RuntimeError):
 logger = logging.getLogger(__name__)
 
 
-def _get_float(name: str, default: float) -> float:
-    value = os.getenv(name)
-    if value is None or value == "":
-        return default
-    try:
-        return float(value)
-    except ValueError:
-        logger.warning("Invalid %s=%r, using default %s", name, value, default)
-        return default
+def _client() -> AsyncOpenAI:
+    return get_clients().openai()
+
+
+def _provider_entries() -> list[tuple[str, str | None]]:
+    # LLM_PROVIDERS lists providers in order of preference, each as
+    # "provider" or "provider:model"; without it only LLM_PROVIDER is used.
+    entries = os.getenv("LLM_PROVIDERS") or os.getenv("LLM_PROVIDER", "openai")
+    providers = []
+    for entry in entries.split(","):
+        provider, _, model = entry.strip().partition(":")
+        provider = provider.lower()
+        if not provider:
+            continue
+        if provider not in PROVIDERS:
+            logger.warning("Unknown LLM provider %r, using openai", provider)
+            provider = "openai"
+        if provider == "gemini" and not os.getenv("GEMINI_API_KEY"):
+            raise RuntimeError("GEMINI_API_KEY is not set")
+        providers.append((provider, model or None))
+    if not providers:
+        raise RuntimeError("No LLM provider configured")
+    return providers
 
 
-def _animation_options() -> list[dict[str, str]]:
-    root = Path(__file__).resolve().parents[3]
-    path = root / "external_assets" / "animations_cat" / "cat_videos.json"
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError):
-        return []
-    cats = data.get("cats", [])
-    return [
-        {"video": item.get("video", ""), "description": item.get("description", "")}
-        for item in cats
-        if item.get("video")
-    ]
-
-
-def _client() -> OpenAI:
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise RuntimeError("OPENAI_API_KEY is not set")
-    return OpenAI(api_key=api_key)
-
-
-def _provider() -> Literal["openai", "gemini"]:
-    provider = os.getenv("LLM_PROVIDER", "openai").lower()
+def _default_model(provider: str) -> str:
     if provider == "gemini":
-        if not os.getenv("GEMINI_API_KEY"):
-            raise RuntimeError("GEMINI_API_KEY is not set")
-        return "gemini"
-    return "openai"
+        return os.getenv("GEMINI_MODEL", DEFAULT_GEMINI_MODEL)
+    return os.getenv("OPENAI_MODEL", DEFAULT_OPENAI_MODEL)
 
 
-def _system_prompt(
-    profile: dict,
-    hat_ids: Iterable[str],
-    background_ids: Iterable[str],
+def _retryable(exc: BaseException) -> bool:
+    cause = exc.__cause__
+    return isinstance(cause, errors.APIError) and cause.code in {429, 503}
+
+
+_backends: dict[str, Backend] = {}
+_routers: dict[str, Router] = {}
+_downgrades: dict[str, int] = {}
+reminder_flight = SingleFlight()
+
+
+def _backend(provider: str, model: str) -> Backend:
+    # Tiers using the same model share its circuit breaker and stats.
+    name = f"{provider}:{model}"
+    if name not in _backends:
+        _backends[name] = Backend(
+            provider=provider,
+            model=model,
+            breaker=CircuitBreaker(
+                get_int("LLM_BREAKER_FAILURES", llm_router.DEFAULT_FAILURE_THRESHOLD),
+                get_float("LLM_BREAKER_COOLDOWN", llm_router.DEFAULT_COOLDOWN),
+            ),
+            window=get_int("LLM_STATS_WINDOW", llm_router.DEFAULT_WINDOW),
+        )
+    return _backends[name]
+
+
+def get_router(tier_name: str = "chat") -> Router:
+    if tier_name not in _routers:
+        tier = get_tier(tier_name)
+        backends = [
+            _backend(provider, tier.models.get(provider) or model or _default_model(provider))
+            for provider, model in _provider_entries()
+        ]
+        _routers[tier_name] = Router(
+            backends,
+            hedge_after=get_float("LLM_HEDGE_AFTER", 0.0),
+            retryable=_retryable,
+            # With nowhere to fail over to, an open circuit would only turn
+            # every request into a 503 until the cooldown ends.
+            breakers=len(backends) > 1,
+        )
+    return _routers[tier_name]
+
+
+def backends() -> list[Backend]:
+    return list(_backends.values())
+
+
+def _select_tier(request_type: str, kind: str) -> tuple[ModelTier, Router]:
+    """The tier for ``request_type``, or its fallback while over budget."""
+    tier = get_tier(request_type)
+    router = get_router(request_type)
+    if tier.latency_budget is None or tier.fallback is None:
+        return tier, router
+    p95 = router.expected_latency(kind, 0.95)
+    count = _downgrades.get(request_type)
+    if count is None:
+        if p95 is None or p95 <= tier.latency_budget:
+            return tier, router
+        logger.warning(
+            "%s p95 %.2fs is over its %.2fs budget, downgrading to %s",
+            request_type,
+            p95,
+            tier.latency_budget,
+            tier.fallback,
+        )
+        _reset_stats(router, kind)
+        count = 0
+    elif p95 is not None:
+        # Enough probes since the last reset to judge the preferred tier.
+        if p95 <= tier.latency_budget:
+            del _downgrades[request_type]
+            logger.info("%s is back within its latency budget", request_type)
+            return tier, router
+        _reset_stats(router, kind)
+    count += 1
+    _downgrades[request_type] = count
+    if count % DOWNGRADE_PROBE_EVERY == 0:
+        # Keep measuring the preferred tier so it can recover.
+        return tier, router
+    return get_tier(tier.fallback), get_router(tier.fallback)
+
+
+def _reset_stats(router: Router, kind: str) -> None:
+    # While downgraded only every DOWNGRADE_PROBE_EVERY-th request reaches
+    # the preferred tier, too few to push old slow samples out of the
+    # window. Recovery is judged on fresh probes instead.
+    for backend in router.backends:
+        backend.stats_for(kind).clear()
+
+
+@functools.lru_cache(maxsize=32)
+def _static_prompt(
+    hat_ids: tuple[str, ...],
+    background_ids: tuple[str, ...],
+    animation_list: str,
 ) -> str:
+    # Everything here is identical across requests so providers can reuse the
+    # cached prefix; per-request values go in _stats_prompt near the end.
     hats = ", ".join(hat_ids) if hat_ids else "none"
     backgrounds = ", ".join(background_ids) if background_ids else "none"
-    animations = _animation_options()
-    if animations:
-        animation_list = "; ".join(
-            f"{item['video']} ({item['description']})" for item in animations
-        )
-    else:
-        animation_list = "none"
     return (
         "You are Kit the cat in a virtual pet game. Keep replies short, playful, and kind. "
         "Occasionally include a brief 'meow' or 'purr' in the reply text. "
@@ -98,13 +183,110 @@ def _system_prompt(
         "If unsure, use action 'none' and mood 'neutral'. "
         "All stats are on a 0-100 scale. Hunger is fullness: lower hunger means more hungry, higher hunger means more full. "
         "Higher energy, hygiene, and fun are better. Mood is 0-100 where higher is happier. "
-        f"Current stats: hunger={profile['hunger']:.0f}, energy={profile['energy']:.0f}, "
-        f"hygiene={profile['hygiene']:.0f}, fun={profile['fun']:.0f}, mood={profile['mood']:.0f}. "
+        "The current stats are given in a separate message just before the latest request. "
         f"Allowed hat_ids: {hats}. Allowed background_ids: {backgrounds}. "
         f"Allowed animation videos: {animation_list}."
     )
 
 
+def _system_prompt(hat_ids: Iterable[str], background_ids: Iterable[str]) -> str:
+    catalog.refresh()
+    return _static_prompt(tuple(hat_ids), tuple(background_ids), catalog.prompt_list)
+
+
+def _stats_prompt(profile: dict) -> str:
+    return (
+        f"Current stats: hunger={profile['hunger']:.0f}, energy={profile['energy']:.0f}, "
+        f"hygiene={profile['hygiene']:.0f}, fun={profile['fun']:.0f}, mood={profile['mood']:.0f}."
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _openai_text_format(animation_enum: tuple[str | None, ...]) -> dict:
+    nullable_string = {"type": ["string", "null"]}
+    return {
+        "format": {
+            "type": "json_schema",
+            "name": "cat_response",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "reply": {"type": "string"},
+                    "mood": {
+                        "type": "string",
+                        "enum": ["happy", "neutral", "sad", "angry", "tired"],
+                    },
+                    "action": {
+                        "type": "string",
+                        "enum": ["feed", "sleep", "clean", "play", "none"],
+                    },
+                    "equip": {
+                        "type": ["object", "null"],
+                        "properties": {
+                            "hat_id": nullable_string,
+                            "background_id": nullable_string,
+                        },
+                        "required": ["hat_id", "background_id"],
+                        "additionalProperties": False,
+                    },
+                    "animation": {
+                        "type": ["string", "null"],
+                        "enum": list(animation_enum),
+                    },
+                    "sfx_prompt": nullable_string,
+                },
+                "required": [
+                    "reply",
+                    "mood",
+                    "action",
+                    "equip",
+                    "animation",
+                    "sfx_prompt",
+                ],
+                "additionalProperties": False,
+            },
+            "strict": True,
+        }
+    }
+
+
+def _log_usage(provider: str, model: str, usage: TokenUsage | None) -> None:
+    if usage is None:
+        return
+    logger.info(
+        "LLM usage provider=%s model=%s input=%d cached=%d output=%d",
+        provider,
+        model,
+        usage.input_tokens,
+        usage.cached_tokens,
+        usage.output_tokens,
+    )
+
+
+def _openai_usage(response: object) -> TokenUsage | None:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    details = getattr(usage, "input_tokens_details", None)
+    return TokenUsage(
+        input_tokens=getattr(usage, "input_tokens", 0) or 0,
+        cached_tokens=getattr(details, "cached_tokens", 0) or 0,
+        output_tokens=getattr(usage, "output_tokens", 0) or 0,
+    )
+
+
+def _gemini_usage(response: object) -> TokenUsage | None:
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return None
+    return TokenUsage(
+        input_tokens=getattr(usage, "prompt_token_count", 0) or 0,
+        cached_tokens=getattr(usage, "cached_content_token_count", 0) or 0,
+        output_tokens=(getattr(usage, "candidates_token_count", 0) or 0)
+        + (getattr(usage, "thoughts_token_count", 0) or 0),
+    )
+
+
 def _action_feedback_prompt(action: str) -> str:
     return (
         f"The user just pressed the '{action}' button in the game. "
@@ -116,6 +298,18 @@ def _action_feedback_prompt(action: str) -> str:
     )
 
 
+def _summary_prompt(summary: str, messages: list[ChatMessage]) -> str:
+    turns = "\n".join(f"{msg.role}: {msg.content}" for msg in messages)
+    return (
+        "Update the running summary of a chat between a user and Kit, a virtual pet cat. "
+        "Keep what Kit should remember later: the user's name, preferences, facts they "
+        "shared, promises and open questions. Drop greetings and small talk. "
+        "Answer with the summary only, at most 120 words.\n\n"
+        f"Summary so far: {summary or 'none'}\n\n"
+        f"New turns:\n{turns}"
+    )
+
+
 def _reminder_prompt() -> str:
     return (
         "Check in on the user based on the current stats. "
@@ -128,71 +322,87 @@ def _reminder_prompt() -> str:
     )
 
 
-def _chat_openai(
+def _openai_request(
     messages: list[ChatMessage],
     profile: dict,
     hat_ids: Iterable[str],
     background_ids: Iterable[str],
-) -> ChatResult:
-    model = os.getenv("OPENAI_MODEL", DEFAULT_OPENAI_MODEL)
-    reasoning_effort = os.getenv("OPENAI_REASONING_EFFORT", DEFAULT_REASONING_EFFORT)
-    temperature = _get_float("OPENAI_TEMPERATURE", DEFAULT_OPENAI_TEMPERATURE)
-    allowed_animations = [item["video"] for item in _animation_options()]
-    animation_enum = allowed_animations + [None]
-    system_message = {
-        "role": "system",
-        "content": _system_prompt(profile, hat_ids, background_ids),
+    model: str,
+    tier: ModelTier,
+) -> dict[str, Any]:
+    reasoning_effort = tier.reasoning_effort or os.getenv(
+        "OPENAI_REASONING_EFFORT", DEFAULT_REASONING_EFFORT
+    )
+    temperature = tier.temperature
+    if temperature is None:
+        temperature = get_float("OPENAI_TEMPERATURE", DEFAULT_OPENAI_TEMPERATURE)
+    system_prompt = _system_prompt(hat_ids, background_ids)
+    history = [{"role": msg.role, "content": msg.content} for msg in messages]
+    stats_message = {"role": "system", "content": _stats_prompt(profile)}
+    input_messages = (
+        [{"role": "system", "content": system_prompt}]
+        + history[:-1]
+        + [stats_message]
+        + history[-1:]
+    )
+    request = {
+        "model": model,
+        "reasoning": {"effort": reasoning_effort},
+        "temperature": temperature,
+        "text": _openai_text_format(tuple(catalog.schema_enum)),
+        "input": input_messages,
+        "extra_body": {"prompt_cache_key": cache_key(system_prompt)[:32]},
     }
-    input_messages = [system_message] + [
-        {"role": msg.role, "content": msg.content} for msg in messages
-    ]
+    return request | _openai_limits(tier)
 
-    response = _client().responses.create(
-        model=model,
-        reasoning={"effort": reasoning_effort},
-        temperature=temperature,
-        response_format={
-            "type": "json_schema",
-            "json_schema": {
-                "name": "cat_response",
-                "schema": {
-                    "type": "object",
-                    "properties": {
-                        "reply": {"type": "string"},
-                        "mood": {
-                            "type": "string",
-                            "enum": ["happy", "neutral", "sad", "angry", "tired"],
-                        },
-                        "action": {
-                            "type": "string",
-                            "enum": ["feed", "sleep", "clean", "play", "none"],
-                        },
-                        "equip": {
-                            "type": "object",
-                            "properties": {
-                                "hat_id": {"type": "string"},
-                                "background_id": {"type": "string"},
-                            },
-                            "required": [],
-                            "additionalProperties": False,
-                        },
-                        "animation": {
-                            "type": ["string", "null"],
-                            "enum": animation_enum,
-                        },
-                        "sfx_prompt": {"type": ["string", "null"]},
-                    },
-                    "required": ["reply", "mood", "action"],
-                    "additionalProperties": False,
-                },
-                "strict": True,
-            },
-        },
-        input=input_messages,
-    )
+
+def _openai_limits(tier: ModelTier) -> dict[str, Any]:
+    limits: dict[str, Any] = {}
+    if tier.max_output_tokens:
+        limits["max_output_tokens"] = tier.max_output_tokens
+    if tier.timeout:
+        limits["timeout"] = tier.timeout
+    return limits
+
+
+async def _chat_openai(
+    messages: list[ChatMessage],
+    profile: dict,
+    hat_ids: Iterable[str],
+    background_ids: Iterable[str],
+    model: str,
+    tier: ModelTier,
+) -> ChatResult:
+    request = _openai_request(messages, profile, hat_ids, background_ids, model, tier)
+    response = await _client().responses.create(**request)
+    usage = _openai_usage(response)
+    _log_usage("openai", request["model"], usage)
 
     data = json.loads(response.output_text)
-    return ChatResult(**data)
+    result = ChatResult(**data)
+    result._usage = usage
+    return result
+
+
+async def _stream_openai(
+    messages: list[ChatMessage],
+    profile: dict,
+    hat_ids: Iterable[str],
+    background_ids: Iterable[str],
+    model: str,
+    tier: ModelTier,
+) -> AsyncIterator[tuple[str, Any]]:
+    request = _openai_request(messages, profile, hat_ids, background_ids, model, tier)
+    stream = await _client().responses.create(**request, stream=True)
+    async for event in stream:
+        if event.type == "response.output_text.delta":
+            yield "text", event.delta
+        elif event.type == "response.completed":
+            usage = _openai_usage(event.response)
+            _log_usage("openai", request["model"], usage)
+            yield "usage", usage
+        elif event.type in {"response.failed", "error"}:
+            raise ChatServiceError("OpenAI streaming response failed.", status_code=502)
 
 
 def _extract_json(text: str) -> dict:
@@ -203,20 +413,22 @@ def _extract_json(text: str) -> dict:
     return json.loads(text[start : end + 1])
 
 
-def _chat_gemini(
+def _gemini_request(
     messages: list[ChatMessage],
     profile: dict,
     hat_ids: Iterable[str],
     background_ids: Iterable[str],
-) -> ChatResult:
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise RuntimeError("GEMINI_API_KEY is not set")
-    model = os.getenv("GEMINI_MODEL", DEFAULT_GEMINI_MODEL)
-    temperature = _get_float("GEMINI_TEMPERATURE", DEFAULT_GEMINI_TEMPERATURE)
+    model: str,
+    tier: ModelTier,
+) -> dict[str, Any]:
+    temperature = tier.temperature
+    if temperature is None:
+        temperature = get_float("GEMINI_TEMPERATURE", DEFAULT_GEMINI_TEMPERATURE)
     contents: list[types.Content] = []
     for msg in messages:
-        role = "user" if msg.role == "user" else "model"
+        # Gemini has no system turns in contents; a session summary goes in
+        # as user-side context.
+        role = "model" if msg.role == "assistant" else "user"
         contents.append(
             types.Content(
                 role=role,
@@ -224,51 +436,110 @@ def _chat_gemini(
             )
         )
 
-    system_prompt_text = _system_prompt(profile, hat_ids, background_ids)
+    contents.insert(
+        max(len(contents) - 1, 0),
+        types.Content(role="user", parts=[types.Part.from_text(text=_stats_prompt(profile))]),
+    )
+
     config = types.GenerateContentConfig(
-        system_instruction=system_prompt_text,
+        system_instruction=_system_prompt(hat_ids, background_ids),
         response_mime_type="application/json",
         response_schema=ChatResult,
         temperature=temperature,
+        **_gemini_limits(tier),
     )
+    return {"model": model, "contents": contents, "config": config}
 
-    response = None
-    for attempt in range(3):
-        try:
-            with genai.Client(api_key=api_key) as client:
-                response = client.models.generate_content(
-                    model=model,
-                    contents=contents,
-                    config=config,
-                )
-            break
-        except errors.APIError as exc:
-            code = exc.code
-            if code in {429, 503} and attempt < 2:
-                time.sleep(0.5 * (2**attempt))
-                continue
-            if code == 429:
-                raise ChatServiceError(
-                    "Gemini rate limit exceeded. Please try again shortly.",
-                    status_code=429,
-                ) from exc
-            if code in {401, 403}:
-                raise ChatServiceError(
-                    "Gemini authentication failed. Check GEMINI_API_KEY.",
-                    status_code=401,
-                ) from exc
-            raise ChatServiceError(
-                f"Gemini API error (HTTP {code}).",
-                status_code=502,
-            ) from exc
-        except Exception as exc:
-            raise ChatServiceError(
-                "Gemini API request failed.",
-                status_code=502,
-            ) from exc
-
-    if response is None:
-        raise ChatServiceError("Gemini API request failed.", status_code=502)
+
+def _gemini_limits(tier: ModelTier) -> dict[str, Any]:
+    limits: dict[str, Any] = {}
+    if tier.max_output_tokens:
+        limits["max_output_tokens"] = tier.max_output_tokens
+    if tier.timeout:
+        limits["http_options"] = types.HttpOptions(timeout=int(tier.timeout * 1000))
+    return limits
+
+
+def _gemini_error(exc: errors.APIError) -> ChatServiceError:
+    code = exc.code
+    if code == 429:
+        return ChatServiceError(
+            "Gemini rate limit exceeded. Please try again shortly.",
+            status_code=429,
+        )
+    if code in {401, 403}:
+        return ChatServiceError(
+            "Gemini authentication failed. Check GEMINI_API_KEY.",
+            status_code=401,
+        )
+    return ChatServiceError(
+        f"Gemini API error (HTTP {code}).",
+        status_code=502,
+    )
+
+
+async def _chat_gemini(
+    messages: list[ChatMessage],
+    profile: dict,
+    hat_ids: Iterable[str],
+    background_ids: Iterable[str],
+    model: str,
+    tier: ModelTier,
+) -> ChatResult:
+    client = get_clients().gemini().aio
+    request = _gemini_request(messages, profile, hat_ids, background_ids, model, tier)
+
+    try:
+        response = await client.models.generate_content(**request)
+    except errors.APIError as exc:
+        raise _gemini_error(exc) from exc
+    except Exception as exc:
+        raise ChatServiceError(
+            "Gemini API request failed.",
+            status_code=502,
+        ) from exc
+
+    usage = _gemini_usage(response)
+    _log_usage("gemini", request["model"], usage)
+    result = _parse_gemini_response(response)
+    result._usage = usage
+    return result
+
+
+async def _stream_gemini(
+    messages: list[ChatMessage],
+    profile: dict,
+    hat_ids: Iterable[str],
+    background_ids: Iterable[str],
+    model: str,
+    tier: ModelTier,
+) -> AsyncIterator[tuple[str, Any]]:
+    client = get_clients().gemini().aio
+    request = _gemini_request(messages, profile, hat_ids, background_ids, model, tier)
+
+    try:
+        stream = await client.models.generate_content_stream(**request)
+    except errors.APIError as exc:
+        raise _gemini_error(exc) from exc
+    except Exception as exc:
+        raise ChatServiceError(
+            "Gemini API request failed.",
+            status_code=502,
+        ) from exc
+
+    usage = None
+    try:
+        async for chunk in stream:
+            usage = _gemini_usage(chunk) or usage
+            if chunk.text:
+                yield "text", chunk.text
+    except errors.APIError as exc:
+        raise _gemini_error(exc) from exc
+    _log_usage("gemini", request["model"], usage)
+    yield "usage", usage
+
+
+def _parse_gemini_response(response: types.GenerateContentResponse) -> ChatResult:
     parsed_obj = getattr(response, "parsed", None)
     if parsed_obj is not None:
         if isinstance(parsed_obj, ChatResult):
@@ -314,58 +585,159 @@ def _chat_gemini(
         ) from exc
 
 
-def _normalize_animation(selection: str | None) -> str | None:
-    if not selection:
-        return None
-    allowed = {item["video"] for item in _animation_options()}
-    if selection in allowed:
-        return selection
-    if selection.endswith(".mp4"):
-        candidate = f"{selection[:-4]}.webm"
-        if candidate in allowed:
-            return candidate
-    if "." not in selection:
-        candidate = f"{selection}.webm"
-        if candidate in allowed:
-            return candidate
-    return None
-
-
-def chat_with_cat(
+async def _summarize_openai(prompt: str, model: str, tier: ModelTier) -> str:
+    request: dict[str, Any] = {"model": model, "input": prompt}
+    if tier.reasoning_effort:
+        request["reasoning"] = {"effort": tier.reasoning_effort}
+    response = await _client().responses.create(**request, **_openai_limits(tier))
+    _log_usage("openai", model, _openai_usage(response))
+    return response.output_text
+
+
+async def _summarize_gemini(prompt: str, model: str, tier: ModelTier) -> str:
+    client = get_clients().gemini().aio
+    config = types.GenerateContentConfig(**_gemini_limits(tier))
+    try:
+        response = await client.models.generate_content(
+            model=model, contents=prompt, config=config
+        )
+    except errors.APIError as exc:
+        raise _gemini_error(exc) from exc
+    _log_usage("gemini", model, _gemini_usage(response))
+    return response.text or ""
+
+
+class Provider(NamedTuple):
+    chat: Callable[..., Awaitable[ChatResult]]
+    stream: Callable[..., AsyncIterator[tuple[str, Any]]]
+    summarize: Callable[[str, str, ModelTier], Awaitable[str]]
+
+
+PROVIDERS: dict[str, Provider] = {
+    "openai": Provider(_chat_openai, _stream_openai, _summarize_openai),
+    "gemini": Provider(_chat_gemini, _stream_gemini, _summarize_gemini),
+}
+
+
+async def chat_with_cat(
     messages: list[ChatMessage],
     profile: dict,
     hat_ids: Iterable[str],
     background_ids: Iterable[str],
+    request_type: str = "chat",
 ) -> ChatResult:
-    provider = _provider()
-    if provider == "gemini":
-        result = _chat_gemini(messages, profile, hat_ids, background_ids)
-    else:
-        result = _chat_openai(messages, profile, hat_ids, background_ids)
+    tier, router = _select_tier(request_type, request_type)
+
+    def invoke(backend: Backend) -> Awaitable[ChatResult]:
+        chat = PROVIDERS[backend.provider].chat
+        return chat(messages, profile, hat_ids, background_ids, backend.model, tier)
+
+    try:
+        result = await router.call(invoke, kind=request_type)
+    except NoBackendAvailable as exc:
+        raise ChatServiceError(str(exc), status_code=503) from exc
 
-    result.animation = _normalize_animation(result.animation)
+    result.animation = catalog.normalize(result.animation)
     return result
 
 
-def action_feedback(
+async def stream_chat_with_cat(
+    messages: list[ChatMessage],
+    profile: dict,
+    hat_ids: Iterable[str],
+    background_ids: Iterable[str],
+) -> AsyncIterator[tuple[str, Any]]:
+    """Yields ("reply", text) as the reply arrives, ("reply_end", None) once it
+    is complete, ("field", (name, value)) as each other field completes, and
+    finally ("result", ChatResult)."""
+    tier, router = _select_tier("chat", "chat:stream")
+
+    def invoke(backend: Backend) -> AsyncIterator[tuple[str, Any]]:
+        stream = PROVIDERS[backend.provider].stream
+        return stream(messages, profile, hat_ids, background_ids, backend.model, tier)
+
+    parser = ObjectStreamParser()
+    text: list[str] = []
+    usage = None
+    try:
+        async for kind, value in router.stream(invoke, kind="chat:stream"):
+            if kind == "usage":
+                usage = value
+                continue
+            text.append(value)
+            for event, key, data in parser.feed(value):
+                if key == "reply":
+                    if event == "delta":
+                        yield "reply", data
+                    else:
+                        yield "reply_end", None
+                elif event == "value":
+                    if key == "animation":
+                        data = catalog.normalize(data)
+                    yield "field", (key, data)
+    except NoBackendAvailable as exc:
+        raise ChatServiceError(str(exc), status_code=503) from exc
+
+    raw = "".join(text)
+    try:
+        result = ChatResult(**_extract_json(raw))
+    except Exception as exc:
+        logger.exception("Streamed response parse failure. Raw text: %s", raw)
+        raise ChatServiceError(
+            "Chat response parsing failed.",
+            status_code=502,
+        ) from exc
+    result.animation = catalog.normalize(result.animation)
+    result._usage = usage
+    yield "result", result
+
+
+async def action_feedback(
     action: str,
     profile: dict,
     hat_ids: Iterable[str],
     background_ids: Iterable[str],
 ) -> ChatResult:
     message = ChatMessage(role="user", content=_action_feedback_prompt(action))
-    result = chat_with_cat([message], profile, hat_ids, background_ids)
+    result = await chat_with_cat(
+        [message], profile, hat_ids, background_ids, request_type="action_feedback"
+    )
     result.equip = None
     return result
 
 
-def reminder_with_cat(
+async def reminder_with_cat(
     profile: dict,
     hat_ids: Iterable[str],
     background_ids: Iterable[str],
 ) -> ChatResult:
-    message = ChatMessage(role="user", content=_reminder_prompt())
-    result = chat_with_cat([message], profile, hat_ids, background_ids)
-    result.equip = None
-    result.action = "none"
-    return result
+    hat_ids, background_ids = tuple(hat_ids), tuple(background_ids)
+
+    async def remind() -> ChatResult:
+        message = ChatMessage(role="user", content=_reminder_prompt())
+        result = await chat_with_cat(
+            [message], profile, hat_ids, background_ids, request_type="reminder"
+        )
+        result.equip = None
+        result.action = "none"
+        return result
+
+    # The prompt only sees the rounded stats, so identical keys mean
+    # identical requests; each caller gets its own copy of the shared result.
+    key = cache_key(_stats_prompt(profile), *hat_ids, "|", *background_ids)
+    result = await reminder_flight.call(key, remind)
+    return result.model_copy(deep=True)
+
+
+async def summarize_conversation(summary: str, messages: list[ChatMessage]) -> str:
+    prompt = _summary_prompt(summary, messages)
+    tier, router = _select_tier("summary", "summary")
+
+    def invoke(backend: Backend) -> Awaitable[str]:
+        return PROVIDERS[backend.provider].summarize(prompt, backend.model, tier)
+
+    try:
+        text = await router.call(invoke, kind="summary")
+    except NoBackendAvailable as exc:
+        raise ChatServiceError(str(exc), status_code=503) from exc
+    return text.strip()
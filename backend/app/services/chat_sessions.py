@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from app import db
+from app.config import get_int
+from app.models import ChatMessage
+from app.services import chat as chat_service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_TOKENS = 1500
+DEFAULT_SUMMARY_MIN_MESSAGES = 6
+MAX_WINDOW_MESSAGES = 100
+
+_summarizing: set[str] = set()
+_tasks: set[asyncio.Task] = set()
+
+
+@dataclass
+class Turn:
+    session_id: str
+    # The user's message; stored with the reply once the turn succeeds.
+    message: ChatMessage
+    messages: list[ChatMessage]
+    # Last message that fell out of the window unsummarized, or 0.
+    summarize_upto: int
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token, plus per-message overhead.
+    return len(text) // 4 + 4
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _open(conn: sqlite3.Connection, user_id: str, session_id: str | None) -> sqlite3.Row:
+    if session_id:
+        session = db.load_chat_session(conn, session_id, user_id)
+        if session is not None:
+            return session
+    # Unknown or someone else's session: start a fresh one.
+    session_id = uuid.uuid4().hex
+    db.create_chat_session(conn, session_id, user_id, _now())
+    return db.load_chat_session(conn, session_id, user_id)
+
+
+def _window(conn: sqlite3.Connection, session: sqlite3.Row, message: ChatMessage) -> Turn:
+    # The new message, then stored messages newest first, as many as fit the
+    # token budget; the summary stands in for everything before them.
+    budget = get_int("CHAT_WINDOW_TOKENS", DEFAULT_WINDOW_TOKENS)
+    rows = db.load_recent_chat_messages(
+        conn, session["id"], session["summarized_seq"], MAX_WINDOW_MESSAGES
+    )
+    kept: list[sqlite3.Row] = []
+    used = estimate_tokens(message.content)
+    for row in rows:
+        cost = estimate_tokens(row["content"])
+        if used + cost > budget:
+            break
+        kept.append(row)
+        used += cost
+    messages = [ChatMessage(role=row["role"], content=row["content"]) for row in reversed(kept)]
+    messages.append(message)
+    if session["summary"]:
+        messages.insert(
+            0,
+            ChatMessage(
+                role="system",
+                content=f"Summary of the conversation so far: {session['summary']}",
+            ),
+        )
+    if kept:
+        dropped_upto = kept[-1]["seq"] - 1
+    else:
+        dropped_upto = rows[0]["seq"] if rows else session["summarized_seq"]
+    dropped = dropped_upto - session["summarized_seq"]
+    min_messages = get_int("CHAT_SUMMARY_MIN_MESSAGES", DEFAULT_SUMMARY_MIN_MESSAGES)
+    return Turn(
+        session_id=session["id"],
+        message=message,
+        messages=messages,
+        summarize_upto=dropped_upto if dropped >= max(1, min_messages) else 0,
+    )
+
+
+def begin_turn(user_id: str, session_id: str | None, message: ChatMessage) -> Turn:
+    """Returns the prompt window for the user's message.
+
+    Nothing is stored yet: if the reply never arrives, the session carries
+    no unanswered user message into the next turn.
+    """
+    with db.write_transaction() as conn:
+        session = _open(conn, user_id, session_id)
+        return _window(conn, session, message)
+
+
+def end_turn(turn: Turn, reply: str) -> None:
+    with db.write_transaction() as conn:
+        at = _now()
+        message = turn.message
+        db.append_chat_message(conn, turn.session_id, message.role, message.content, at)
+        db.append_chat_message(conn, turn.session_id, "assistant", reply, at)
+
+
+def schedule_summary(turn: Turn) -> None:
+    """Folds the messages that left the window into the summary, off the
+    request path. The prompt leaves them out until this lands."""
+    if not turn.summarize_upto or turn.session_id in _summarizing:
+        return
+    _summarizing.add(turn.session_id)
+    task = asyncio.create_task(_summarize(turn.session_id, turn.summarize_upto))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+def _load_for_summary(session_id: str, upto: int) -> tuple[str, int, list[sqlite3.Row]]:
+    with db.get_conn() as conn:
+        summary, summarized_seq = db.load_chat_summary(conn, session_id)
+        rows = db.load_chat_messages(conn, session_id, summarized_seq, upto)
+    return summary, summarized_seq, rows
+
+
+def _save_summary(session_id: str, summary: str, upto: int, expected_seq: int) -> None:
+    with db.write_transaction() as conn:
+        db.save_chat_summary(conn, session_id, summary, upto, expected_seq)
+
+
+async def _summarize(session_id: str, upto: int) -> None:
+    try:
+        summary, summarized_seq, rows = await asyncio.to_thread(
+            _load_for_summary, session_id, upto
+        )
+        if not rows:
+            return
+        messages = [ChatMessage(role=row["role"], content=row["content"]) for row in rows]
+        summary = await chat_service.summarize_conversation(summary, messages)
+        if summary:
+            await asyncio.to_thread(
+                _save_summary, session_id, summary, rows[-1]["seq"], summarized_seq
+            )
+    except Exception as exc:
+        logger.warning("Chat summary for session %s failed: %s", session_id[:8], exc)
+    finally:
+        _summarizing.discard(session_id)
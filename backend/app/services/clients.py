@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+
+import httpx
+from elevenlabs.client import AsyncElevenLabs
+from google import genai
+from google.genai import types
+from openai import AsyncOpenAI
+
+from app.config import get_bool, get_float, get_int
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE = 20
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_TIMEOUT = 120.0
+
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com"
+ELEVENLABS_BASE_URL = "https://api.elevenlabs.io"
+
+
+def _http_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=get_int("PROVIDER_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS),
+        max_keepalive_connections=get_int(
+            "PROVIDER_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE
+        ),
+        keepalive_expiry=get_float("PROVIDER_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY),
+    )
+    timeout = httpx.Timeout(
+        get_float("PROVIDER_TIMEOUT", DEFAULT_TIMEOUT),
+        connect=get_float("PROVIDER_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+    )
+    return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+
+class ProviderClients:
+    def __init__(self) -> None:
+        self._http: dict[str, httpx.AsyncClient] = {}
+        self._openai: AsyncOpenAI | None = None
+        self._gemini: genai.Client | None = None
+        self._elevenlabs: AsyncElevenLabs | None = None
+
+    def _pool(self, provider: str) -> httpx.AsyncClient:
+        # One pool per provider so a stalled upstream cannot starve the others.
+        if provider not in self._http:
+            self._http[provider] = _http_client()
+        return self._http[provider]
+
+    def openai(self) -> AsyncOpenAI:
+        if self._openai is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise RuntimeError("OPENAI_API_KEY is not set")
+            self._openai = AsyncOpenAI(
+                api_key=api_key,
+                base_url=os.getenv("OPENAI_BASE_URL") or OPENAI_BASE_URL,
+                timeout=get_float("PROVIDER_TIMEOUT", DEFAULT_TIMEOUT),
+                http_client=self._pool("openai"),
+            )
+        return self._openai
+
+    def gemini(self) -> genai.Client:
+        if self._gemini is None:
+            api_key = os.getenv("GEMINI_API_KEY")
+            if not api_key:
+                raise RuntimeError("GEMINI_API_KEY is not set")
+            self._gemini = genai.Client(
+                api_key=api_key,
+                http_options=types.HttpOptions(
+                    base_url=os.getenv("GEMINI_BASE_URL") or None,
+                    timeout=int(get_float("PROVIDER_TIMEOUT", DEFAULT_TIMEOUT) * 1000),
+                    httpx_async_client=self._pool("gemini"),
+                ),
+            )
+        return self._gemini
+
+    def elevenlabs(self) -> AsyncElevenLabs:
+        if self._elevenlabs is None:
+            api_key = os.getenv("ELEVENLABS_API_KEY")
+            if not api_key:
+                raise RuntimeError("ELEVENLABS_API_KEY is not set")
+            self._elevenlabs = AsyncElevenLabs(
+                api_key=api_key,
+                base_url=os.getenv("ELEVENLABS_BASE_URL") or ELEVENLABS_BASE_URL,
+                timeout=get_float("PROVIDER_TIMEOUT", DEFAULT_TIMEOUT),
+                httpx_client=self._pool("elevenlabs"),
+            )
+        return self._elevenlabs
+
+    async def warmup(self) -> None:
+        targets = []
+        if os.getenv("OPENAI_API_KEY"):
+            targets.append(("openai", os.getenv("OPENAI_BASE_URL") or OPENAI_BASE_URL))
+        if os.getenv("GEMINI_API_KEY"):
+            targets.append(("gemini", os.getenv("GEMINI_BASE_URL") or GEMINI_BASE_URL))
+        if os.getenv("ELEVENLABS_API_KEY"):
+            targets.append(
+                ("elevenlabs", os.getenv("ELEVENLABS_BASE_URL") or ELEVENLABS_BASE_URL)
+            )
+        connections = get_int("PROVIDER_WARMUP_CONNECTIONS", 2)
+
+        async def touch(provider: str, url: str) -> None:
+            try:
+                await self._pool(provider).head(url)
+            except httpx.HTTPError as exc:
+                logger.info("Warmup of %s failed: %s", provider, exc)
+
+        # Concurrent requests force the pool to open several TLS sessions.
+        await asyncio.gather(
+            *(
+                touch(provider, url)
+                for provider, url in targets
+                for _ in range(connections)
+            )
+        )
+        logger.info("Provider warmup done for %s", [name for name, _ in targets])
+
+    async def aclose(self) -> None:
+        for pool in self._http.values():
+            await pool.aclose()
+        self._http.clear()
+        self._openai = None
+        self._gemini = None
+        self._elevenlabs = None
+
+
+_registry: ProviderClients | None = None
+
+
+def get_clients() -> ProviderClients:
+    global _registry
+    if _registry is None:
+        _registry = ProviderClients()
+    return _registry
+
+
+async def startup() -> None:
+    registry = get_clients()
+    if get_bool("PROVIDER_WARMUP", False):
+        await registry.warmup()
+
+
+async def shutdown() -> None:
+    global _registry
+    if _registry is not None:
+        await _registry.aclose()
+        _registry = None
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+DECAY_RATES = {
+    "hunger": 0.012,
+    "energy": 0.009,
+    "hygiene": 0.01,
+    "fun": 0.011,
+}
+LOW_STAT = 30.0
+WATCHED_STATS = ("hunger", "energy", "hygiene", "fun", "mood")
+
+
+def _mood_seconds_until(profile: dict[str, Any], threshold: float) -> float | None:
+    # Mood is the mean of the decaying stats, so it falls piecewise linearly:
+    # the slope flattens each time one of them bottoms out at zero.
+    target = threshold * len(DECAY_RATES)
+    total = sum(profile[key] for key in DECAY_RATES)
+    if total <= target:
+        return 0.0
+    floors = sorted(
+        (profile[key] / rate, rate)
+        for key, rate in DECAY_RATES.items()
+        if profile[key] > 0 and rate > 0
+    )
+    slope = sum(rate for _, rate in floors)
+    elapsed = 0.0
+    for floor_at, rate in floors:
+        # The tolerance absorbs rounding when the target is where the stats
+        # bottom out (e.g. a threshold of 0).
+        if total - slope * (floor_at - elapsed) <= target + 1e-9:
+            return elapsed + (total - target) / slope
+        total -= slope * (floor_at - elapsed)
+        elapsed = floor_at
+        slope -= rate
+    return None
+
+
+def seconds_until(profile: dict[str, Any], stat: str, threshold: float) -> float | None:
+    """Seconds after ``last_updated`` until ``stat`` falls to ``threshold``.
+
+    Returns 0 when it is already there and None when decay never gets it there.
+    """
+    if stat == "mood":
+        return _mood_seconds_until(profile, threshold)
+    value = profile[stat]
+    if value <= threshold:
+        return 0.0
+    rate = DECAY_RATES.get(stat, 0.0)
+    if rate <= 0 or threshold < 0:
+        return None
+    return (value - threshold) / rate
+
+
+def crossings(
+    profile: dict[str, Any],
+    threshold: float = LOW_STAT,
+    stats: tuple[str, ...] = WATCHED_STATS,
+) -> dict[str, datetime]:
+    """When each stat still above ``threshold`` will fall to it."""
+    as_of = datetime.fromisoformat(profile["last_updated"])
+    result = {}
+    for stat in stats:
+        if profile[stat] <= threshold:
+            continue
+        seconds = seconds_until(profile, stat, threshold)
+        if seconds is not None:
+            result[stat] = as_of + timedelta(seconds=seconds)
+    return result
+
+
+def next_attention(
+    profile: dict[str, Any], threshold: float = LOW_STAT, now: datetime | None = None
+) -> dict[str, Any]:
+    """Which stats need attention at ``now`` and when the next one will."""
+    now = now or datetime.now(timezone.utc)
+    due: list[str] = []
+    upcoming = {}
+    for stat, moment in crossings(profile, threshold).items():
+        if moment <= now:
+            due.append(stat)
+        else:
+            upcoming[stat] = moment
+    low = [stat for stat in WATCHED_STATS if profile[stat] <= threshold] + due
+    next_at = min(upcoming.values(), default=None)
+    return {
+        "low_stats": [stat for stat in WATCHED_STATS if stat in low],
+        "next_at": next_at,
+        "next_stats": [stat for stat, moment in upcoming.items() if moment == next_at],
+        "crossings": upcoming,
+    }
+
+
+def schedule(profile: dict[str, Any]) -> dict[str, Any]:
+    """Rates and crossing times a client needs to decay stats locally."""
+    return {
+        "as_of": profile["last_updated"],
+        "rates": DECAY_RATES,
+        "low": LOW_STAT,
+        "crossings": {
+            stat: moment.isoformat()
+            for stat, moment in crossings(profile, stats=tuple(DECAY_RATES)).items()
+        },
+    }
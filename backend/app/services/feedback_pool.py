@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Any
+
+from app.config import get_bool, get_float, get_int
+from app.models import ChatResult
+from app.services import chat as chat_service
+from app.services import game
+from app.services import voice as voice_service
+from app.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZE = 4
+DEFAULT_LOW_WATER = 2
+DEFAULT_TTL = 900.0
+DEFAULT_STAT_STEP = 25.0
+DEFAULT_MAX_KEYS = 256
+QUANTIZED_STATS = ("hunger", "energy", "hygiene", "fun")
+
+PoolKey = tuple[str, tuple[int, ...], tuple[tuple[str, str], ...]]
+
+
+class FeedbackPool:
+    def __init__(
+        self,
+        size: int,
+        low_water: int,
+        ttl: float,
+        stat_step: float,
+        prerender: bool,
+        max_keys: int = DEFAULT_MAX_KEYS,
+    ) -> None:
+        self.size = max(1, size)
+        self.low_water = min(low_water, self.size)
+        self.ttl = ttl
+        self.stat_step = stat_step
+        self.prerender = prerender
+        self.max_keys = max(1, max_keys)
+        self.hits = 0
+        self.misses = 0
+        # Least recently used key first; keys with nothing pooled are dropped.
+        self._pools: OrderedDict[PoolKey, deque[tuple[float, ChatResult]]] = OrderedDict()
+        self._refilling: set[PoolKey] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self.flight = SingleFlight()
+
+    def key(self, action: str, profile: dict[str, Any]) -> PoolKey:
+        top = math.ceil(100 / self.stat_step) - 1
+        buckets = tuple(
+            min(int(profile[stat] // self.stat_step), top) for stat in QUANTIZED_STATS
+        )
+        equipped = tuple(sorted(profile["equipped_items"].items()))
+        return action, buckets, equipped
+
+    def take(self, action: str, profile: dict[str, Any]) -> ChatResult | None:
+        key = self.key(action, profile)
+        pool = self._pools.get(key, deque())
+        now = time.monotonic()
+        while pool and now - pool[0][0] > self.ttl:
+            pool.popleft()
+        result = pool.popleft()[1] if pool else None
+        if pool:
+            self._pools.move_to_end(key)
+        else:
+            self._pools.pop(key, None)
+        if len(pool) < self.low_water:
+            self._schedule_refill(key, action, profile)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result.model_copy(deep=True)
+
+    async def fetch(self, action: str, profile: dict[str, Any]) -> ChatResult:
+        """Generates a reply for a miss; concurrent misses on a key share it."""
+        result = await self.flight.call(
+            repr(self.key(action, profile)), lambda: self._generate(action, profile)
+        )
+        return result.model_copy(deep=True)
+
+    async def _generate(self, action: str, profile: dict[str, Any]) -> ChatResult:
+        shop_items = game.get_shop_items()
+        return await chat_service.action_feedback(
+            action=action,
+            profile=profile,
+            hat_ids=[item["id"] for item in shop_items if item["type"] == "hat"],
+            background_ids=[item["id"] for item in shop_items if item["type"] == "background"],
+        )
+
+    def _schedule_refill(self, key: PoolKey, action: str, profile: dict[str, Any]) -> None:
+        if key in self._refilling:
+            return
+        self._refilling.add(key)
+        task = asyncio.create_task(self._refill(key, action, copy.deepcopy(profile)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _add(self, key: PoolKey, result: ChatResult) -> None:
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = deque(maxlen=self.size)
+        self._pools.move_to_end(key)
+        pool.append((time.monotonic(), result))
+        while len(self._pools) > self.max_keys:
+            self._pools.popitem(last=False)
+
+    async def _refill(self, key: PoolKey, action: str, profile: dict[str, Any]) -> None:
+        try:
+            # One batch per key at a time, one call per missing variant; a
+            # reply that repeats a pooled one is dropped, not retried.
+            for _ in range(self.size - len(self._pools.get(key, ()))):
+                result = await self._generate(action, profile)
+                pool = self._pools.get(key, ())
+                if any(existing.reply == result.reply for _, existing in pool):
+                    continue
+                if self.prerender:
+                    await voice_service.prefetch(result.reply, result.sfx_prompt)
+                self._add(key, result)
+        except Exception:
+            logger.exception("Feedback pool refill failed for %s", key)
+        finally:
+            self._refilling.discard(key)
+
+
+_pool: FeedbackPool | None = None
+
+
+def get_pool() -> FeedbackPool | None:
+    global _pool
+    if not get_bool("FEEDBACK_POOL_ENABLED", True):
+        return None
+    if _pool is None:
+        _pool = FeedbackPool(
+            size=get_int("FEEDBACK_POOL_SIZE", DEFAULT_SIZE),
+            low_water=get_int("FEEDBACK_POOL_LOW_WATER", DEFAULT_LOW_WATER),
+            ttl=get_float("FEEDBACK_POOL_TTL", DEFAULT_TTL),
+            stat_step=get_float("FEEDBACK_POOL_STAT_STEP", DEFAULT_STAT_STEP),
+            prerender=get_bool("FEEDBACK_POOL_PRERENDER", True),
+            max_keys=get_int("FEEDBACK_POOL_MAX_KEYS", DEFAULT_MAX_KEYS),
+        )
+    return _pool
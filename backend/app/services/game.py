@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+import copy
+import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterator
+
+from app.config import get_int
+from app.db import (
+    add_owned_item,
+    append_events,
+    get_or_create_profile,
+    last_event_seq,
+    load_events,
+    load_profile,
+    load_snapshot,
+    save_snapshot,
+    save_stats,
+    set_equipped_item,
+    write_transaction,
+)
+from app.services.decay import DECAY_RATES
 
-from app.db import get_or_create_profile, upsert_profile
-
-DECAY_RATES = {
-    "hunger": 0.012,
-    "energy": 0.009,
-    "hygiene": 0.01,
-    "fun": 0.011,
-}
 
 SHOP_ITEMS = [
     {
@@ -104,8 +115,8 @@ def compute_mood(profile: dict[str, Any]) -> float:
     return round(sum(stats) / len(stats), 1)
 
 
-def apply_decay(profile: dict[str, Any]) -> None:
-    now = datetime.now(timezone.utc)
+def apply_decay(profile: dict[str, Any], now: datetime | None = None) -> None:
+    now = now or datetime.now(timezone.utc)
     last = datetime.fromisoformat(profile["last_updated"])
     delta = max(0.0, (now - last).total_seconds())
     if delta <= 0:
@@ -150,18 +161,19 @@ def apply_minigame(profile: dict[str, Any], score: int, duration_ms: int | None)
     profile["mood"] = compute_mood(profile)
 
 
-def buy_item(profile: dict[str, Any], item_id: str) -> None:
+def buy_item(profile: dict[str, Any], item_id: str) -> bool:
     item = SHOP_MAP.get(item_id)
     if not item:
         raise ValueError("Item not found")
     if item_id in profile["owned_items"]:
-        return
+        return False
     if profile["coins"] < item["price"]:
         raise ValueError("Not enough coins")
     profile["coins"] -= item["price"]
     profile["owned_items"].append(item_id)
     profile["equipped_items"][item["type"]] = item_id
     profile["mood"] = compute_mood(profile)
+    return True
 
 
 def equip_item(profile: dict[str, Any], item_id: str) -> None:
@@ -173,43 +185,154 @@ def equip_item(profile: dict[str, Any], item_id: str) -> None:
     profile["equipped_items"][item["type"]] = item_id
 
 
-def fetch_profile(conn) -> dict[str, Any]:
-    profile = get_or_create_profile(conn)
-    apply_decay(profile)
-    upsert_profile(conn, profile)
-    return profile
-
-
-def update_action(conn, action: str) -> dict[str, Any]:
-    profile = get_or_create_profile(conn)
+def fetch_profile(conn, user_id: str) -> dict[str, Any]:
+    # Decay is a pure function of last_updated, so reads compute it in memory
+    # and leave persisting to the next mutation.
+    profile = get_or_create_profile(conn, user_id)
     apply_decay(profile)
-    apply_action(profile, action)
-    upsert_profile(conn, profile)
     return profile
 
 
-def update_minigame(conn, score: int, duration_ms: int | None) -> dict[str, Any]:
-    profile = get_or_create_profile(conn)
-    apply_decay(profile)
-    apply_minigame(profile, score, duration_ms)
-    upsert_profile(conn, profile)
-    return profile
+EVENT_HANDLERS = {
+    "action": apply_action,
+    "minigame": apply_minigame,
+    "buy": buy_item,
+    "equip": equip_item,
+}
+DEFAULT_SNAPSHOT_EVERY = 50
 
 
-def update_buy(conn, item_id: str) -> dict[str, Any]:
-    profile = get_or_create_profile(conn)
-    apply_decay(profile)
-    buy_item(profile, item_id)
-    upsert_profile(conn, profile)
+def replay(
+    state: dict[str, Any], events: list[tuple[int, str, str, dict[str, Any]]]
+) -> dict[str, Any]:
+    profile = copy.deepcopy(state)
+    for _, at, kind, payload in events:
+        apply_decay(profile, now=datetime.fromisoformat(at))
+        EVENT_HANDLERS[kind](profile, **payload)
     return profile
 
 
-def update_equip(conn, item_id: str) -> dict[str, Any]:
-    profile = get_or_create_profile(conn)
-    apply_decay(profile)
-    equip_item(profile, item_id)
-    upsert_profile(conn, profile)
-    return profile
+def rebuild_profile(conn: sqlite3.Connection, user_id: str) -> dict[str, Any] | None:
+    # Replays the log from the latest snapshot; the profile tables are only a
+    # projection of it kept for single-row reads.
+    current = load_profile(conn, user_id)
+    if current is None:
+        return None
+    snapshot = load_snapshot(conn, current["id"])
+    if snapshot is None:
+        return current
+    seq, state = snapshot
+    return replay(state, load_events(conn, current["id"], seq))
+
+
+class ProfileUnit:
+    """Applies several mutations to one loaded profile and writes them once."""
+
+    def __init__(self, conn: sqlite3.Connection, user_id: str) -> None:
+        self.conn = conn
+        self.profile = get_or_create_profile(conn, user_id)
+        self._base = copy.deepcopy(self.profile)
+        apply_decay(self.profile)
+        self._events: list[tuple[str, dict[str, Any]]] = []
+        self._bought: list[str] = []
+        self._equipped: dict[str, str] = {}
+
+    def owns(self, item_id: str) -> bool:
+        return item_id in self.profile["owned_items"]
+
+    def action(self, action: str) -> None:
+        apply_action(self.profile, action)
+        self._events.append(("action", {"action": action}))
+
+    def minigame(self, score: int, duration_ms: int | None) -> None:
+        apply_minigame(self.profile, score, duration_ms)
+        self._events.append(("minigame", {"score": score, "duration_ms": duration_ms}))
+
+    def buy(self, item_id: str) -> None:
+        if buy_item(self.profile, item_id):
+            self._events.append(("buy", {"item_id": item_id}))
+            self._bought.append(item_id)
+            self._equipped[SHOP_MAP[item_id]["type"]] = item_id
+
+    def equip(self, item_id: str) -> None:
+        equip_item(self.profile, item_id)
+        self._events.append(("equip", {"item_id": item_id}))
+        self._equipped[SHOP_MAP[item_id]["type"]] = item_id
+
+    def flush(self) -> None:
+        if not self._events:
+            return
+        profile_id = self.profile["id"]
+        # Stats are saved even for equip-only units so the projection decays
+        # in the same steps as a replay of the log.
+        save_stats(self.conn, self.profile)
+        for item_id in self._bought:
+            add_owned_item(self.conn, profile_id, item_id)
+        for slot, item_id in self._equipped.items():
+            set_equipped_item(self.conn, profile_id, slot, item_id)
+        self._append_log(profile_id)
+        self._base = copy.deepcopy(self.profile)
+        self._events = []
+        self._bought = []
+        self._equipped = {}
+
+    def _append_log(self, profile_id: int) -> None:
+        last = last_event_seq(self.conn, profile_id)
+        if last is None:
+            # Profiles that predate the log start from what was stored.
+            last = 0
+            save_snapshot(self.conn, profile_id, 0, self._base)
+        at = self.profile["last_updated"]
+        append_events(
+            self.conn,
+            profile_id,
+            [
+                (last + index, at, kind, payload)
+                for index, (kind, payload) in enumerate(self._events, start=1)
+            ],
+        )
+        seq = last + len(self._events)
+        every = max(1, get_int("PROFILE_SNAPSHOT_EVERY", DEFAULT_SNAPSHOT_EVERY))
+        if seq // every > last // every:
+            save_snapshot(self.conn, profile_id, seq, self.profile)
+
+
+@contextmanager
+def unit_of_work(user_id: str) -> Iterator[ProfileUnit]:
+    # Nothing is written if the block raises; otherwise every change lands in
+    # a single commit.
+    with write_transaction() as conn:
+        unit = ProfileUnit(conn, user_id)
+        yield unit
+        unit.flush()
+
+
+def update_action(conn, user_id: str, action: str) -> dict[str, Any]:
+    unit = ProfileUnit(conn, user_id)
+    unit.action(action)
+    unit.flush()
+    return unit.profile
+
+
+def update_minigame(conn, user_id: str, score: int, duration_ms: int | None) -> dict[str, Any]:
+    unit = ProfileUnit(conn, user_id)
+    unit.minigame(score, duration_ms)
+    unit.flush()
+    return unit.profile
+
+
+def update_buy(conn, user_id: str, item_id: str) -> dict[str, Any]:
+    unit = ProfileUnit(conn, user_id)
+    unit.buy(item_id)
+    unit.flush()
+    return unit.profile
+
+
+def update_equip(conn, user_id: str, item_id: str) -> dict[str, Any]:
+    unit = ProfileUnit(conn, user_id)
+    unit.equip(item_id)
+    unit.flush()
+    return unit.profile
 
 
 def get_shop_items() -> list[dict[str, Any]]:
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class ObjectStreamParser:
+    """Incrementally parses one flat JSON object from arbitrary text chunks.
+
+    ``feed`` returns events as soon as the input allows:
+    ``("delta", key, text)`` for each decoded piece of a string value and
+    ``("value", key, value)`` once a top-level value is complete. Nested
+    values are buffered and reported whole. Text before the opening brace
+    (e.g. a Markdown fence) is ignored.
+    """
+
+    def __init__(self) -> None:
+        self._state = "start"
+        self._key = ""
+        self._text: list[str] = []
+        self._raw: list[str] = []
+        self._depth = 0
+        self._raw_in_string = False
+        self._raw_escape = False
+        self._escape = ""
+        self._high_surrogate: int | None = None
+        self.done = False
+
+    def feed(self, chunk: str) -> list[tuple[str, str, Any]]:
+        events: list[tuple[str, str, Any]] = []
+        delta: list[str] = []
+        for char in chunk:
+            if self.done:
+                break
+            state = self._state
+            if state == "start":
+                if char == "{":
+                    self._state = "key_or_end"
+            elif state in ("key_or_end", "key"):
+                if char == '"':
+                    self._state = "key_string"
+                    self._text = []
+                elif char == "}" and state == "key_or_end":
+                    self.done = True
+            elif state == "key_string":
+                if self._escape:
+                    self._consume_escape(char, self._text)
+                elif char == "\\":
+                    self._escape = "\\"
+                elif char == '"':
+                    self._key = "".join(self._text)
+                    self._state = "colon"
+                else:
+                    self._text.append(char)
+            elif state == "colon":
+                if char == ":":
+                    self._state = "value"
+            elif state == "value":
+                if char.isspace():
+                    continue
+                if char == '"':
+                    self._state = "string"
+                    self._text = []
+                else:
+                    self._state = "raw"
+                    self._raw = []
+                    self._depth = 0
+                    self._raw_in_string = False
+                    self._raw_escape = False
+                    self._feed_raw(char, events)
+            elif state == "string":
+                if self._escape:
+                    self._consume_escape(char, delta)
+                elif char == "\\":
+                    self._escape = "\\"
+                elif char == '"':
+                    self._flush_delta(delta, events)
+                    events.append(("value", self._key, "".join(self._text)))
+                    self._state = "after_value"
+                else:
+                    delta.append(char)
+            elif state == "raw":
+                self._feed_raw(char, events)
+            elif state == "after_value":
+                if char == ",":
+                    self._state = "key"
+                elif char == "}":
+                    self.done = True
+        if self._state == "string":
+            self._flush_delta(delta, events)
+        return events
+
+    def _flush_delta(self, delta: list[str], events: list[tuple[str, str, Any]]) -> None:
+        if delta:
+            text = "".join(delta)
+            self._text.append(text)
+            events.append(("delta", self._key, text))
+            delta.clear()
+
+    def _consume_escape(self, char: str, out: list[str]) -> None:
+        self._escape += char
+        if self._escape[1] != "u":
+            out.append(ESCAPES.get(char, char))
+            self._escape = ""
+        elif len(self._escape) == 6:
+            code = int(self._escape[2:], 16)
+            self._escape = ""
+            if 0xD800 <= code < 0xDC00:
+                # Wait for the low surrogate before emitting the character.
+                self._high_surrogate = code
+                return
+            if self._high_surrogate is not None and 0xDC00 <= code < 0xE000:
+                code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+            self._high_surrogate = None
+            out.append(chr(code))
+
+    def _feed_raw(self, char: str, events: list[tuple[str, str, Any]]) -> None:
+        # Scalars end at the next delimiter; arrays/objects when balanced.
+        if self._raw_in_string:
+            self._raw.append(char)
+            if self._raw_escape:
+                self._raw_escape = False
+            elif char == "\\":
+                self._raw_escape = True
+            elif char == '"':
+                self._raw_in_string = False
+            return
+        if self._depth == 0 and char in ",}" and self._raw:
+            events.append(("value", self._key, json.loads("".join(self._raw))))
+            self._state = "key" if char == "," else "after_value"
+            if char == "}":
+                self.done = True
+            return
+        self._raw.append(char)
+        if char == '"':
+            self._raw_in_string = True
+        elif char in "[{":
+            self._depth += 1
+        elif char in "]}":
+            self._depth -= 1
+            if self._depth == 0:
+                events.append(("value", self._key, json.loads("".join(self._raw))))
+                self._state = "after_value"
@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 50
+DEFAULT_MIN_SAMPLES = 5
+DEFAULT_MAX_ERROR_RATE = 0.5
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN = 30.0
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+
+T = TypeVar("T")
+
+
+class NoBackendAvailable(RuntimeError):
+    pass
+
+
+class RollingStats:
+    """Latency and outcome of the last ``size`` requests to one backend."""
+
+    def __init__(self, size: int) -> None:
+        self._samples: deque[tuple[float, bool]] = deque(maxlen=max(1, size))
+
+    def record(self, latency: float, ok: bool) -> None:
+        self._samples.append((latency, ok))
+
+    def clear(self) -> None:
+        self._samples.clear()
+
+    @property
+    def count(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> float | None:
+        latencies = sorted(latency for latency, ok in self._samples if ok)
+        if not latencies:
+            return None
+        return latencies[max(0, math.ceil(q * len(latencies)) - 1)]
+
+    @property
+    def error_rate(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, ok in self._samples if not ok) / len(self._samples)
+
+
+class CircuitBreaker:
+    """Opens after ``threshold`` consecutive failures; after ``cooldown`` one
+    probe request is let through, and its outcome closes or re-opens it."""
+
+    def __init__(
+        self, threshold: int = DEFAULT_FAILURE_THRESHOLD, cooldown: float = DEFAULT_COOLDOWN
+    ) -> None:
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def available(self) -> bool:
+        state = self.state
+        return state == "closed" or (state == "half_open" and not self._probing)
+
+    def acquire(self) -> bool:
+        if not self.available():
+            return False
+        if self._opened_at is not None:
+            self._probing = True
+        return True
+
+    def release(self) -> None:
+        # The request was abandoned (e.g. a losing hedge), so it proves nothing.
+        self._probing = False
+
+    def success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.failures >= self.threshold:
+            if self._opened_at is None:
+                logger.warning("Circuit opened after %d failures", self.failures)
+            self._opened_at = time.monotonic()
+
+
+@dataclass
+class Backend:
+    provider: str
+    model: str
+    breaker: CircuitBreaker
+    window: int = DEFAULT_WINDOW
+    stats: dict[str, RollingStats] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return f"{self.provider}:{self.model}"
+
+    def stats_for(self, kind: str) -> RollingStats:
+        if kind not in self.stats:
+            self.stats[kind] = RollingStats(self.window)
+        return self.stats[kind]
+
+
+class Router:
+    """Routes each request to the fastest healthy backend.
+
+    Latency is tracked separately per request kind ("call" is a whole
+    response, "stream" the time to the first chunk). If ``hedge_after`` is
+    set and the first backend has not answered by then, the next one is
+    asked as well and whichever answers first wins. A failed backend is
+    failed over to the next; when all have failed with a retryable error
+    the round is retried with backoff.
+
+    A request that fails counts once against each backend's circuit breaker,
+    however many attempts it made. With ``breakers`` off (a single backend,
+    where an open circuit would only turn slow errors into instant ones)
+    every backend is always tried.
+    """
+
+    def __init__(
+        self,
+        backends: list[Backend],
+        hedge_after: float = 0.0,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        retryable: Callable[[BaseException], bool] = lambda exc: False,
+        breakers: bool = True,
+    ) -> None:
+        self.backends = backends
+        self.breakers = breakers
+        self.hedge_after = hedge_after
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.retries = retries
+        self.backoff = backoff
+        self.retryable = retryable
+
+    def ranked(self, kind: str) -> list[Backend]:
+        def score(item: tuple[int, Backend]) -> tuple[bool, float, int]:
+            index, backend = item
+            stats = backend.stats_for(kind)
+            if stats.count < self.min_samples:
+                # Too little data: try it early so it gets measured.
+                return False, 0.0, index
+            degraded = stats.error_rate > self.max_error_rate
+            return degraded, stats.percentile(0.5) or math.inf, index
+
+        healthy = [
+            item
+            for item in enumerate(self.backends)
+            if not self.breakers or item[1].breaker.available()
+        ]
+        return [backend for _, backend in sorted(healthy, key=score)]
+
+    def expected_latency(self, kind: str, q: float) -> float | None:
+        """The ``q`` latency quantile of the best measured healthy backend."""
+        latencies = [
+            latency
+            for backend in self.ranked(kind)
+            if backend.stats_for(kind).count >= self.min_samples
+            and (latency := backend.stats_for(kind).percentile(q)) is not None
+        ]
+        return min(latencies, default=None)
+
+    async def call(
+        self, invoke: Callable[[Backend], Awaitable[T]], kind: str = "call"
+    ) -> T:
+        return (await self._race(invoke, kind))[1]
+
+    async def stream(
+        self, invoke: Callable[[Backend], AsyncIterator[T]], kind: str = "stream"
+    ) -> AsyncIterator[T]:
+        # Backends race to their first chunk; after that the stream is
+        # committed, since chunks already forwarded cannot be taken back.
+        async def first(backend: Backend) -> tuple[AsyncIterator[T], T]:
+            iterator = invoke(backend).__aiter__()
+            try:
+                return iterator, await iterator.__anext__()
+            except BaseException:
+                await _aclose(iterator)
+                raise
+
+        backend, (iterator, chunk) = await self._race(
+            first, kind, discard=lambda result: _aclose(result[0])
+        )
+        try:
+            yield chunk
+            async for chunk in iterator:
+                yield chunk
+        except Exception:
+            if self.breakers:
+                backend.breaker.failure()
+            raise
+        finally:
+            await _aclose(iterator)
+
+    async def _race(
+        self,
+        invoke: Callable[[Backend], Awaitable[Any]],
+        kind: str,
+        discard: Callable[[Any], Awaitable[None]] | None = None,
+    ) -> tuple[Backend, Any]:
+        error: BaseException | None = None
+        # Backends that failed this request; charged to their breakers once
+        # at the end unless a later attempt on them succeeded.
+        failed: list[Backend] = []
+        try:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+                queue = self.ranked(kind)
+                pending: dict[asyncio.Task[Any], tuple[Backend, float]] = {}
+
+                def launch() -> bool:
+                    while queue:
+                        backend = queue.pop(0)
+                        if not self.breakers or backend.breaker.acquire():
+                            task = asyncio.ensure_future(invoke(backend))
+                            pending[task] = (backend, time.monotonic())
+                            return True
+                    return False
+
+                try:
+                    launch()
+                    hedged = False
+                    while pending:
+                        timeout = None
+                        if self.hedge_after > 0 and not hedged and queue:
+                            started = min(started for _, started in pending.values())
+                            timeout = max(0.0, started + self.hedge_after - time.monotonic())
+                        done, _ = await asyncio.wait(
+                            pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        if not done:
+                            hedged = True
+                            if launch():
+                                logger.info(
+                                    "Hedging %s request after %.2fs", kind, self.hedge_after
+                                )
+                            continue
+                        winner: tuple[Backend, Any] | None = None
+                        for task in done:
+                            backend, started = pending.pop(task)
+                            latency = time.monotonic() - started
+                            exc = task.exception()
+                            if exc is None:
+                                if winner is not None:
+                                    if discard is not None:
+                                        await discard(task.result())
+                                    self._release(backend)
+                                    continue
+                                backend.stats_for(kind).record(latency, True)
+                                if self.breakers:
+                                    backend.breaker.success()
+                                failed = [item for item in failed if item is not backend]
+                                winner = backend, task.result()
+                            else:
+                                logger.info("LLM backend %s failed: %s", backend.name, exc)
+                                backend.stats_for(kind).record(latency, False)
+                                # Frees a half-open probe slot for the next attempt.
+                                self._release(backend)
+                                if all(item is not backend for item in failed):
+                                    failed.append(backend)
+                                error = exc
+                        if winner is not None:
+                            return winner
+                        if not pending:
+                            launch()
+                finally:
+                    for task, (backend, _) in pending.items():
+                        # A cancelled loser neither succeeded nor failed, and
+                        # its cut-off latency is not a real sample.
+                        task.cancel()
+                        self._release(backend)
+                        if discard is not None:
+                            task.add_done_callback(_discard_late(discard))
+                if error is None or not self.retryable(error):
+                    break
+        finally:
+            if self.breakers:
+                for backend in failed:
+                    backend.breaker.failure()
+        if error is not None:
+            raise error
+        raise NoBackendAvailable("No LLM backend is available right now.")
+
+    def _release(self, backend: Backend) -> None:
+        if self.breakers:
+            backend.breaker.release()
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return snapshot(self.backends)
+
+
+def snapshot(backends: Iterable[Backend]) -> list[dict[str, Any]]:
+    return [
+        {
+            "name": backend.name,
+            "circuit": backend.breaker.state,
+            "stats": {
+                kind: {
+                    "samples": stats.count,
+                    "p50": stats.percentile(0.5),
+                    "p95": stats.percentile(0.95),
+                    "error_rate": stats.error_rate,
+                }
+                for kind, stats in backend.stats.items()
+            },
+        }
+        for backend in backends
+    ]
+
+
+async def _aclose(iterator: Any) -> None:
+    aclose = getattr(iterator, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
+def _discard_late(
+    discard: Callable[[Any], Awaitable[None]],
+) -> Callable[[asyncio.Task[Any]], None]:
+    # A cancelled loser may still have finished in the meantime; clean up
+    # whatever it produced.
+    def callback(task: asyncio.Task[Any]) -> None:
+        if not task.cancelled() and task.exception() is None:
+            asyncio.ensure_future(discard(task.result()))
+
+    return callback
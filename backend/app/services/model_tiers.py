@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import functools
+import logging
+import os
+from dataclasses import dataclass, field
+
+from app.config import get_float, get_int
+
+logger = logging.getLogger(__name__)
+
+PROVIDER_NAMES = ("openai", "gemini")
+
+
+@dataclass
+class ModelTier:
+    """Model settings for one kind of request.
+
+    ``models`` maps a provider to its model; providers left out use their
+    default model. When the tier's p95 latency goes over ``latency_budget``,
+    requests are downgraded to the ``fallback`` tier.
+    """
+
+    name: str
+    models: dict[str, str] = field(default_factory=dict)
+    reasoning_effort: str | None = None
+    temperature: float | None = None
+    max_output_tokens: int | None = None
+    timeout: float | None = None
+    latency_budget: float | None = None
+    fallback: str | None = None
+
+
+# "chat" keeps the provider defaults (OPENAI_MODEL, GEMINI_MODEL, ...);
+# short, formulaic requests get smaller models and less reasoning.
+DEFAULT_TIERS: dict[str, ModelTier] = {
+    "chat": ModelTier("chat"),
+    "action_feedback": ModelTier(
+        "action_feedback",
+        models={"openai": "gpt-5-mini", "gemini": "gemini-2.5-flash-lite"},
+        reasoning_effort="minimal",
+        timeout=5.0,
+        latency_budget=1.0,
+        fallback="fast",
+    ),
+    "reminder": ModelTier(
+        "reminder",
+        models={"openai": "gpt-5-mini", "gemini": "gemini-2.5-flash"},
+        reasoning_effort="low",
+    ),
+    "summary": ModelTier(
+        "summary",
+        models={"openai": "gpt-5-mini", "gemini": "gemini-2.5-flash-lite"},
+        reasoning_effort="minimal",
+        max_output_tokens=400,
+    ),
+    "fast": ModelTier(
+        "fast",
+        models={"openai": "gpt-5-nano", "gemini": "gemini-2.5-flash-lite"},
+        reasoning_effort="minimal",
+        timeout=5.0,
+    ),
+}
+
+
+def _parse_models(value: str) -> dict[str, str]:
+    models = {}
+    for entry in value.split(","):
+        provider, _, model = entry.strip().partition(":")
+        provider = provider.lower()
+        if provider not in PROVIDER_NAMES or not model:
+            logger.warning("Ignoring invalid model entry %r", entry)
+            continue
+        models[provider] = model
+    return models
+
+
+def _optional_float(name: str, default: float | None) -> float | None:
+    if not os.getenv(name):
+        return default
+    value = get_float(name, default or 0.0)
+    return value if value > 0 else None
+
+
+@functools.lru_cache(maxsize=None)
+def get_tier(name: str) -> ModelTier:
+    """The tier for ``name``, with LLM_<NAME>_* environment overrides."""
+    default = DEFAULT_TIERS.get(name, ModelTier(name))
+    prefix = f"LLM_{name.upper()}_"
+    models = dict(default.models)
+    if os.getenv(prefix + "MODELS"):
+        models = _parse_models(os.environ[prefix + "MODELS"])
+    max_tokens = default.max_output_tokens
+    if os.getenv(prefix + "MAX_TOKENS"):
+        max_tokens = get_int(prefix + "MAX_TOKENS", 0) or None
+    fallback = os.getenv(prefix + "FALLBACK", default.fallback or "")
+    return ModelTier(
+        name=name,
+        models=models,
+        reasoning_effort=os.getenv(prefix + "REASONING_EFFORT", default.reasoning_effort),
+        temperature=_optional_float(prefix + "TEMPERATURE", default.temperature),
+        max_output_tokens=max_tokens,
+        timeout=_optional_float(prefix + "TIMEOUT", default.timeout),
+        latency_budget=_optional_float(prefix + "LATENCY_BUDGET", default.latency_budget),
+        fallback=fallback if fallback and fallback != "none" else None,
+    )
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Optional
+
+from app.config import get_float
+from app.models import ProfileOut
+from app.services import decay as decay_engine
+
+DEFAULT_HEARTBEAT = 15.0
+DEFAULT_POLL_INTERVAL = 5.0
+
+Subscriber = tuple[asyncio.AbstractEventLoop, "asyncio.Queue[dict[str, Any]]"]
+# Given the last stamp seen, returns the new stamp and profile if it changed.
+Poll = Callable[[Optional[str]], Optional[tuple[Optional[str], dict[str, Any]]]]
+
+
+def sse_event(name: str, payload: dict[str, Any]) -> str:
+    return f"event: {name}\ndata: {json.dumps(payload)}\n\n"
+
+
+class ProfileEvents:
+    """Pushes profile changes to open streams.
+
+    publish() only reaches streams in the same process. With several
+    workers, each stream also polls the database for changes committed
+    elsewhere, so those arrive within ``poll_interval`` seconds.
+    """
+
+    def __init__(self, heartbeat: float, poll_interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        self.heartbeat = heartbeat
+        self.poll_interval = poll_interval
+        self._subscribers: dict[str, set[Subscriber]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, user_id: str, profile: dict[str, Any]) -> None:
+        # Called from threadpool workers after a commit, so hand the snapshot
+        # to each subscriber's own event loop.
+        snapshot = ProfileOut(**profile).model_dump()
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, snapshot)
+
+    def _subscribe(self, user_id: str) -> Subscriber:
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscriber)
+        return subscriber
+
+    def _unsubscribe(self, user_id: str, subscriber: Subscriber) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[user_id]
+
+    async def stream(
+        self,
+        user_id: str,
+        profile: dict[str, Any],
+        on_heartbeat: Callable[[], None] | None = None,
+        stamp: str | None = None,
+        poll: Poll | None = None,
+    ) -> AsyncIterator[str]:
+        # The first event carries the whole profile; later ones only the fields
+        # a mutation changed. Between mutations the client decays stats itself
+        # from the schedule, and the server only speaks up when a stat crosses
+        # LOW_STAT.
+        subscriber = self._subscribe(user_id)
+        loop, queue = subscriber
+        sent: dict[str, Any] = {}
+        pending: dict[str, Any] | None = ProfileOut(**profile).model_dump()
+        crossings: list[tuple[datetime, str]] = []
+        beat_at = loop.time() + self.heartbeat
+        poll_at = None
+        if poll is not None and self.poll_interval > 0:
+            poll_at = loop.time() + self.poll_interval
+        try:
+            while True:
+                if pending is not None:
+                    changes = {
+                        key: value
+                        for key, value in pending.items()
+                        if sent.get(key) != value
+                    }
+                    sent = pending
+                    pending = None
+                    decay = decay_engine.schedule(sent)
+                    crossings = sorted(
+                        (datetime.fromisoformat(moment), key)
+                        for key, moment in decay["crossings"].items()
+                    )
+                    yield sse_event("profile", {"changes": changes, "decay": decay})
+                    beat_at = loop.time() + self.heartbeat
+
+                now = datetime.now(timezone.utc)
+                due = [key for moment, key in crossings if moment <= now]
+                if due:
+                    crossings = [item for item in crossings if item[0] > now]
+                    yield sse_event("attention", {"stats": due})
+                    beat_at = loop.time() + self.heartbeat
+                    continue
+
+                wake_at = min(beat_at, poll_at or beat_at)
+                if crossings:
+                    until_crossing = (crossings[0][0] - now).total_seconds()
+                    wake_at = min(wake_at, loop.time() + until_crossing)
+                timeout = max(0.0, wake_at - loop.time())
+                try:
+                    pending = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    if poll_at is not None and loop.time() >= poll_at:
+                        changed = await asyncio.to_thread(poll, stamp)
+                        poll_at = loop.time() + self.poll_interval
+                        if changed is not None:
+                            stamp, latest = changed
+                            pending = ProfileOut(**latest).model_dump()
+                            continue
+                    if loop.time() >= beat_at:
+                        if on_heartbeat is not None:
+                            on_heartbeat()
+                        yield ": keepalive\n\n"
+                        beat_at = loop.time() + self.heartbeat
+                    continue
+                # Several commits may land between sends; only the latest matters.
+                while not queue.empty():
+                    pending = queue.get_nowait()
+                # A mutation's last_updated is what it stored, so polls skip it.
+                stamp = pending["last_updated"]
+        finally:
+            self._unsubscribe(user_id, subscriber)
+
+
+_events: ProfileEvents | None = None
+
+
+def get_events() -> ProfileEvents:
+    global _events
+    if _events is None:
+        _events = ProfileEvents(
+            heartbeat=get_float("PROFILE_STREAM_HEARTBEAT", DEFAULT_HEARTBEAT),
+            poll_interval=get_float("PROFILE_STREAM_POLL", DEFAULT_POLL_INTERVAL),
+        )
+    return _events
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from app.config import get_bool, get_float, get_int
+from app.db import get_conn
+from app.models import ChatResult
+from app.services import chat as chat_service
+from app.services import decay
+from app.services import game
+from app.services import voice as voice_service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 15.0
+DEFAULT_LEAD = 35.0
+DEFAULT_TTL = 180.0
+DEFAULT_IDLE = 300.0
+DEFAULT_CONCURRENCY = 4
+MIN_SLEEP = 1.0
+
+
+def project_profile(profile: dict[str, Any], seconds: float) -> dict[str, Any]:
+    projected = copy.deepcopy(profile)
+    last = datetime.fromisoformat(profile["last_updated"])
+    game.apply_decay(projected, now=last + timedelta(seconds=seconds))
+    return projected
+
+
+def stat_bucket(profile: dict[str, Any]) -> str:
+    low = [key for key in decay.WATCHED_STATS if profile[key] <= decay.LOW_STAT]
+    return "+".join(low) or "ok"
+
+
+class ReminderBank:
+    def __init__(
+        self,
+        interval: float,
+        lead: float,
+        ttl: float,
+        idle: float,
+        concurrency: int,
+    ) -> None:
+        self.interval = interval
+        self.lead = lead
+        self.ttl = ttl
+        self.idle = idle
+        self.concurrency = max(1, concurrency)
+        self.served = 0
+        self.live = 0
+        self._entries: dict[tuple[str, str], tuple[float, ChatResult]] = {}
+        self._last_seen: dict[str, float] = {}
+        self._wake: dict[str, float] = {}
+        self._refilling = False
+
+    def touch(self, user_id: str) -> None:
+        self._last_seen[user_id] = time.monotonic()
+
+    def invalidate(self, user_id: str) -> None:
+        # A mutation moved the stats, so the predicted wake time is stale.
+        self._wake.pop(user_id, None)
+
+    def take(self, user_id: str, profile: dict[str, Any]) -> ChatResult | None:
+        self.touch(user_id)
+        bucket = stat_bucket(profile)
+        entry = self._entries.pop((user_id, bucket), None)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            self.live += 1
+            return None
+        self.served += 1
+        logger.info("Reminder bank hit user=%s bucket=%s", user_id, bucket)
+        return entry[1].model_copy(deep=True)
+
+    def _fresh(self, user_id: str, bucket: str) -> bool:
+        entry = self._entries.get((user_id, bucket))
+        return entry is not None and time.monotonic() - entry[0] <= self.ttl
+
+    def _active_users(self) -> list[str]:
+        now = time.monotonic()
+        for user_id, seen in list(self._last_seen.items()):
+            if now - seen > self.idle:
+                del self._last_seen[user_id]
+                self._wake.pop(user_id, None)
+        for key, (created, _) in list(self._entries.items()):
+            if key[0] not in self._last_seen or now - created > self.ttl:
+                del self._entries[key]
+        return list(self._last_seen)
+
+    async def _refill_user(self, user_id: str) -> None:
+        profile = await asyncio.to_thread(_load_profile, user_id)
+        # Cover both where the stats are now and where decay will have
+        # taken them by the time the client asks next.
+        for projected in (profile, project_profile(profile, self.lead)):
+            bucket = stat_bucket(projected)
+            if bucket == "ok" or self._fresh(user_id, bucket):
+                continue
+            shop_items = game.get_shop_items()
+            result = await chat_service.reminder_with_cat(
+                profile=projected,
+                hat_ids=[item["id"] for item in shop_items if item["type"] == "hat"],
+                background_ids=[
+                    item["id"] for item in shop_items if item["type"] == "background"
+                ],
+            )
+            await voice_service.prefetch(result.reply, result.sfx_prompt)
+            self._entries[(user_id, bucket)] = (time.monotonic(), result)
+            logger.info("Reminder bank stored user=%s bucket=%s", user_id, bucket)
+        self._wake[user_id] = time.monotonic() + self._seconds_until_change(profile)
+
+    def _seconds_until_change(self, profile: dict[str, Any]) -> float:
+        # Both buckets above stay valid until a stat crosses LOW_STAT beyond
+        # the lead window, or until the stored entries expire.
+        horizon = datetime.now(timezone.utc) + timedelta(seconds=self.lead)
+        upcoming = [
+            moment for moment in decay.crossings(profile).values() if moment > horizon
+        ]
+        if not upcoming:
+            return self.ttl
+        return min(self.ttl, (min(upcoming) - horizon).total_seconds())
+
+    async def refill(self) -> None:
+        if self._refilling:
+            return
+        self._refilling = True
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def guarded(user_id: str) -> None:
+            async with semaphore:
+                try:
+                    await self._refill_user(user_id)
+                except Exception:
+                    logger.exception("Reminder bank refill failed for user=%s", user_id)
+
+        try:
+            now = time.monotonic()
+            due = [
+                user_id
+                for user_id in self._active_users()
+                if self._wake.get(user_id, now) <= now
+            ]
+            await asyncio.gather(*(guarded(user_id) for user_id in due))
+        finally:
+            self._refilling = False
+
+    def _sleep_for(self) -> float:
+        # New users have no wake time yet, so never sleep past the interval.
+        now = time.monotonic()
+        wake = min(self._wake.values(), default=now + self.interval)
+        return max(MIN_SLEEP, min(self.interval, wake - now))
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self._sleep_for())
+            await self.refill()
+
+
+def _load_profile(user_id: str) -> dict[str, Any]:
+    with get_conn() as conn:
+        return game.fetch_profile(conn, user_id)
+
+
+_bank: ReminderBank | None = None
+_task: asyncio.Task | None = None
+
+
+def get_bank() -> ReminderBank:
+    global _bank
+    if _bank is None:
+        _bank = ReminderBank(
+            interval=get_float("REMINDER_BANK_INTERVAL", DEFAULT_INTERVAL),
+            lead=get_float("REMINDER_BANK_LEAD", DEFAULT_LEAD),
+            ttl=get_float("REMINDER_BANK_TTL", DEFAULT_TTL),
+            idle=get_float("REMINDER_BANK_IDLE", DEFAULT_IDLE),
+            concurrency=get_int("REMINDER_BANK_CONCURRENCY", DEFAULT_CONCURRENCY),
+        )
+    return _bank
+
+
+def start() -> None:
+    global _task
+    if _task is None and get_bool("REMINDER_BANK_ENABLED", True):
+        _task = asyncio.create_task(get_bank().run())
+
+
+async def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
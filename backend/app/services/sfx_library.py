@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import random
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator
+
+from app.services.audio_cache import AudioCache, cache_key
+
+logger = logging.getLogger(__name__)
+
+# Every prompt is about the cat, so "cat"/"kitten" say nothing about the sound.
+STOPWORDS = {
+    "a",
+    "an",
+    "and",
+    "at",
+    "by",
+    "cat",
+    "cats",
+    "effect",
+    "effects",
+    "for",
+    "from",
+    "in",
+    "kitten",
+    "kittens",
+    "kitty",
+    "noise",
+    "of",
+    "on",
+    "sfx",
+    "some",
+    "sound",
+    "sounds",
+    "the",
+    "to",
+    "with",
+}
+# Loudness, size and mood words: a soft meow and a loud meow are still a meow.
+MODIFIERS = {
+    "angry",
+    "big",
+    "brief",
+    "contented",
+    "contentedly",
+    "curious",
+    "cute",
+    "excited",
+    "funny",
+    "gentle",
+    "gently",
+    "happy",
+    "high",
+    "light",
+    "little",
+    "long",
+    "loud",
+    "loudly",
+    "low",
+    "magical",
+    "playful",
+    "quick",
+    "quiet",
+    "quietly",
+    "sad",
+    "short",
+    "sleepy",
+    "small",
+    "soft",
+    "softly",
+    "sweet",
+    "tiny",
+}
+MODIFIER_WEIGHT = 0.25
+TRIGRAM_WEIGHT = 0.35
+SUFFIXES = ("ing", "ed", "es", "s", "y", "e")
+
+INDEX_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sfx_cluster (
+        id TEXT PRIMARY KEY,
+        prompt TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS sfx_variant (
+        key TEXT PRIMARY KEY,
+        cluster_id TEXT NOT NULL REFERENCES sfx_cluster(id),
+        created_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_sfx_variant_cluster
+        ON sfx_variant(cluster_id, created_at);
+"""
+
+
+def normalize_prompt(prompt: str) -> str:
+    tokens = re.findall(r"[a-z0-9']+", prompt.lower())
+    kept = [token for token in tokens if token not in STOPWORDS]
+    return " ".join(kept or tokens)
+
+
+def _stem(token: str) -> str:
+    # Just enough to match "purring"/"purr", "snores"/"snore", "crunchy"/"crunch".
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            token = token[: -len(suffix)]
+            break
+    if len(token) > 3 and token[-1] == token[-2]:
+        token = token[:-1]
+    return token
+
+
+def prompt_features(normalized: str) -> dict[str, float]:
+    features: dict[str, float] = {}
+    for token in normalized.split():
+        weight = MODIFIER_WEIGHT if token in MODIFIERS else 1.0
+        stem = _stem(token)
+        features[f"w:{stem}"] = max(features.get(f"w:{stem}", 0.0), weight)
+        padded = f" {stem} "
+        for index in range(len(padded) - 2):
+            feature = f"c:{padded[index:index + 3]}"
+            features[feature] = max(features.get(feature, 0.0), weight * TRIGRAM_WEIGHT)
+    return features
+
+
+def similarity(left: dict[str, float], right: dict[str, float]) -> float:
+    """Weighted cosine similarity of two feature sets."""
+    if not left or not right:
+        return 0.0
+    shared = sum(weight * right[feature] for feature, weight in left.items() if feature in right)
+    norm = math.sqrt(
+        sum(weight * weight for weight in left.values())
+        * sum(weight * weight for weight in right.values())
+    )
+    return shared / norm
+
+
+class SFXLibrary:
+    """Clusters of generated clips for similar prompts.
+
+    The cluster index lives in SQLite next to the clips, so every worker
+    shares it and writes are serialized by the database. Each process keeps
+    an in-memory copy for matching and reloads it when another connection
+    commits. All methods block; async callers run them in a thread.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int,
+        threshold: float,
+        max_variants: int,
+        busy_timeout: float = 5.0,
+    ) -> None:
+        self.clips = AudioCache(directory / "clips", max_bytes)
+        self.index_path = directory / "index.sqlite"
+        self.threshold = threshold
+        self.max_variants = max(1, max_variants)
+        self.busy_timeout = busy_timeout
+        self.reused = 0
+        self.generated = 0
+        self._clusters: dict[str, dict[str, Any]] = {}
+        self._features: dict[str, dict[str, float]] = {}
+        self._postings: dict[str, set[str]] = {}
+        self._last_served: dict[str, str] = {}
+        self._conn: sqlite3.Connection | None = None
+        self._data_version: int | None = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.index_path,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(INDEX_SCHEMA)
+            self._conn = conn
+            self._import_legacy_index()
+        return self._conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        conn = self._db()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        # Our own commits don't bump data_version; reload on the next read.
+        self._data_version = None
+
+    def _import_legacy_index(self) -> None:
+        legacy = self.index_path.with_name("index.json")
+        if not legacy.exists():
+            return
+        try:
+            clusters = json.loads(legacy.read_text(encoding="utf-8")).get("clusters", [])
+        except (OSError, json.JSONDecodeError):
+            return
+        with self._write() as conn:
+            if conn.execute("SELECT 1 FROM sfx_cluster LIMIT 1").fetchone():
+                return
+            now = time.time()
+            for cluster in clusters:
+                conn.execute(
+                    "INSERT INTO sfx_cluster (id, prompt) VALUES (?, ?)",
+                    (cluster["id"], cluster["prompt"]),
+                )
+                # Variants were listed oldest first.
+                conn.executemany(
+                    "INSERT OR IGNORE INTO sfx_variant (key, cluster_id, created_at) "
+                    "VALUES (?, ?, ?)",
+                    [
+                        (key, cluster["id"], now + index * 1e-6)
+                        for index, key in enumerate(cluster["variants"])
+                    ],
+                )
+        logger.info("SFX index imported %d clusters from %s", len(clusters), legacy)
+
+    def _reload(self) -> None:
+        conn = self._db()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return
+        self._data_version = version
+        self._clusters = {}
+        self._features = {}
+        self._postings = {}
+        for cluster_id, prompt in conn.execute("SELECT id, prompt FROM sfx_cluster"):
+            self._index({"id": cluster_id, "prompt": prompt, "variants": []})
+        for key, cluster_id in conn.execute(
+            "SELECT key, cluster_id FROM sfx_variant ORDER BY created_at"
+        ):
+            if cluster_id in self._clusters:
+                self._clusters[cluster_id]["variants"].append(key)
+
+    def _index(self, cluster: dict[str, Any]) -> None:
+        cluster_id = cluster["id"]
+        features = prompt_features(cluster["prompt"])
+        self._clusters[cluster_id] = cluster
+        self._features[cluster_id] = features
+        for feature in features:
+            self._postings.setdefault(feature, set()).add(cluster_id)
+
+    def _match(self, normalized: str) -> str | None:
+        features = prompt_features(normalized)
+        candidates: set[str] = set()
+        for feature in features:
+            candidates |= self._postings.get(feature, set())
+        best_id = None
+        best_score = 0.0
+        for cluster_id in candidates:
+            score = similarity(features, self._features[cluster_id])
+            if score > best_score:
+                best_id, best_score = cluster_id, score
+        if best_id is None or best_score < self.threshold:
+            return None
+        return best_id
+
+    def get(self, prompt: str) -> Path | None:
+        normalized = normalize_prompt(prompt)
+        with self._lock:
+            self._reload()
+            cluster_id = self._match(normalized)
+            if cluster_id is None:
+                return None
+            cluster = self._clusters[cluster_id]
+            variants = [
+                key for key in cluster["variants"] if self.clips.path_for(key).exists()
+            ]
+            evicted = [key for key in cluster["variants"] if key not in variants]
+            if evicted:
+                with self._write() as conn:
+                    conn.executemany(
+                        "DELETE FROM sfx_variant WHERE key = ?", [(key,) for key in evicted]
+                    )
+                cluster["variants"] = variants
+            if len(variants) < self.max_variants:
+                return None
+            last = self._last_served.get(cluster_id)
+            choices = [key for key in variants if key != last] or variants
+            key = random.choice(choices)
+            self._last_served[cluster_id] = key
+            self.reused += 1
+        logger.info("SFX: library hit prompt=%r cluster=%r", prompt, cluster["prompt"])
+        return self.clips.get(key)
+
+    def _register(self, normalized: str, key: str) -> None:
+        with self._lock, self._write() as conn:
+            # Inside the write lock, so a cluster another worker just created
+            # is matched instead of duplicated.
+            self._reload()
+            self.generated += 1
+            cluster_id = self._match(normalized)
+            if cluster_id is None:
+                cluster_id = uuid.uuid4().hex
+                conn.execute(
+                    "INSERT INTO sfx_cluster (id, prompt) VALUES (?, ?)",
+                    (cluster_id, normalized),
+                )
+            conn.execute(
+                "INSERT INTO sfx_variant (key, cluster_id, created_at) VALUES (?, ?, ?)",
+                (key, cluster_id, time.time()),
+            )
+            conn.execute(
+                """
+                DELETE FROM sfx_variant
+                WHERE cluster_id = ? AND key NOT IN (
+                    SELECT key FROM sfx_variant WHERE cluster_id = ?
+                    ORDER BY created_at DESC LIMIT ?
+                )
+                """,
+                (cluster_id, cluster_id, self.max_variants),
+            )
+
+    def add(self, prompt: str, audio: bytes) -> Path:
+        normalized = normalize_prompt(prompt)
+        key = cache_key(normalized, uuid.uuid4().hex)
+        path = self.clips.put(key, audio)
+        self._register(normalized, key)
+        return path
+
+    async def add_stream(
+        self, prompt: str, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        normalized = normalize_prompt(prompt)
+        key = cache_key(normalized, uuid.uuid4().hex)
+        async for chunk in self.clips.tee(key, chunks):
+            yield chunk
+        await asyncio.to_thread(self._register, normalized, key)
+
+    def stats(self) -> dict[str, Any]:
+        stats = self.clips.stats()
+        with self._lock:
+            stats["hits"] = self.reused
+            stats["misses"] = self.generated
+            stats["clusters"] = len(self._clusters)
+        return stats
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class _StreamFlight:
+    def __init__(self) -> None:
+        self.opened: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        # Nobody may be left to await a failed open; don't warn about it.
+        self.opened.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.chunks: list[bytes] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self.changed = asyncio.Condition()
+        self.task: asyncio.Task[None] | None = None
+
+
+class SingleFlight:
+    """Shares one upstream call between concurrent requests with the same key.
+
+    The shared call runs as its own task, so a caller that goes away does
+    not cancel it for the others. Once it finishes the key is forgotten, so
+    later requests start afresh (and usually hit a cache by then).
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.coalesced = 0
+        self._calls: dict[str, asyncio.Future[Any]] = {}
+        self._streams: dict[str, _StreamFlight] = {}
+
+    async def call(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+    async def stream(
+        self, key: str, opener: Callable[[], Awaitable[AsyncIterator[bytes]]]
+    ) -> AsyncIterator[bytes]:
+        """Opens (or joins) the stream for ``key``.
+
+        Errors while opening are raised here for every caller; a joiner gets
+        the chunks sent so far and then follows along live.
+        """
+        self.calls += 1
+        flight = self._streams.get(key)
+        if flight is None:
+            flight = _StreamFlight()
+            self._streams[key] = flight
+            flight.task = asyncio.create_task(self._pump(key, flight, opener))
+        else:
+            self.coalesced += 1
+        await asyncio.shield(flight.opened)
+        return self._follow(flight)
+
+    async def _pump(
+        self,
+        key: str,
+        flight: _StreamFlight,
+        opener: Callable[[], Awaitable[AsyncIterator[bytes]]],
+    ) -> None:
+        try:
+            try:
+                chunks = await opener()
+            except asyncio.CancelledError:
+                flight.opened.cancel()
+                raise
+            except Exception as exc:
+                flight.opened.set_exception(exc)
+                return
+            flight.opened.set_result(None)
+            try:
+                async for chunk in chunks:
+                    flight.chunks.append(chunk)
+                    async with flight.changed:
+                        flight.changed.notify_all()
+            except Exception as exc:
+                flight.error = exc
+        finally:
+            self._streams.pop(key, None)
+            flight.done = True
+            async with flight.changed:
+                flight.changed.notify_all()
+
+    async def _follow(self, flight: _StreamFlight) -> AsyncIterator[bytes]:
+        sent = 0
+        while True:
+            if sent < len(flight.chunks):
+                chunk = flight.chunks[sent]
+                sent += 1
+                yield chunk
+                continue
+            if flight.done:
+                if flight.error is not None:
+                    raise flight.error
+                return
+            async with flight.changed:
+                await flight.changed.wait_for(
+                    lambda: sent < len(flight.chunks) or flight.done
+                )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls) + len(self._streams),
+        }
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from typing import Any, Awaitable, Callable
+
+from app.services import voice as voice_service
+
+logger = logging.getLogger(__name__)
+
+MIN_SENTENCE_CHARS = 8
+# End punctuation plus any closing quotes/brackets, followed by whitespace.
+SENTENCE_END = re.compile(r"[.!?…]+[\"')\]”’]*\s+|\n+")
+
+Synthesizer = Callable[[str], Awaitable[bytes]]
+
+
+class SentenceSplitter:
+    """Cuts streamed text into sentences as soon as each one is complete."""
+
+    def __init__(self, min_chars: int = MIN_SENTENCE_CHARS) -> None:
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        self._buffer += text
+        sentences: list[str] = []
+        start = 0
+        for match in SENTENCE_END.finditer(self._buffer):
+            sentence = self._buffer[start : match.end()].strip()
+            # Very short fragments ("Oh.") ride along with the next sentence.
+            if len(sentence) < self.min_chars:
+                continue
+            sentences.append(sentence)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> str | None:
+        rest = self._buffer.strip()
+        self._buffer = ""
+        return rest or None
+
+
+async def synthesize(text: str) -> bytes:
+    return await voice_service.read_audio(await voice_service.cached_text_to_speech(text))
+
+
+class SpeechPipeline:
+    """Synthesizes each sentence as it completes and emits the audio in order.
+
+    Segments are put on ``out`` as ``("audio", index, text, audio)``; ``audio``
+    is None when that sentence failed, so the client can skip it.
+    """
+
+    def __init__(
+        self,
+        out: asyncio.Queue[Any],
+        concurrency: int,
+        synthesizer: Synthesizer = synthesize,
+    ) -> None:
+        self._out = out
+        self._synthesizer = synthesizer
+        self._splitter = SentenceSplitter()
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._tasks: list[asyncio.Task[None]] = []
+
+    @property
+    def segments(self) -> int:
+        return len(self._tasks)
+
+    def feed(self, text: str) -> None:
+        for sentence in self._splitter.feed(text):
+            self._start(sentence)
+
+    def flush(self) -> None:
+        """Starts the last, unterminated sentence once the text is complete."""
+        rest = self._splitter.flush()
+        if rest:
+            self._start(rest)
+
+    async def finish(self) -> None:
+        self.flush()
+        if self._tasks:
+            await asyncio.wait(self._tasks)
+
+    def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+    def _start(self, sentence: str) -> None:
+        previous = self._tasks[-1] if self._tasks else None
+        index = len(self._tasks)
+        self._tasks.append(asyncio.create_task(self._segment(index, sentence, previous)))
+
+    async def _segment(
+        self, index: int, sentence: str, previous: asyncio.Task[None] | None
+    ) -> None:
+        audio: bytes | None
+        try:
+            async with self._semaphore:
+                audio = await self._synthesizer(sentence)
+        except Exception as exc:
+            logger.warning("Speech segment %d failed: %s", index, exc)
+            audio = None
+        # Synthesis runs ahead in parallel, but segments go out in order.
+        if previous is not None:
+            await asyncio.wait([previous])
+        await self._out.put(("audio", index, sentence, audio))
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import io
 import logging
 import os
-from typing import Any
+from pathlib import Path
+from typing import Any, AsyncIterator, Union
 
-from elevenlabs.client import ElevenLabs
+from elevenlabs.client import AsyncElevenLabs
 from elevenlabs.core.api_error import ApiError
 
+from app.config import get_float, get_int
+from app.services.audio_cache import CACHE_ROOT, AudioCache, cache_key, normalize_text
+from app.services.clients import get_clients
+from app.services.sfx_library import SFXLibrary, normalize_prompt
+from app.services.single_flight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,41 +25,114 @@ DEFAULT_TTS_MODEL = "eleven_multilingual_v2"
 DEFAULT_TTS_FORMAT = "mp3_44100_128"
 DEFAULT_STT_MODEL = "scribe_v2"
 DEFAULT_STT_LANGUAGE = "eng"
+DEFAULT_TTS_CACHE_MAX_MB = 256.0
+DEFAULT_SFX_CACHE_MAX_MB = 128.0
+DEFAULT_SFX_SIMILARITY_THRESHOLD = 0.55
+DEFAULT_SFX_VARIANTS = 3
+
+AudioSource = Union[Path, AsyncIterator[bytes]]
+
+_tts_cache: AudioCache | None = None
+_sfx_library: SFXLibrary | None = None
+
+# Concurrent misses for the same clip share one provider call.
+tts_flight = SingleFlight()
+sfx_flight = SingleFlight()
+
 
+def _client() -> AsyncElevenLabs:
+    return get_clients().elevenlabs()
 
-def _client() -> ElevenLabs:
-    api_key = os.getenv("ELEVENLABS_API_KEY")
-    if not api_key:
-        raise RuntimeError("ELEVENLABS_API_KEY is not set")
-    return ElevenLabs(api_key=api_key)
 
+def tts_cache() -> AudioCache:
+    global _tts_cache
+    if _tts_cache is None:
+        directory = Path(os.getenv("TTS_CACHE_DIR") or CACHE_ROOT / "tts")
+        max_mb = get_float("TTS_CACHE_MAX_MB", DEFAULT_TTS_CACHE_MAX_MB)
+        _tts_cache = AudioCache(directory, int(max_mb * 1024 * 1024))
+    return _tts_cache
 
-def _coerce_audio_bytes(audio: Any) -> bytes:
+
+def sfx_library() -> SFXLibrary:
+    global _sfx_library
+    if _sfx_library is None:
+        directory = Path(os.getenv("SFX_CACHE_DIR") or CACHE_ROOT / "sfx")
+        max_mb = get_float("SFX_CACHE_MAX_MB", DEFAULT_SFX_CACHE_MAX_MB)
+        _sfx_library = SFXLibrary(
+            directory,
+            int(max_mb * 1024 * 1024),
+            threshold=get_float(
+                "SFX_SIMILARITY_THRESHOLD", DEFAULT_SFX_SIMILARITY_THRESHOLD
+            ),
+            max_variants=get_int("SFX_VARIANTS", DEFAULT_SFX_VARIANTS),
+        )
+    return _sfx_library
+
+
+def _tts_settings() -> tuple[str, str, str]:
+    return (
+        os.getenv("ELEVENLABS_VOICE_ID", DEFAULT_VOICE_ID),
+        os.getenv("ELEVENLABS_TTS_MODEL", DEFAULT_TTS_MODEL),
+        os.getenv("ELEVENLABS_TTS_FORMAT", DEFAULT_TTS_FORMAT),
+    )
+
+
+async def _iter_audio(audio: Any) -> AsyncIterator[bytes]:
     if isinstance(audio, (bytes, bytearray)):
-        return bytes(audio)
-    if hasattr(audio, "__iter__"):
-        return b"".join(audio)
-    if hasattr(audio, "read"):
-        return audio.read()
-    raise TypeError("Unsupported audio response type")
+        yield bytes(audio)
+    elif hasattr(audio, "__aiter__"):
+        async for chunk in audio:
+            if chunk:
+                yield chunk
+    elif hasattr(audio, "__iter__"):
+        for chunk in audio:
+            if chunk:
+                yield chunk
+    elif hasattr(audio, "read"):
+        yield audio.read()
+    else:
+        raise TypeError("Unsupported audio response type")
+
+
+async def _chain(first: bytes, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    yield first
+    async for chunk in chunks:
+        yield chunk
+
 
+async def _prime(audio: Any) -> AsyncIterator[bytes]:
+    # Pull the first chunk eagerly so request errors surface before the
+    # response headers are sent; later failures can only abort the stream.
+    chunks = _iter_audio(audio)
+    first = await anext(chunks, b"")
+    return _chain(first, chunks)
+
+
+async def _guard_stream(chunks: AsyncIterator[bytes], label: str) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except Exception:
+        logger.warning("%s: provider stream failed mid-response", label, exc_info=True)
+        raise
 
-def text_to_speech(text: str) -> bytes:
+
+async def text_to_speech(text: str) -> AsyncIterator[bytes]:
     if not text or not text.strip():
         raise ValueError("Text is empty")
     client = _client()
-    voice_id = os.getenv("ELEVENLABS_VOICE_ID", DEFAULT_VOICE_ID)
-    model_id = os.getenv("ELEVENLABS_TTS_MODEL", DEFAULT_TTS_MODEL)
-    output_format = os.getenv("ELEVENLABS_TTS_FORMAT", DEFAULT_TTS_FORMAT)
+    voice_id, model_id, output_format = _tts_settings()
     try:
-        audio = client.text_to_speech.convert(
-            text=text,
-            voice_id=voice_id,
-            model_id=model_id,
-            output_format=output_format,
+        audio = await _prime(
+            client.text_to_speech.stream(
+                text=text,
+                voice_id=voice_id,
+                model_id=model_id,
+                output_format=output_format,
+            )
         )
         logger.info("TTS: voice_id=%s", voice_id)
-        return _coerce_audio_bytes(audio)
+        return audio
     except ApiError as exc:
         detail = exc.body.get("detail", {}) if isinstance(exc.body, dict) else {}
         status = detail.get("status")
@@ -63,32 +144,90 @@ def text_to_speech(text: str) -> bytes:
                     voice_id,
                     fallback,
                 )
-                audio = client.text_to_speech.convert(
-                    text=text,
-                    voice_id=fallback,
-                    model_id=model_id,
-                    output_format=output_format,
+                return await _prime(
+                    client.text_to_speech.stream(
+                        text=text,
+                        voice_id=fallback,
+                        model_id=model_id,
+                        output_format=output_format,
+                    )
                 )
-                return _coerce_audio_bytes(audio)
         raise
 
 
-def text_to_sound_effects(prompt: str) -> bytes:
+async def cached_text_to_speech(text: str) -> AudioSource:
+    if not text or not text.strip():
+        raise ValueError("Text is empty")
+    text = normalize_text(text)
+    key = cache_key(text, *_tts_settings())
+    cache = tts_cache()
+    path = cache.get(key)
+    if path is not None:
+        logger.info("TTS: cache hit key=%s", key[:12])
+        return path
+
+    async def opener() -> AsyncIterator[bytes]:
+        return cache.tee(key, _guard_stream(await text_to_speech(text), "TTS"))
+
+    return await tts_flight.stream(key, opener)
+
+
+async def text_to_sound_effects(prompt: str) -> AsyncIterator[bytes]:
     if not prompt or not prompt.strip():
         raise ValueError("Sound effect prompt is empty")
     client = _client()
-    audio = client.text_to_sound_effects.convert(text=prompt.strip())
+    audio = await _prime(client.text_to_sound_effects.convert(text=prompt.strip()))
     logger.info("SFX: prompt=%s", prompt)
-    return _coerce_audio_bytes(audio)
+    return audio
+
+
+async def library_sound_effect(prompt: str) -> AudioSource:
+    if not prompt or not prompt.strip():
+        raise ValueError("Sound effect prompt is empty")
+    library = sfx_library()
+    path = await asyncio.to_thread(library.get, prompt)
+    if path is not None:
+        return path
+
+    async def opener() -> AsyncIterator[bytes]:
+        return library.add_stream(
+            prompt, _guard_stream(await text_to_sound_effects(prompt), "SFX")
+        )
+
+    return await sfx_flight.stream(normalize_prompt(prompt), opener)
+
+
+async def read_audio(audio: AudioSource) -> bytes:
+    if isinstance(audio, Path):
+        return await asyncio.to_thread(audio.read_bytes)
+    return b"".join([chunk async for chunk in audio])
+
+
+async def prefetch(text: str | None, sfx_prompt: str | None) -> None:
+    # Fill the TTS cache and SFX library ahead of time; the audio itself is
+    # discarded here and served later from disk.
+    for opener, value in (
+        (cached_text_to_speech, text),
+        (library_sound_effect, sfx_prompt),
+    ):
+        if not value or not value.strip():
+            continue
+        try:
+            audio = await opener(value)
+            if not isinstance(audio, Path):
+                async for _ in audio:
+                    pass
+        except Exception as exc:
+            logger.warning("Audio prefetch failed for %r: %s", value, exc)
 
 
-def speech_to_text(audio_bytes: bytes, filename: str | None = None) -> str:
+async def speech_to_text(audio_bytes: bytes, filename: str | None = None) -> str:
     if not audio_bytes:
         raise ValueError("Audio is empty")
     audio_file = io.BytesIO(audio_bytes)
     audio_file.name = filename or "audio.webm"
     client = _client()
-    transcription = client.speech_to_text.convert(
+    transcription = await client.speech_to_text.convert(
         file=audio_file,
         model_id=os.getenv("ELEVENLABS_STT_MODEL", DEFAULT_STT_MODEL),
         language_code=os.getenv("ELEVENLABS_STT_LANGUAGE", DEFAULT_STT_LANGUAGE),
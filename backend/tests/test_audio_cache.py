@@ -0,0 +1,51 @@
+import asyncio
+import os
+
+import pytest
+
+from app.services.audio_cache import AudioCache
+
+
+async def _chunks(data: bytes):
+    for start in range(0, len(data), 10):
+        yield data[start : start + 10]
+
+
+def _drain(cache: AudioCache, key: str, data: bytes) -> None:
+    async def run() -> None:
+        async for _ in cache.tee(key, _chunks(data)):
+            pass
+
+    asyncio.run(run())
+
+
+def test_counts_existing_entries_once_at_startup(tmp_path):
+    AudioCache(tmp_path, 10_000).put("aa01", b"x" * 100)
+    cache = AudioCache(tmp_path, 10_000)
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == 100
+
+
+def test_tracks_bytes_without_rescanning(tmp_path, monkeypatch):
+    cache = AudioCache(tmp_path, 10_000)
+    monkeypatch.setattr(cache, "_entries", lambda: pytest.fail("directory rescanned"))
+    cache.put("aa01", b"x" * 100)
+    _drain(cache, "bb02", b"y" * 250)
+    cache.put("aa01", b"x" * 40)  # overwrite replaces, not adds
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["bytes"] == 290
+
+
+def test_evicts_oldest_down_to_ratio_once_over_cap(tmp_path):
+    cache = AudioCache(tmp_path, 1000)
+    for index in range(3):
+        cache.put(f"{index:02d}ab", b"x" * 300)
+        os.utime(cache.path_for(f"{index:02d}ab"), (index, index))
+    assert cache.stats()["evictions"] == 0
+    _drain(cache, "99ab", b"y" * 300)
+    stats = cache.stats()
+    assert stats["bytes"] == 900
+    assert stats["evictions"] == 1
+    assert not cache.path_for("00ab").exists()
+    assert cache.path_for("99ab").exists()
+
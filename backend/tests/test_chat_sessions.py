@@ -0,0 +1,113 @@
+import asyncio
+
+from app.models import ChatMessage
+from app.services import chat_sessions
+
+# 36 characters: 9 + 4 = 13 estimated tokens each.
+LINE = "m{:02d} " + "x" * 32
+
+
+def _user(n: int) -> ChatMessage:
+    return ChatMessage(role="user", content=LINE.format(n))
+
+
+def _turns(user_id: str, count: int, session_id: str | None = None) -> str:
+    for n in range(count):
+        turn = chat_sessions.begin_turn(user_id, session_id, _user(2 * n))
+        chat_sessions.end_turn(turn, LINE.format(2 * n + 1))
+        session_id = turn.session_id
+    return session_id
+
+
+def _stored(database, session_id: str) -> list[tuple[str, str]]:
+    with database.get_conn() as conn:
+        rows = database.load_chat_messages(conn, session_id, 0, 10**9)
+    return [(row["role"], row["content"]) for row in rows]
+
+
+def _contents(turn: chat_sessions.Turn) -> list[str]:
+    return [message.content for message in turn.messages]
+
+
+def test_failed_turn_leaves_no_user_message_behind(database):
+    session_id = _turns("kim", 1)
+    # The provider fails: begin_turn runs, end_turn never does.
+    chat_sessions.begin_turn("kim", session_id, _user(2))
+    turn = chat_sessions.begin_turn("kim", session_id, _user(4))
+    assert _contents(turn) == [LINE.format(n) for n in (0, 1, 4)]
+    chat_sessions.end_turn(turn, LINE.format(5))
+    assert [role for role, _ in _stored(database, session_id)] == [
+        "user", "assistant", "user", "assistant",
+    ]
+    assert _stored(database, session_id)[2] == ("user", LINE.format(4))
+
+
+def test_window_keeps_the_newest_messages_that_fit(database, monkeypatch):
+    monkeypatch.setenv("CHAT_WINDOW_TOKENS", "40")
+    monkeypatch.setenv("CHAT_SUMMARY_MIN_MESSAGES", "100")
+    session_id = _turns("kim", 3)
+    turn = chat_sessions.begin_turn("kim", session_id, _user(6))
+    # The new message plus the two newest stored ones fit in 40 tokens.
+    assert _contents(turn) == [LINE.format(n) for n in (4, 5, 6)]
+    assert turn.summarize_upto == 0
+
+
+def test_oversized_message_is_sent_on_its_own(database, monkeypatch):
+    monkeypatch.setenv("CHAT_WINDOW_TOKENS", "10")
+    session_id = _turns("kim", 1)
+    long = ChatMessage(role="user", content="y" * 200)
+    turn = chat_sessions.begin_turn("kim", session_id, long)
+    assert turn.messages == [long]
+
+
+def test_dropped_messages_roll_into_the_summary(database, monkeypatch):
+    monkeypatch.setenv("CHAT_WINDOW_TOKENS", "40")
+    monkeypatch.setenv("CHAT_SUMMARY_MIN_MESSAGES", "2")
+    summarized: list[list[str]] = []
+
+    async def summarize_conversation(summary, messages):
+        summarized.append([message.content for message in messages])
+        return "Kim asked about naps."
+
+    monkeypatch.setattr(
+        chat_sessions.chat_service, "summarize_conversation", summarize_conversation
+    )
+    session_id = _turns("kim", 3)
+    turn = chat_sessions.begin_turn("kim", session_id, _user(6))
+    # Messages 1-4 (seq) fell out of the window, enough to summarize.
+    assert turn.summarize_upto == 4
+
+    async def run():
+        chat_sessions.schedule_summary(turn)
+        # A second request for the same session does not start another.
+        chat_sessions.schedule_summary(turn)
+        await asyncio.gather(*chat_sessions._tasks)
+
+    asyncio.run(run())
+    assert summarized == [[LINE.format(n) for n in range(4)]]
+
+    chat_sessions.end_turn(turn, LINE.format(7))
+    turn = chat_sessions.begin_turn("kim", session_id, _user(8))
+    assert turn.messages[0] == ChatMessage(
+        role="system", content="Summary of the conversation so far: Kim asked about naps."
+    )
+    assert _contents(turn)[1:] == [LINE.format(n) for n in (6, 7, 8)]
+    # Only what dropped after the summary counts towards the next one.
+    assert turn.summarize_upto == 6
+
+
+def test_small_drops_wait_for_the_minimum(database, monkeypatch):
+    monkeypatch.setenv("CHAT_WINDOW_TOKENS", "40")
+    monkeypatch.setenv("CHAT_SUMMARY_MIN_MESSAGES", "4")
+    session_id = _turns("kim", 2)
+    # Two messages dropped so far.
+    assert chat_sessions.begin_turn("kim", session_id, _user(4)).summarize_upto == 0
+    _turns("kim", 1, session_id)
+    assert chat_sessions.begin_turn("kim", session_id, _user(6)).summarize_upto == 4
+
+
+def test_unknown_session_starts_fresh(database):
+    session_id = _turns("kim", 1)
+    turn = chat_sessions.begin_turn("lee", session_id, _user(0))
+    assert turn.session_id != session_id
+    assert _contents(turn) == [LINE.format(0)]
@@ -0,0 +1,111 @@
+import sqlite3
+
+import pytest
+
+from app import db
+
+
+def test_db_path_set_after_import_is_used(tmp_path, monkeypatch):
+    # main.py loads .env only after app.db has been imported.
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "from-env.sqlite"))
+    try:
+        db.init_db()
+        assert db.get_pool().path == tmp_path / "from-env.sqlite"
+        assert (tmp_path / "from-env.sqlite").exists()
+    finally:
+        db.close_pool()
+
+
+def test_explicit_path_wins_over_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "from-env.sqlite"))
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "explicit.sqlite")
+    assert db.db_path() == tmp_path / "explicit.sqlite"
+
+
+V1_PROFILE = """
+    CREATE TABLE profile (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        coins INTEGER NOT NULL,
+        level INTEGER NOT NULL,
+        xp INTEGER NOT NULL,
+        hunger REAL NOT NULL,
+        energy REAL NOT NULL,
+        hygiene REAL NOT NULL,
+        fun REAL NOT NULL,
+        mood REAL NOT NULL,
+        owned_items TEXT NOT NULL,
+        equipped_items TEXT NOT NULL,
+        last_updated TEXT NOT NULL,
+        user_id TEXT
+    )
+"""
+
+
+def _legacy_database(path, version: int) -> None:
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(V1_PROFILE)
+        if version >= 1:
+            conn.execute("CREATE UNIQUE INDEX idx_profile_user_id ON profile(user_id)")
+        rows = [
+            (
+                1, db.DEFAULT_USER_ID if version else None, "Tom", 140, 2, 130,
+                50.5, 60.0, 70.0, 80.0, 65.1,
+                '["hat_crown", "bg_beach", "hat_party"]',
+                '{"hat": "hat_crown", "background": "bg_beach"}',
+            ),
+            (
+                2, "kim" if version else None, "Kit", 20, 1, 12,
+                10.0, 20.0, 30.0, 40.0, 25.0, "[]", "{}",
+            ),
+        ]
+        conn.executemany(
+            """
+            INSERT INTO profile (id, user_id, name, coins, level, xp, hunger, energy,
+                hygiene, fun, mood, owned_items, equipped_items, last_updated)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, '2026-01-01T00:00:00+00:00')
+            """,
+            rows,
+        )
+        conn.execute(f"PRAGMA user_version = {version}")
+    conn.close()
+
+
+@pytest.mark.parametrize("version", [0, 1])
+def test_item_blobs_migrate_into_tables(tmp_path, monkeypatch, version):
+    path = tmp_path / "legacy.sqlite"
+    _legacy_database(path, version)
+    monkeypatch.setattr(db, "DB_PATH", path)
+    try:
+        db.init_db()
+        with db.get_conn() as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == db.SCHEMA_VERSION
+            columns = [row["name"] for row in conn.execute("PRAGMA table_info(profile)")]
+            assert columns == [column.strip() for column in db.PROFILE_COLUMNS.split(",")]
+            indexes = [row["name"] for row in conn.execute("PRAGMA index_list(profile)")]
+            assert "idx_profile_user_id" in indexes
+
+            tom = db.load_profile(conn, db.DEFAULT_USER_ID)
+            assert tom["owned_items"] == ["hat_crown", "bg_beach", "hat_party"]
+            assert tom["equipped_items"] == {"hat": "hat_crown", "background": "bg_beach"}
+            assert (tom["name"], tom["coins"], tom["xp"], tom["hunger"], tom["mood"]) == (
+                "Tom", 140, 130, 50.5, 65.1,
+            )
+            assert tom["last_updated"] == "2026-01-01T00:00:00+00:00"
+
+            kit = conn.execute("SELECT user_id FROM profile WHERE id = 2").fetchone()[0]
+            assert kit == ("kim" if version else "legacy-2")
+            kit = db.load_profile(conn, kit)
+            assert (kit["name"], kit["owned_items"], kit["equipped_items"]) == ("Kit", [], {})
+
+        # Running it again is a no-op.
+        db.close_pool()
+        db.init_db()
+        with db.get_conn() as conn:
+            assert db.load_profile(conn, db.DEFAULT_USER_ID)["owned_items"] == [
+                "hat_crown", "bg_beach", "hat_party",
+            ]
+            assert conn.execute("SELECT COUNT(*) FROM inventory").fetchone()[0] == 3
+    finally:
+        db.close_pool()
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services import decay, game
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+STEP = 1.0
+HORIZON = 20000.0
+
+
+def _profile(hunger: float, energy: float, hygiene: float, fun: float) -> dict:
+    profile = {
+        "hunger": hunger,
+        "energy": energy,
+        "hygiene": hygiene,
+        "fun": fun,
+        "last_updated": START.isoformat(),
+    }
+    profile["mood"] = game.compute_mood(profile)
+    return profile
+
+
+def _value(profile: dict, stat: str, seconds: float) -> float:
+    decayed = dict(profile)
+    game.apply_decay(decayed, START + timedelta(seconds=seconds))
+    if stat == "mood":
+        # The stored mood is rounded; compare against the exact mean.
+        return sum(decayed[key] for key in decay.DECAY_RATES) / len(decay.DECAY_RATES)
+    return decayed[stat]
+
+
+def _simulate(profile: dict, stat: str, threshold: float) -> float | None:
+    """First step at which apply_decay has brought ``stat`` to ``threshold``."""
+    if profile[stat] <= threshold:
+        return 0.0
+    seconds = 0.0
+    while seconds <= HORIZON:
+        seconds += STEP
+        if _value(profile, stat, seconds) <= threshold:
+            return seconds
+    return None
+
+
+def _assert_matches(profile: dict, stat: str, threshold: float) -> None:
+    expected = _simulate(profile, stat, threshold)
+    computed = decay.seconds_until(profile, stat, threshold)
+    if expected is None:
+        assert computed is None
+    else:
+        assert computed is not None
+        assert expected - STEP <= computed <= expected + 1e-6
+
+
+PROFILES = [
+    _profile(80, 70, 60, 50),
+    _profile(100, 100, 100, 100),
+    # Stats bottom out one after another before mood gets there.
+    _profile(2, 5, 90, 95),
+    _profile(0, 0, 0, 95),
+    _profile(31, 30.5, 45, 0),
+    _profile(12.5, 99.9, 3, 40),
+]
+
+
+@pytest.mark.parametrize("profile", PROFILES)
+@pytest.mark.parametrize("stat", decay.WATCHED_STATS)
+@pytest.mark.parametrize("threshold", [30.0, 10.0, 0.0])
+def test_crossing_matches_a_step_simulation(profile, stat, threshold):
+    _assert_matches(profile, stat, threshold)
+
+
+@pytest.mark.parametrize("stat", decay.WATCHED_STATS)
+def test_stat_already_below_threshold_is_due_now(stat):
+    profile = _profile(10, 20, 25, 5)
+    assert decay.seconds_until(profile, stat, 30.0) == 0.0
+    assert stat not in decay.crossings(profile)
+    assert stat in decay.next_attention(profile, now=START)["low_stats"]
+
+
+def test_negative_threshold_is_never_reached():
+    profile = _profile(50, 50, 50, 50)
+    for stat in decay.WATCHED_STATS:
+        assert decay.seconds_until(profile, stat, -1.0) is None
+
+
+def test_zero_rate_stat_never_crosses(monkeypatch):
+    monkeypatch.setitem(decay.DECAY_RATES, "fun", 0.0)
+    profile = _profile(80, 60, 40, 90)
+    assert decay.seconds_until(profile, "fun", 30.0) is None
+    # Fun holds mood up at 90 / 4: it can reach 30 but never 20.
+    _assert_matches(profile, "mood", 30.0)
+    _assert_matches(profile, "mood", 22.5)
+    assert decay.seconds_until(profile, "mood", 20.0) is None
+    assert _simulate(profile, "mood", 20.0) is None
+
+
+def test_all_rates_zero(monkeypatch):
+    for key in decay.DECAY_RATES:
+        monkeypatch.setitem(decay.DECAY_RATES, key, 0.0)
+    profile = _profile(80, 60, 40, 90)
+    assert all(decay.seconds_until(profile, stat, 30.0) is None for stat in decay.WATCHED_STATS)
+    assert decay.next_attention(profile, now=START)["next_at"] is None
+
+
+def test_next_attention_picks_the_earliest_crossing():
+    profile = _profile(80, 40, 60, 35)
+    expected = {
+        stat: _simulate(profile, stat, decay.LOW_STAT) for stat in decay.WATCHED_STATS
+    }
+    attention = decay.next_attention(profile, now=START)
+    first = min(expected, key=expected.get)
+    assert attention["low_stats"] == []
+    assert attention["next_stats"] == [first]
+    seconds = (attention["next_at"] - START).total_seconds()
+    assert expected[first] - STEP <= seconds <= expected[first]
+
+    # Once that moment has passed, the stat is reported as due.
+    later = attention["next_at"] + timedelta(seconds=1)
+    assert first in decay.next_attention(profile, now=later)["low_stats"]
@@ -0,0 +1,95 @@
+import asyncio
+import itertools
+
+from app.models import ChatResult
+from app.services import feedback_pool
+from app.services.feedback_pool import FeedbackPool
+
+
+def _profile(hunger: float = 50) -> dict:
+    return {"hunger": hunger, "energy": 50, "hygiene": 50, "fun": 50, "equipped_items": {}}
+
+
+def _stub_llm(monkeypatch, replies):
+    calls = []
+
+    async def action_feedback(**kwargs):
+        calls.append(kwargs["action"])
+        return ChatResult(reply=next(replies), mood="happy", action="none")
+
+    monkeypatch.setattr(feedback_pool.chat_service, "action_feedback", action_feedback)
+    monkeypatch.setattr(feedback_pool.game, "get_shop_items", lambda: [])
+    return calls
+
+
+async def _settle(pool: FeedbackPool) -> None:
+    while pool._tasks:
+        await asyncio.gather(*pool._tasks)
+
+
+def test_refill_calls_once_per_missing_variant(monkeypatch):
+    calls = _stub_llm(monkeypatch, (f"reply {n}" for n in itertools.count()))
+    pool = FeedbackPool(size=4, low_water=2, ttl=60, stat_step=25, prerender=False)
+
+    async def run():
+        assert pool.take("feed", _profile()) is None
+        await _settle(pool)
+        assert len(calls) == 4
+        for _ in range(3):
+            assert pool.take("feed", _profile()) is not None
+        await _settle(pool)
+
+    asyncio.run(run())
+    # Below the low-water mark with one left: three more calls top it up.
+    assert len(calls) == 7
+
+
+def test_repeated_replies_are_not_retried(monkeypatch):
+    calls = _stub_llm(monkeypatch, itertools.repeat("same reply"))
+    pool = FeedbackPool(size=4, low_water=2, ttl=60, stat_step=25, prerender=False)
+
+    async def run():
+        pool.take("feed", _profile())
+        await _settle(pool)
+
+    asyncio.run(run())
+    assert len(calls) == 4
+    assert len(pool._pools[pool.key("feed", _profile())]) == 1
+
+
+def test_a_miss_costs_one_call_plus_one_batch(monkeypatch):
+    calls = _stub_llm(monkeypatch, (f"reply {n}" for n in itertools.count()))
+    pool = FeedbackPool(size=4, low_water=2, ttl=60, stat_step=25, prerender=False)
+
+    async def miss():
+        assert pool.take("feed", _profile()) is None
+        return await pool.fetch("feed", _profile())
+
+    async def run():
+        # Concurrent misses on one key share the synchronous call and the
+        # background batch.
+        results = await asyncio.gather(*(miss() for _ in range(5)))
+        await _settle(pool)
+        return results
+
+    results = asyncio.run(run())
+    assert len({result.reply for result in results}) == 1
+    assert results[0] is not results[1]
+    assert len(calls) == 1 + 4
+
+
+def test_keys_are_bounded_and_empty_pools_dropped(monkeypatch):
+    _stub_llm(monkeypatch, (f"reply {n}" for n in itertools.count()))
+    pool = FeedbackPool(size=1, low_water=1, ttl=60, stat_step=25, prerender=False, max_keys=2)
+
+    async def run():
+        for hunger in (0, 30, 60, 90):
+            pool.take("feed", _profile(hunger))
+        await _settle(pool)
+        assert len(pool._pools) == 2
+        assert pool.take("feed", _profile(90)) is not None
+        # Taking the only variant empties the pool; a refill is under way.
+        assert pool.key("feed", _profile(90)) not in pool._pools
+        await _settle(pool)
+
+    asyncio.run(run())
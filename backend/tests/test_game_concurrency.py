@@ -0,0 +1,55 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services import game
+
+THREADS = 8
+ROUNDS = 15
+ITEM = "hat_cap"
+
+
+def _worker(database, user_id: str, start: threading.Barrier) -> None:
+    start.wait()
+    for round_ in range(ROUNDS):
+        with database.write_transaction() as conn:
+            game.update_action(conn, user_id, ("feed", "play", "clean", "sleep")[round_ % 4])
+        with database.write_transaction() as conn:
+            game.update_minigame(conn, user_id, 300, 10_000)
+        # Every thread tries to buy the same item; only one purchase lands.
+        with database.write_transaction() as conn:
+            game.update_buy(conn, user_id, ITEM)
+        with game.unit_of_work(user_id) as unit:
+            unit.action("feed")
+            unit.minigame(30, None)
+
+
+def test_concurrent_updates_are_not_lost(database):
+    with database.get_conn() as conn:
+        start = game.fetch_profile(conn, "racer")
+    barrier = threading.Barrier(THREADS)
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        futures = [
+            executor.submit(_worker, database, "racer", barrier) for _ in range(THREADS)
+        ]
+        for future in futures:
+            future.result()
+
+    rounds = THREADS * ROUNDS
+    actions, minigames = 2 * rounds, 2 * rounds
+    # Actions pay 6 coins and 12 xp; a 300 point game under 25s pays 105
+    # coins and 60 xp, a 30 point one 10 coins and 8 xp.
+    coins = start["coins"] + 6 * actions + (105 + 10) * rounds - game.SHOP_MAP[ITEM]["price"]
+    xp = start["xp"] + 12 * actions + (60 + 8) * rounds
+    with database.get_conn() as conn:
+        profile = database.load_profile(conn, "racer")
+        events = database.last_event_seq(conn, profile["id"])
+        rebuilt = game.rebuild_profile(conn, "racer")
+    assert profile["coins"] == coins
+    assert profile["xp"] == xp
+    assert profile["level"] == 1 + profile["xp"] // 100
+    assert profile["owned_items"] == [ITEM]
+    assert events == actions + minigames + 1
+    for key in ("coins", "xp", "hunger", "energy", "hygiene", "fun", "mood"):
+        assert rebuilt[key] == pytest.approx(profile[key]), key
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from app.services.json_stream import ObjectStreamParser
+
+DOCUMENTS = [
+    '{"reply": "Mrrp! Hello there.", "mood": "happy", "action": "none"}',
+    '{"reply":"She said \\"hi\\" \\\\ waved\\/left\\n\\ttab","mood":"sad"}',
+    '{"reply": "Caf\\u00e9 \\u2014 \\ud83d\\ude38 purr", "equip": null}',
+    '{"reply": "", "score": -12.5e2, "count": 3, "ok": true, "bad": false, "none": null}',
+    '{"equip": {"hat": "crown", "tags": ["a", "}", "\\"]"]}, "reply": "ok"}',
+    '{"list": [1, [2, {"x": "y,z"}], "]"], "empty": [], "obj": {}}',
+    '{ \n "reply" :\t"spaced"  ,\r\n  "n" :  7 ,  "flag" :false \n}',
+    '```json\n{"reply": "fenced", "mood": "happy"}\n```',
+    '{"we\\"ird": "key", "uni\\u00e9": 1}',
+    "{}",
+]
+
+
+def _run(chunks: list[str]) -> tuple[ObjectStreamParser, dict, dict]:
+    parser = ObjectStreamParser()
+    values: dict = {}
+    deltas: dict = {}
+    for chunk in chunks:
+        for event, key, data in parser.feed(chunk):
+            if event == "delta":
+                assert key not in values
+                deltas[key] = deltas.get(key, "") + data
+            else:
+                assert key not in values
+                values[key] = data
+    return parser, values, deltas
+
+
+def _expected(document: str) -> dict:
+    start, end = document.index("{"), document.rindex("}") + 1
+    return json.loads(document[start:end])
+
+
+def _check(document: str, chunks: list[str]) -> None:
+    parser, values, deltas = _run(chunks)
+    expected = _expected(document)
+    assert parser.done
+    assert values == expected
+    # String values stream in full; anything else arrives only as a value.
+    assert deltas == {key: value for key, value in expected.items() if isinstance(value, str) and value}
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_every_two_way_split_matches_json_loads(document):
+    for offset in range(len(document) + 1):
+        _check(document, [document[:offset], document[offset:]])
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_every_three_way_split_matches_json_loads(document):
+    for first in range(len(document) + 1):
+        for second in range(first, len(document) + 1):
+            _check(document, [document[:first], document[first:second], document[second:]])
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_one_character_at_a_time_matches_json_loads(document):
+    _check(document, list(document))
+
+
+def test_surrogate_pair_split_between_escapes():
+    _, values, deltas = _run(['{"reply": "a\\ud83d', '\\ude38b"}'])
+    assert values == {"reply": "a\U0001f638b"}
+    assert deltas == {"reply": "a\U0001f638b"}
+
+
+def test_text_after_the_object_is_ignored():
+    parser, values, _ = _run(['{"reply": "hi"}', ' {"reply": "again"}'])
+    assert parser.done
+    assert values == {"reply": "hi"}
+
+
+@pytest.mark.parametrize("document", DOCUMENTS[:7])
+def test_truncated_input_reports_only_complete_values(document):
+    expected = _expected(document)
+    for offset in range(len(document)):
+        parser, values, deltas = _run([document[:offset]])
+        assert not parser.done
+        for key, value in values.items():
+            assert expected[key] == value
+        for key, text in deltas.items():
+            # A partial string is always a prefix of the final value.
+            assert expected[key].startswith(text)
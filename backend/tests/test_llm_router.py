@@ -0,0 +1,201 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services import chat as chat_service
+from app.services.llm_router import Backend, CircuitBreaker, NoBackendAvailable, Router
+
+
+class Overloaded(Exception):
+    pass
+
+
+def _backend(model: str, threshold: int = 2, cooldown: float = 0.05) -> Backend:
+    return Backend(provider="stub", model=model, breaker=CircuitBreaker(threshold, cooldown))
+
+
+def _router(backends, **kwargs) -> Router:
+    kwargs.setdefault("backoff", 0.001)
+    kwargs.setdefault("retryable", lambda exc: isinstance(exc, Overloaded))
+    return Router(backends, **kwargs)
+
+
+class Stub:
+    """Scripted stand-in providers: per model a delay and an optional error."""
+
+    def __init__(self, **behaviour):
+        self.behaviour = behaviour
+        self.calls: list[str] = []
+
+    async def __call__(self, backend: Backend) -> str:
+        self.calls.append(backend.model)
+        delay, error = self.behaviour.get(backend.model, (0.0, None))
+        await asyncio.sleep(delay)
+        if callable(error):
+            error = error()
+        if error is not None:
+            raise error
+        return backend.model
+
+    async def stream(self, backend: Backend):
+        result = await self(backend)
+        for piece in (result, "-", "done"):
+            yield piece
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_fails_over_to_the_next_backend():
+    stub = Stub(a=(0, ValueError("broken")))
+    router = _router([_backend("a"), _backend("b")])
+    assert _run(router.call(stub)) == "b"
+    assert stub.calls == ["a", "b"]
+
+
+def test_prefers_the_faster_backend_once_measured():
+    stub = Stub(a=(0.02, None), b=(0.0, None))
+    router = _router([_backend("a"), _backend("b")], min_samples=2)
+    for _ in range(4):
+        _run(router.call(stub))
+    assert router.ranked("call")[0].model == "b"
+
+
+def test_hedges_a_slow_backend():
+    stub = Stub(a=(0.5, None), b=(0.0, None))
+    a, b = _backend("a"), _backend("b")
+    router = _router([a, b], hedge_after=0.02)
+    started = time.monotonic()
+    assert _run(router.call(stub)) == "b"
+    assert time.monotonic() - started < 0.4
+    # The cancelled loser is neither a success nor a latency sample.
+    assert a.stats_for("call").count == 0
+    assert a.stats_for("call").error_rate == 0
+    assert b.stats_for("call").count == 1
+    assert b.stats_for("call").percentile(0.95) < 0.4
+    assert a.breaker.state == "closed"
+
+
+def test_cancelled_stream_loser_records_nothing():
+    stub = Stub(a=(0.5, None), b=(0.0, None))
+    a, b = _backend("a"), _backend("b")
+    router = _router([a, b], hedge_after=0.02)
+
+    async def collect():
+        return [chunk async for chunk in router.stream(stub.stream, kind="s")]
+
+    for _ in range(3):
+        assert _run(collect()) == ["b", "-", "done"]
+    assert a.stats_for("s").count == 0
+    assert b.stats_for("s").count == 3
+
+
+def test_hedged_stream_commits_to_the_first_chunk():
+    stub = Stub(a=(0.5, None), b=(0.0, None))
+    router = _router([_backend("a"), _backend("b")], hedge_after=0.02)
+
+    async def collect():
+        return [chunk async for chunk in router.stream(stub.stream)]
+
+    assert _run(collect()) == ["b", "-", "done"]
+
+
+def test_retries_retryable_errors_with_backoff():
+    failures = iter([Overloaded(), Overloaded()])
+    stub = Stub(a=(0, lambda: next(failures, None)))
+    router = _router([_backend("a")], retries=2, backoff=0.01)
+    started = time.monotonic()
+    assert _run(router.call(stub)) == "a"
+    assert stub.calls == ["a", "a", "a"]
+    assert time.monotonic() - started >= 0.03  # 0.01 + 0.02
+
+
+def test_does_not_retry_other_errors():
+    stub = Stub(a=(0, ValueError("bad request")))
+    router = _router([_backend("a")], retries=2)
+    with pytest.raises(ValueError):
+        _run(router.call(stub))
+    assert stub.calls == ["a"]
+
+
+def test_breaker_counts_one_failure_per_request():
+    stub = Stub(a=(0, Overloaded()), b=(0, Overloaded()))
+    a, b = _backend("a", threshold=3), _backend("b", threshold=3)
+    router = _router([a, b], retries=2)
+    with pytest.raises(Overloaded):
+        _run(router.call(stub))
+    assert stub.calls.count("a") == 3
+    assert a.breaker.failures == 1
+    assert a.breaker.state == "closed"
+
+
+def test_breaker_opens_then_half_open_probe_closes_it():
+    healthy = {"a": False}
+    stub = Stub(a=(0, lambda: None if healthy["a"] else ValueError("down")))
+    a, b = _backend("a", threshold=2, cooldown=0.05), _backend("b")
+    router = _router([a, b])
+    for _ in range(2):
+        assert _run(router.call(stub)) == "b"
+    assert a.breaker.state == "open"
+    stub.calls.clear()
+    assert _run(router.call(stub)) == "b"
+    assert stub.calls == ["b"]
+
+    time.sleep(0.06)
+    assert a.breaker.state == "half_open"
+    # A failed probe re-opens the circuit straight away.
+    assert _run(router.call(stub)) == "b"
+    assert a.breaker.state == "open"
+
+    time.sleep(0.06)
+    healthy["a"] = True
+    assert _run(router.call(stub)) == "a"
+    assert a.breaker.state == "closed"
+    assert a.breaker.failures == 0
+
+
+def test_half_open_lets_one_probe_through():
+    a = _backend("a", threshold=1, cooldown=0.0)
+    a.breaker.failure()
+    assert a.breaker.acquire()
+    assert not a.breaker.available()
+    a.breaker.release()
+    assert a.breaker.available()
+
+
+def test_all_circuits_open_is_no_backend_available():
+    stub = Stub(a=(0, ValueError("down")), b=(0, ValueError("down")))
+    router = _router([_backend("a", threshold=1), _backend("b", threshold=1)])
+    with pytest.raises(ValueError):
+        _run(router.call(stub))
+    with pytest.raises(NoBackendAvailable):
+        _run(router.call(stub))
+
+
+def test_single_backend_is_never_cut_off():
+    attempts = {"n": 0}
+
+    def flaky():
+        attempts["n"] += 1
+        return Overloaded() if attempts["n"] <= 20 else None
+
+    stub = Stub(a=(0, flaky))
+    a = _backend("a", threshold=2, cooldown=30)
+    router = _router([a], retries=0, breakers=False)
+    for _ in range(20):
+        with pytest.raises(Overloaded):
+            _run(router.call(stub))
+    assert _run(router.call(stub)) == "a"
+    assert a.breaker.state == "closed"
+
+
+@pytest.mark.parametrize(
+    "providers,breakers", [("openai", False), ("openai,openai:gpt-5-mini", True)]
+)
+def test_get_router_skips_breakers_for_one_provider(monkeypatch, providers, breakers):
+    monkeypatch.setenv("LLM_PROVIDERS", providers)
+    monkeypatch.setattr(chat_service, "_routers", {})
+    monkeypatch.setattr(chat_service, "_backends", {})
+    assert chat_service.get_router("chat").breakers is breakers
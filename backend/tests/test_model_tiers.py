@@ -0,0 +1,42 @@
+import pytest
+
+from app.services import chat as chat_service
+from app.services.llm_router import Backend, CircuitBreaker, Router
+
+
+@pytest.fixture
+def routers(monkeypatch):
+    routers = {
+        name: Router([Backend("openai", model, CircuitBreaker())])
+        for name, model in (("action_feedback", "gpt-5-mini"), ("fast", "gpt-5-nano"))
+    }
+    monkeypatch.setattr(chat_service, "get_router", lambda name="chat": routers[name])
+    monkeypatch.setattr(chat_service, "_downgrades", {})
+    return routers
+
+
+def _serve(routers, requests: int, latency: float) -> list[str]:
+    """Routes ``requests`` action-feedback calls; the preferred tier answers
+    in ``latency`` seconds and the fallback in 0.2s."""
+    tiers = []
+    for _ in range(requests):
+        tier, router = chat_service._select_tier("action_feedback", "action_feedback")
+        took = latency if tier.name == "action_feedback" else 0.2
+        router.backends[0].stats_for("action_feedback").record(took, True)
+        tiers.append(tier.name)
+    return tiers
+
+
+def test_downgrades_while_slow_and_recovers_soon_after(routers):
+    assert set(_serve(routers, 10, 0.5)) == {"action_feedback"}
+    slow = _serve(routers, 200, 3.0)
+    # Once over budget only the periodic probes reach the preferred tier.
+    assert slow[-100:].count("action_feedback") == 100 // chat_service.DOWNGRADE_PROBE_EVERY
+
+    recovered = _serve(routers, 200, 0.5)
+    first_back = recovered.index("action_feedback", chat_service.DOWNGRADE_PROBE_EVERY)
+    back_for_good = max(i for i, name in enumerate(recovered) if name == "fast") + 1
+    # A handful of fresh probes decide it, not a whole window of samples.
+    assert back_for_good <= 6 * chat_service.DOWNGRADE_PROBE_EVERY
+    assert first_back < back_for_good
+    assert "action_feedback" not in chat_service._downgrades
@@ -0,0 +1,73 @@
+import asyncio
+import contextlib
+import json
+from datetime import datetime, timezone
+
+from app.db import default_profile
+from app.services.profile_events import ProfileEvents
+
+
+def _profile(**changes) -> dict:
+    profile = default_profile("someone")
+    profile.update(id=1, last_updated=datetime.now(timezone.utc).isoformat(), **changes)
+    return profile
+
+
+def _payload(event: str) -> dict:
+    return json.loads(event.split("data: ", 1)[1])
+
+
+def test_poll_picks_up_changes_from_other_workers():
+    events = ProfileEvents(heartbeat=10, poll_interval=0.01)
+    initial = _profile()
+    elsewhere = _profile(coins=500)
+    seen = []
+
+    def poll(stamp):
+        seen.append(stamp)
+        if stamp == initial["last_updated"]:
+            return "stamp-2", elsewhere
+        return None
+
+    async def run():
+        stream = events.stream("someone", initial, stamp=initial["last_updated"], poll=poll)
+        await anext(stream)
+        update = _payload(await asyncio.wait_for(anext(stream), 1))
+        await stream.aclose()
+        return update
+
+    update = asyncio.run(run())
+    assert update["changes"]["coins"] == 500
+    assert seen[0] == initial["last_updated"]
+
+
+def test_local_publish_is_not_reloaded_by_poll():
+    events = ProfileEvents(heartbeat=10, poll_interval=0.01)
+    initial = _profile()
+    mutated = _profile(coins=200)
+    stored = {"stamp": initial["last_updated"]}
+    reloads = []
+
+    def poll(stamp):
+        if stamp == stored["stamp"]:
+            return None
+        reloads.append(stamp)
+        return stored["stamp"], mutated
+
+    async def run():
+        stream = events.stream("someone", initial, stamp=initial["last_updated"], poll=poll)
+        await anext(stream)
+        stored["stamp"] = mutated["last_updated"]
+        events.publish("someone", mutated)
+        update = _payload(await anext(stream))
+        # Let several polls run; none should find anything new.
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.1)
+        pending.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await pending
+        return update
+
+    update = asyncio.run(run())
+    assert update["changes"]["coins"] == 200
+    assert reloads == []
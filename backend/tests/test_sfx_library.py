@@ -0,0 +1,95 @@
+import asyncio
+import itertools
+import sqlite3
+
+import pytest
+
+from app.services.sfx_library import SFXLibrary, normalize_prompt, prompt_features, similarity
+from app.services.voice import DEFAULT_SFX_SIMILARITY_THRESHOLD
+
+# Prompts in the shape the chat model writes them, grouped by the clip that
+# could be reused for each.
+GROUPS = {
+    "meow": [
+        "soft meow",
+        "gentle meow",
+        "loud meow",
+        "happy cat meow",
+        "cute kitten meow",
+        "a cute little meow",
+        "meowing kitten",
+        "playful meows",
+    ],
+    "purr": ["soft purr", "happy purring", "cat purring contentedly", "purring cat"],
+    "yawn": ["tiny yawn", "sleepy cat yawn", "kitten yawning", "big sleepy yawn"],
+    "crunch": ["crunching kibble", "kibble crunch", "crunchy kibble sounds"],
+    "splash": ["water splash", "splashing water", "small water splash"],
+    "bubbles": ["bubbles popping", "bubble pop", "soap bubbles popping"],
+    "bell": ["jingle bell toy", "bell jingling", "jingling bell", "toy bell jingle"],
+    "snore": ["soft snoring", "cat snoring", "tiny snore", "gentle snores"],
+    "hiss": ["angry hiss", "cat hissing", "short hiss"],
+}
+# Different sounds that share a word.
+DISTINCT = [
+    ("gentle meow", "gentle purr"),
+    ("happy meow", "happy purr"),
+    ("meowing kitten", "kitten yawning"),
+    ("door creak", "door knock"),
+    ("water splash", "water drip"),
+    ("bell ding", "jingle bell"),
+]
+
+
+def _score(left: str, right: str) -> float:
+    return similarity(
+        prompt_features(normalize_prompt(left)), prompt_features(normalize_prompt(right))
+    )
+
+
+@pytest.mark.parametrize(
+    "left,right",
+    [pair for prompts in GROUPS.values() for pair in itertools.combinations(prompts, 2)],
+)
+def test_same_sound_clusters(left, right):
+    assert _score(left, right) >= DEFAULT_SFX_SIMILARITY_THRESHOLD
+
+
+@pytest.mark.parametrize(
+    "left,right",
+    DISTINCT
+    + [
+        (left, right)
+        for (group, prompts), (other, others) in itertools.combinations(GROUPS.items(), 2)
+        for left in prompts
+        for right in others
+    ],
+)
+def test_different_sounds_stay_apart(left, right):
+    assert _score(left, right) < DEFAULT_SFX_SIMILARITY_THRESHOLD
+
+
+async def _chunks():
+    yield b"clip"
+
+
+def _generate(library: SFXLibrary, prompt: str) -> None:
+    async def run() -> None:
+        async for _ in library.add_stream(prompt, _chunks()):
+            pass
+
+    asyncio.run(run())
+
+
+def test_index_is_shared_between_instances(tmp_path):
+    # Two instances stand in for two workers on the same directory.
+    first = SFXLibrary(tmp_path, 10_000, DEFAULT_SFX_SIMILARITY_THRESHOLD, max_variants=2)
+    second = SFXLibrary(tmp_path, 10_000, DEFAULT_SFX_SIMILARITY_THRESHOLD, max_variants=2)
+    _generate(first, "soft meow")
+    assert second.get("gentle meow") is None
+    _generate(second, "loud meow")
+    assert first.get("happy meow") is not None
+    assert second.stats()["clusters"] == 1
+    _generate(first, "cute meow")
+    with sqlite3.connect(tmp_path / "index.sqlite") as conn:
+        (variants,) = conn.execute("SELECT COUNT(*) FROM sfx_variant").fetchone()
+    assert variants == 2
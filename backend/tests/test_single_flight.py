@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+END = object()
+
+
+class Upstream:
+    """A provider stream whose chunks the test releases one at a time."""
+
+    def __init__(self) -> None:
+        self.opens = 0
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def open(self):
+        self.opens += 1
+        return self._chunks()
+
+    async def _chunks(self):
+        while (item := await self.queue.get()) is not END:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    async def send(self, *items) -> None:
+        for item in items:
+            await self.queue.put(item)
+        # Let the pump and any followers catch up.
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+
+async def _collect(stream) -> list[bytes]:
+    return [chunk async for chunk in stream]
+
+
+def test_late_joiner_gets_missed_chunks_then_the_live_tail():
+    async def run():
+        flight, upstream = SingleFlight(), Upstream()
+        first = asyncio.create_task(_collect(await flight.stream("k", upstream.open)))
+        await upstream.send(b"a", b"b")
+        late = asyncio.create_task(_collect(await flight.stream("k", upstream.open)))
+        await upstream.send(b"c", END)
+        return await first, await late, upstream.opens, flight.stats()
+
+    first, late, opens, stats = asyncio.run(run())
+    assert first == late == [b"a", b"b", b"c"]
+    assert opens == 1
+    assert stats == {"calls": 2, "coalesced": 1, "in_flight": 0}
+
+
+def test_leader_error_reaches_every_follower():
+    async def run():
+        flight, upstream = SingleFlight(), Upstream()
+        streams = [await flight.stream("k", upstream.open) for _ in range(3)]
+        followers = [asyncio.create_task(_collect(stream)) for stream in streams]
+        await upstream.send(b"a", RuntimeError("provider hung up"))
+        return await asyncio.gather(*followers, return_exceptions=True), flight.stats()
+
+    results, stats = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert stats["in_flight"] == 0
+
+
+def test_open_error_is_raised_for_every_caller():
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("no such voice")
+
+    async def run():
+        flight = SingleFlight()
+        callers = [flight.stream("k", fail) for _ in range(2)]
+        return await asyncio.gather(*callers, return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(run()))
+
+
+def test_cancelled_follower_leaves_the_others_running():
+    async def run():
+        flight, upstream = SingleFlight(), Upstream()
+        leaving = asyncio.create_task(_collect(await flight.stream("k", upstream.open)))
+        staying = asyncio.create_task(_collect(await flight.stream("k", upstream.open)))
+        await upstream.send(b"a")
+        leaving.cancel()
+        await upstream.send(b"b", END)
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+        return await staying, flight.stats()
+
+    chunks, stats = asyncio.run(run())
+    assert chunks == [b"a", b"b"]
+    assert stats["in_flight"] == 0
+
+
+def test_cancelled_only_follower_does_not_leave_the_key_in_flight():
+    async def run():
+        flight, upstream = SingleFlight(), Upstream()
+        follower = asyncio.create_task(_collect(await flight.stream("k", upstream.open)))
+        await upstream.send(b"a")
+        follower.cancel()
+        # The shared call finishes on its own and then forgets the key.
+        await upstream.send(b"b", END)
+        return flight.stats()
+
+    assert asyncio.run(run())["in_flight"] == 0
+
+
+def test_a_call_after_completion_starts_a_fresh_flight():
+    async def run():
+        flight, upstream = SingleFlight(), Upstream()
+        stream = await flight.stream("k", upstream.open)
+        await upstream.send(b"old", END)
+        first = await _collect(stream)
+        stream = await flight.stream("k", upstream.open)
+        await upstream.send(b"new", END)
+        return first, await _collect(stream), upstream.opens, flight.stats()
+
+    first, second, opens, stats = asyncio.run(run())
+    assert (first, second) == ([b"old"], [b"new"])
+    assert opens == 2
+    assert stats == {"calls": 2, "coalesced": 0, "in_flight": 0}
@@ -0,0 +1,113 @@
+import asyncio
+import functools
+import json
+
+import pytest
+
+from app import main
+from app.models import ChatResult
+from app.services import speech_pipeline
+from app.services.speech_pipeline import MIN_SENTENCE_CHARS, SentenceSplitter, SpeechPipeline
+
+
+def _split(*chunks: str) -> tuple[list[str], str | None]:
+    splitter = SentenceSplitter()
+    sentences = [sentence for chunk in chunks for sentence in splitter.feed(chunk)]
+    return sentences, splitter.flush()
+
+
+@pytest.mark.parametrize(
+    ("chunks", "sentences", "rest"),
+    [
+        (("Purr, that tickles! ", "Do it again?"), ["Purr, that tickles!"], "Do it again?"),
+        (("She said \"feed me now.\" ", "Then left."), ["She said \"feed me now.\""], "Then left."),
+        (("I'm full (truly full!) ", "yes."), ["I'm full (truly full!)"], "yes."),
+        (("Curly quotes “so comfy.” ", "Mew."), ["Curly quotes “so comfy.”"], "Mew."),
+        (("Well… ", "maybe later"), [], "Well… maybe later"),
+        (("Hmm, let me think… ", "okay!"), ["Hmm, let me think…"], "okay!"),
+        (("First line\nSecond line\n",), ["First line", "Second line"], None),
+        (("Nap time!!! ", "Zzz"), ["Nap time!!!"], "Zzz"),
+        # No whitespace after the stop yet: the sentence may still go on.
+        (("Version 2.5 is out",), [], "Version 2.5 is out"),
+        (("Wait.", " Yes it is.", " "), ["Wait. Yes it is."], None),
+    ],
+)
+def test_splitter_boundaries(chunks, sentences, rest):
+    assert _split(*chunks) == (sentences, rest)
+
+
+def test_short_fragments_merge_into_the_next_sentence():
+    assert len("Oh. ") < MIN_SENTENCE_CHARS
+    assert _split("Oh. ", "Hi. ", "That is lovely. ") == (["Oh. Hi. That is lovely."], None)
+    # A short fragment at the very end still comes out on flush.
+    assert _split("That is lovely. ", "Oh.") == (["That is lovely."], "Oh.")
+
+
+def test_audio_comes_out_in_order_when_segments_finish_out_of_order():
+    delays = {"First sentence here.": 0.05, "Second sentence here.": 0.0, "Third one.": 0.02}
+    finished: list[str] = []
+
+    async def synthesize(text: str) -> bytes:
+        await asyncio.sleep(delays[text])
+        finished.append(text)
+        if text == "Third one.":
+            raise RuntimeError("provider down")
+        return text.encode()
+
+    async def run():
+        out: asyncio.Queue = asyncio.Queue()
+        pipeline = SpeechPipeline(out, concurrency=3, synthesizer=synthesize)
+        pipeline.feed("First sentence here. Second sentence here. ")
+        pipeline.feed("Third one.")
+        await pipeline.finish()
+        return [out.get_nowait() for _ in range(out.qsize())]
+
+    items = asyncio.run(run())
+    assert finished[0] == "Second sentence here."
+    assert items == [
+        ("audio", 0, "First sentence here.", b"First sentence here."),
+        ("audio", 1, "Second sentence here.", b"Second sentence here."),
+        ("audio", 2, "Third one.", None),
+    ]
+
+
+def _events(stream: list[str]) -> list[tuple[str, dict]]:
+    events = []
+    for block in stream:
+        name, data = block.strip().split("\n")
+        events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_last_reply_sentence_is_spoken_before_the_rest_of_the_reply(database, monkeypatch):
+    spoken = asyncio.Event()
+
+    async def synthesize(text: str) -> bytes:
+        spoken.set()
+        return b"audio"
+
+    monkeypatch.setattr(
+        main.speech_pipeline,
+        "SpeechPipeline",
+        functools.partial(speech_pipeline.SpeechPipeline, synthesizer=synthesize),
+    )
+
+    async def llm():
+        yield "reply", "Mrrp, hello"
+        yield "reply", " there!"
+        yield "reply_end", None
+        # The remaining fields only arrive once the reply has been spoken.
+        await asyncio.wait_for(spoken.wait(), timeout=1)
+        yield "field", ("mood", "happy")
+        yield "result", ChatResult(reply="Mrrp, hello there!", mood="happy", action="none")
+
+    async def run():
+        profile = main._load_profile("speaker")
+        return [block async for block in main._chat_events("speaker", profile, {}, llm(), True)]
+
+    events = _events(asyncio.run(run()))
+    names = [name for name, _ in events]
+    assert names == ["reply", "reply", "audio", "field", "done", "audio_end"]
+    assert events[2][1]["index"] == 0
+    assert events[2][1]["text"] == "Mrrp, hello there!"
+    assert events[-1][1] == {"segments": 1}
@@ -0,0 +1,48 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+
+@pytest.fixture
+def client(database):
+    # Without the context manager the lifespan (provider clients, reminder
+    # bank) stays off; the database fixture has already set up the schema.
+    return TestClient(main.app)
+
+
+def test_issued_id_gets_its_own_profile(client):
+    user_id = client.post("/api/users").json()["user_id"]
+    assert main.USER_ID_PATTERN.fullmatch(user_id)
+    assert client.post("/api/users").json()["user_id"] != user_id
+
+    response = client.get("/api/profile", headers={"X-User-Id": user_id})
+    assert response.status_code == 200
+    assert response.json()["user_id"] == user_id
+    response = client.post("/api/actions/feed", headers={"X-User-Id": user_id})
+    assert response.status_code == 200
+
+
+def test_ids_the_server_did_not_issue_are_rejected(client):
+    response = client.get("/api/profile", headers={"X-User-Id": "made-up-id"})
+    assert response.status_code == 401
+    response = client.post("/api/actions/feed", headers={"X-User-Id": "made-up-id"})
+    assert response.status_code == 401
+    response = client.get("/api/profile/stream", params={"user_id": "made-up-id"})
+    assert response.status_code == 401
+    response = client.get("/api/profile", headers={"X-User-Id": "bad id!"})
+    assert response.status_code == 400
+
+
+def test_stored_profiles_keep_working(client, database):
+    # Profiles created before ids were issued are still accepted.
+    with database.write_transaction() as conn:
+        database.get_or_create_profile(conn, "existing-player")
+    response = client.get("/api/profile", headers={"X-User-Id": "existing-player"})
+    assert response.status_code == 200
+
+
+def test_requests_without_an_id_share_the_default_profile(client):
+    response = client.get("/api/profile")
+    assert response.status_code == 200
+    assert response.json()["user_id"] == main.DEFAULT_USER_ID
@@ -1,11 +1,44 @@
 const API_BASE =
   import.meta.env.VITE_API_BASE?.toString() || "http://localhost:8000";
+const USER_ID_KEY = "kit-user-id";
 
-async function request<T>(path: string, options: RequestInit = {}): Promise<T> {
+let pendingUserId: Promise<string> | null = null;
+
+// The server issues user ids and rejects ones it did not issue.
+function userId(): Promise<string> {
+  if (!pendingUserId) {
+    pendingUserId = (async () => {
+      const stored = localStorage.getItem(USER_ID_KEY);
+      if (stored) {
+        return stored;
+      }
+      const response = await fetch(`${API_BASE}/api/users`, { method: "POST" });
+      if (!response.ok) {
+        throw new Error((await response.text()) || "Could not create a user");
+      }
+      const { user_id: id } = (await response.json()) as { user_id: string };
+      localStorage.setItem(USER_ID_KEY, id);
+      return id;
+    })();
+    // Let a failed request be retried on the next call.
+    pendingUserId.catch(() => {
+      pendingUserId = null;
+    });
+  }
+  return pendingUserId;
+}
+
+async function request<T>(path: string, options: RequestInit = {}, retry = true): Promise<T> {
   const response = await fetch(`${API_BASE}${path}`, {
-    headers: { "Content-Type": "application/json" },
+    headers: { "Content-Type": "application/json", "X-User-Id": await userId() },
     ...options,
   });
+  if (response.status === 401 && retry) {
+    // The server no longer knows the stored id (e.g. a reset database).
+    localStorage.removeItem(USER_ID_KEY);
+    pendingUserId = null;
+    return request<T>(path, options, false);
+  }
   if (!response.ok) {
     const text = await response.text();
     throw new Error(text || "Request failed");
@@ -15,7 +48,7 @@ async function request<T>(path: string, options: RequestInit = {}): Promise<T> {
 
 async function requestBlob(path: string, options: RequestInit = {}): Promise<Blob> {
   const response = await fetch(`${API_BASE}${path}`, {
-    headers: { "Content-Type": "application/json" },
+    headers: { "Content-Type": "application/json", "X-User-Id": await userId() },
     ...options,
   });
   if (!response.ok) {
@@ -27,6 +60,7 @@ async function requestBlob(path: string, options: RequestInit = {}): Promise<Blo
 
 export interface Profile {
   id: number;
+  user_id: string;
   name: string;
   coins: number;
   level: number;
@@ -41,6 +75,20 @@ export interface Profile {
   equipped_items: Record<string, string>;
 }
 
+export type DecayStat = "hunger" | "energy" | "hygiene" | "fun";
+
+export interface DecaySchedule {
+  as_of: string;
+  rates: Record<DecayStat, number>;
+  low: number;
+  crossings: Partial<Record<DecayStat, string>>;
+}
+
+export interface ProfileStreamHandlers {
+  onProfile: (changes: Partial<Profile>, decay: DecaySchedule) => void;
+  onAttention: (stats: DecayStat[]) => void;
+}
+
 export interface ShopItem {
   id: string;
   name: string;
@@ -72,15 +120,235 @@ export interface ChatResult {
   sfx_prompt?: string | null;
 }
 
+export interface TokenUsage {
+  input_tokens: number;
+  cached_tokens: number;
+  output_tokens: number;
+}
+
 export interface ChatResponse {
   response: ChatResult;
   profile: Profile;
+  usage?: TokenUsage | null;
+  session_id?: string | null;
+}
+
+export type SayRequest =
+  | { kind: "chat"; message: ChatMessage; session_id?: string | null }
+  | { kind: "action_feedback"; action: "feed" | "sleep" | "clean" | "play" }
+  | { kind: "reminder" };
+
+export interface SayResult extends ChatResponse {
+  tts: Promise<Blob | null>;
+  sfx: Promise<Blob | null>;
+}
+
+interface Frame {
+  type: string;
+  payload: Uint8Array;
+}
+
+async function* readFrames(
+  reader: ReadableStreamDefaultReader<Uint8Array>
+): AsyncGenerator<Frame> {
+  let buffer = new Uint8Array(0);
+  for (;;) {
+    const newline = buffer.indexOf(10);
+    if (newline !== -1) {
+      const header = JSON.parse(new TextDecoder().decode(buffer.subarray(0, newline)));
+      const end = newline + 1 + header.length;
+      if (buffer.length >= end) {
+        yield { type: header.type, payload: buffer.slice(newline + 1, end) };
+        buffer = buffer.slice(end);
+        continue;
+      }
+    }
+    const { done, value } = await reader.read();
+    if (done) return;
+    const merged = new Uint8Array(buffer.length + value.length);
+    merged.set(buffer);
+    merged.set(value, buffer.length);
+    buffer = merged;
+  }
+}
+
+export async function say(body: SayRequest): Promise<SayResult> {
+  const response = await fetch(`${API_BASE}/api/say`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", "X-User-Id": await userId() },
+    body: JSON.stringify(body),
+  });
+  if (!response.ok || !response.body) {
+    const text = await response.text();
+    throw new Error(text || "Request failed");
+  }
+  const frames = readFrames(response.body.getReader());
+  const first = await frames.next();
+  if (first.done || first.value.type !== "result") {
+    throw new Error("Malformed say response");
+  }
+  const result = JSON.parse(new TextDecoder().decode(first.value.payload)) as ChatResponse;
+
+  const chunks: Record<string, Uint8Array[]> = { tts: [], sfx: [] };
+  const resolvers: Record<string, (blob: Blob | null) => void> = {};
+  const parts = {
+    tts: new Promise<Blob | null>((resolve) => (resolvers.tts = resolve)),
+    sfx: new Promise<Blob | null>((resolve) => (resolvers.sfx = resolve)),
+  };
+  void (async () => {
+    try {
+      for await (const frame of frames) {
+        if (frame.type === "tts" || frame.type === "sfx") {
+          chunks[frame.type].push(frame.payload);
+        } else if (frame.type === "tts_end" || frame.type === "sfx_end") {
+          const part = frame.type.slice(0, 3);
+          resolvers[part](
+            chunks[part].length ? new Blob(chunks[part], { type: "audio/mpeg" }) : null
+          );
+        } else if (frame.type === "error") {
+          const error = JSON.parse(new TextDecoder().decode(frame.payload));
+          chunks[error.part] = [];
+          console.warn("Say audio failed", error);
+        }
+      }
+    } catch (error) {
+      console.warn("Say stream failed", error);
+    } finally {
+      resolvers.tts(null);
+      resolvers.sfx(null);
+    }
+  })();
+  return { ...result, ...parts };
+}
+
+export interface ChatStreamHandlers {
+  onReply: (delta: string) => void;
+  onField?: (name: keyof ChatResult, value: unknown) => void;
+  // Spoken sentences, in order; audio is null when one failed to synthesize.
+  onSpeech?: (text: string, audio: Blob | null) => void;
+  onSpeechEnd?: () => void;
+}
+
+async function* readEvents(
+  reader: ReadableStreamDefaultReader<Uint8Array>
+): AsyncGenerator<{ event: string; data: string }> {
+  const decoder = new TextDecoder();
+  let buffer = "";
+  for (;;) {
+    const boundary = buffer.indexOf("\n\n");
+    if (boundary !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      let event = "message";
+      const data: string[] = [];
+      for (const line of block.split("\n")) {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) data.push(line.slice(5).trimStart());
+      }
+      if (data.length) yield { event, data: data.join("\n") };
+      continue;
+    }
+    const { done, value } = await reader.read();
+    if (done) return;
+    buffer += decoder.decode(value, { stream: true });
+  }
+}
+
+function decodeAudio(data: string | null): Blob | null {
+  if (!data) return null;
+  return new Blob([Uint8Array.from(atob(data), (char) => char.charCodeAt(0))], {
+    type: "audio/mpeg",
+  });
+}
+
+async function readSpeech(
+  events: AsyncGenerator<{ event: string; data: string }>,
+  handlers: ChatStreamHandlers
+) {
+  try {
+    for await (const { event, data } of events) {
+      if (event === "audio") {
+        const payload = JSON.parse(data);
+        handlers.onSpeech?.(payload.text, decodeAudio(payload.audio));
+      } else if (event === "audio_end" || event === "error") {
+        return;
+      }
+    }
+  } catch (error) {
+    console.warn("Speech stream failed", error);
+  } finally {
+    handlers.onSpeechEnd?.();
+  }
+}
+
+export async function streamChat(
+  message: ChatMessage,
+  sessionId: string | null,
+  handlers: ChatStreamHandlers
+): Promise<ChatResponse> {
+  // The server keeps the conversation; only the new message is sent.
+  const speak = Boolean(handlers.onSpeech);
+  const response = await fetch(`${API_BASE}/api/chat/stream`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", "X-User-Id": await userId() },
+    body: JSON.stringify({ session_id: sessionId, message, speak }),
+  });
+  if (!response.ok || !response.body) {
+    const text = await response.text();
+    throw new Error(text || "Request failed");
+  }
+  const events = readEvents(response.body.getReader());
+  // Iterate by hand: the speech segments still to come after "done" are read
+  // from the same generator once this returns.
+  for (let next = await events.next(); !next.done; next = await events.next()) {
+    const { event, data } = next.value;
+    const payload = JSON.parse(data);
+    if (event === "reply") {
+      handlers.onReply(payload.delta);
+    } else if (event === "field") {
+      handlers.onField?.(payload.name, payload.value);
+    } else if (event === "audio") {
+      handlers.onSpeech?.(payload.text, decodeAudio(payload.audio));
+    } else if (event === "done") {
+      if (speak) {
+        void readSpeech(events, handlers);
+      }
+      return payload as ChatResponse;
+    } else if (event === "error") {
+      throw new Error(payload.detail || "Chat failed");
+    }
+  }
+  throw new Error("Chat stream ended unexpectedly");
 }
 
 export async function getProfile(): Promise<Profile> {
   return request<Profile>("/api/profile");
 }
 
+export function subscribeProfile(handlers: ProfileStreamHandlers): () => void {
+  let source: EventSource | null = null;
+  let closed = false;
+  void userId().then((id) => {
+    if (closed) {
+      return;
+    }
+    source = new EventSource(
+      `${API_BASE}/api/profile/stream?user_id=${encodeURIComponent(id)}`
+    );
+    source.addEventListener("profile", (event) => {
+      const data = JSON.parse((event as MessageEvent).data);
+      handlers.onProfile(data.changes, data.decay);
+    });
+    source.addEventListener("attention", (event) => {
+      handlers.onAttention(JSON.parse((event as MessageEvent).data).stats);
+    });
+  });
+  return () => {
+    closed = true;
+    source?.close();
+  };
+}
+
 export async function getShop(): Promise<{ items: ShopItem[] }> {
   return request<{ items: ShopItem[] }>("/api/shop");
 }
@@ -113,10 +381,13 @@ export async function submitMinigame(
   });
 }
 
-export async function sendChat(messages: ChatMessage[]): Promise<ChatResponse> {
+export async function sendChat(
+  message: ChatMessage,
+  sessionId: string | null
+): Promise<ChatResponse> {
   return request("/api/chat", {
     method: "POST",
-    body: JSON.stringify({ messages }),
+    body: JSON.stringify({ session_id: sessionId, message }),
   });
 }
 
@@ -158,6 +429,7 @@ export async function transcribeSpeech(audio: Blob): Promise<{ text: string }> {
 
   const response = await fetch(`${API_BASE}/api/stt`, {
     method: "POST",
+    headers: { "X-User-Id": await userId() },
     body: formData,
   });
   if (!response.ok) {
@@ -5,14 +5,15 @@ import {
   getProfile,
   getShop,
   performAction,
-  requestActionFeedback,
-  requestReminder,
-  sendChat,
-  synthesizeSoundEffect,
-  synthesizeSpeech,
+  say,
+  streamChat,
   submitMinigame,
+  synthesizeSoundEffect,
+  subscribeProfile,
   type ChatMessage,
   type ChatResult,
+  type DecaySchedule,
+  type DecayStat,
   type Profile,
   type ShopItem,
 } from "../api/client";
@@ -29,12 +30,16 @@ let playbackToken = 0;
 let reminderTimer: number | undefined;
 let reminderInFlight = false;
 let lastReminderAt = 0;
+let closeProfileStream: (() => void) | null = null;
+let decayTimer: number | undefined;
+let clockOffsetMs = 0;
 
 const REMINDER_MIN_MS = 20000;
 const REMINDER_MAX_MS = 50000;
 const HUNGER_LOW = 30;
 const LOW_STAT = 30;
 const ANIMATION_DURATION_MS = 6000;
+const DECAY_TICK_MS = 1000;
 
 const ACTION_ANIMATIONS: Record<
   "feed" | "sleep" | "clean" | "play",
@@ -61,6 +66,23 @@ function needsAttention(profile: Profile | null) {
   );
 }
 
+function decayedProfile(
+  profile: Profile | null,
+  decay: DecaySchedule | null,
+  now: number
+): Profile | null {
+  if (!profile || !decay) return profile;
+  const serverNow = now - clockOffsetMs;
+  const elapsed = Math.max(0, (serverNow - Date.parse(profile.last_updated)) / 1000);
+  const next = { ...profile };
+  for (const [stat, rate] of Object.entries(decay.rates) as [DecayStat, number][]) {
+    next[stat] = Math.max(0, profile[stat] - rate * elapsed);
+  }
+  next.mood =
+    Math.round(((next.hunger + next.energy + next.hygiene + next.fun) / 4) * 10) / 10;
+  return next;
+}
+
 function stopAudioPlayback() {
   if (ttsAudio) {
     ttsAudio.pause();
@@ -93,20 +115,16 @@ function playAndWait(audio: HTMLAudioElement): Promise<void> {
   });
 }
 
-async function playTtsWithSfx(text: string, sfxPrompt?: string | null) {
-  if (!text.trim()) return;
+async function playAudio(tts: Promise<Blob | null>, sfx: Promise<Blob | null>) {
   const requestToken = ++playbackToken;
-  const trimmedPrompt = sfxPrompt?.trim();
   try {
-    const [ttsBlob, sfxBlob] = await Promise.all([
-      synthesizeSpeech(text),
-      trimmedPrompt ? synthesizeSoundEffect(trimmedPrompt) : Promise.resolve(null),
-    ]);
-    if (requestToken !== playbackToken) return;
+    const ttsBlob = await tts;
+    if (!ttsBlob || requestToken !== playbackToken) return;
     stopAudioPlayback();
     ttsUrl = URL.createObjectURL(ttsBlob);
     ttsAudio = new Audio(ttsUrl);
     await playAndWait(ttsAudio);
+    const sfxBlob = await sfx;
     if (!sfxBlob || requestToken !== playbackToken) return;
     sfxUrl = URL.createObjectURL(sfxBlob);
     sfxAudio = new Audio(sfxUrl);
@@ -116,6 +134,59 @@ async function playTtsWithSfx(text: string, sfxPrompt?: string | null) {
   }
 }
 
+function speechQueue() {
+  const ready: Blob[] = [];
+  let ended = false;
+  let wake: (() => void) | null = null;
+  return {
+    push(blob: Blob) {
+      ready.push(blob);
+      wake?.();
+    },
+    end() {
+      ended = true;
+      wake?.();
+    },
+    async *[Symbol.asyncIterator]() {
+      for (;;) {
+        const blob = ready.shift();
+        if (blob) {
+          yield blob;
+        } else if (ended) {
+          return;
+        } else {
+          await new Promise<void>((resolve) => (wake = resolve));
+          wake = null;
+        }
+      }
+    },
+  };
+}
+
+async function playSpeech(segments: AsyncIterable<Blob>, sfx: Promise<Blob | null>) {
+  // Each sentence plays as soon as it arrives, while later ones are still
+  // being synthesized on the server.
+  const requestToken = ++playbackToken;
+  try {
+    let spoke = false;
+    for await (const blob of segments) {
+      if (requestToken !== playbackToken) return;
+      stopAudioPlayback();
+      ttsUrl = URL.createObjectURL(blob);
+      ttsAudio = new Audio(ttsUrl);
+      await playAndWait(ttsAudio);
+      spoke = true;
+    }
+    const sfxBlob = await sfx;
+    if (!spoke || !sfxBlob || requestToken !== playbackToken) return;
+    sfxUrl = URL.createObjectURL(sfxBlob);
+    sfxAudio = new Audio(sfxUrl);
+    await playAndWait(sfxAudio);
+  } catch (error) {
+    console.warn("TTS/SFX playback failed", error);
+  }
+}
+
 export const useGameStore = defineStore("game", {
   state: () => ({
     profile: null as Profile | null,
@@ -123,12 +194,20 @@ export const useGameStore = defineStore("game", {
     loading: false,
     error: null as string | null,
     chatMessages: [] as ChatHistoryItem[],
+    chatSessionId: null as string | null,
     chatPending: false,
+    chatStreaming: false,
     chatError: null as string | null,
     chatResult: null as ChatResult | null,
     moodOverride: null as { mood: ChatResult["mood"]; until: number } | null,
     animationOverride: null as { animation: string; until: number } | null,
+    decay: null as DecaySchedule | null,
+    now: Date.now(),
   }),
+  getters: {
+    liveProfile: (state): Profile | null =>
+      decayedProfile(state.profile, state.decay, state.now),
+  },
   actions: {
     async loadProfile() {
       this.loading = true;
@@ -176,11 +255,8 @@ export const useGameStore = defineStore("game", {
     },
     async playActionFeedback(action: "feed" | "sleep" | "clean" | "play") {
       try {
-        const response = await requestActionFeedback(action);
-        void playTtsWithSfx(
-          response.response.reply,
-          response.response.sfx_prompt
-        );
+        const response = await say({ kind: "action_feedback", action });
+        void playAudio(response.tts, response.sfx);
       } catch (error) {
         console.warn("Action feedback failed", error);
       }
@@ -220,12 +296,44 @@ export const useGameStore = defineStore("game", {
       this.chatMessages.push(userMessage);
       this.chatPending = true;
       this.chatError = null;
+      const speech = speechQueue();
       try {
-        const apiMessages = this.chatMessages.slice(-12).map((msg) => ({
-          role: msg.role,
-          content: msg.content,
-        }));
-        const response = await sendChat(apiMessages);
+        let reply: ChatHistoryItem | null = null;
+        let setSfx: (sfx: Promise<Blob | null>) => void = () => {};
+        const sfx = new Promise<Blob | null>((resolve) => (setSfx = resolve));
+        let playing = false;
+        const response = await streamChat(
+          { role: "user", content: trimmed },
+          this.chatSessionId,
+          {
+            onReply: (delta) => {
+              if (!reply) {
+                this.chatMessages.push({ role: "assistant", content: "", at: Date.now() });
+                reply = this.chatMessages[this.chatMessages.length - 1];
+                this.chatStreaming = true;
+              }
+              reply.content += delta;
+            },
+            onField: (name, value) => {
+              if (name === "sfx_prompt" && typeof value === "string" && value.trim()) {
+                setSfx(synthesizeSoundEffect(value).catch(() => null));
+              }
+            },
+            onSpeech: (_text, audio) => {
+              if (!audio) return;
+              speech.push(audio);
+              if (!playing) {
+                playing = true;
+                void playSpeech(speech, sfx);
+              }
+            },
+            onSpeechEnd: () => {
+              speech.end();
+              setSfx(Promise.resolve(null));
+            },
+          }
+        );
+        this.chatSessionId = response.session_id ?? this.chatSessionId;
         this.profile = response.profile;
         this.chatResult = response.response;
         this.moodOverride = {
@@ -252,31 +360,30 @@ export const useGameStore = defineStore("game", {
         } else {
           this.animationOverride = null;
         }
-        const assistantMessage: ChatHistoryItem = {
-          role: "assistant",
-          content: response.response.reply,
-          at: Date.now(),
-        };
-        this.chatMessages.push(assistantMessage);
-        void playTtsWithSfx(
-          response.response.reply,
-          response.response.sfx_prompt
-        );
+        if (!reply) {
+          this.chatMessages.push({
+            role: "assistant",
+            content: response.response.reply,
+            at: Date.now(),
+          });
+        }
       } catch (error) {
+        speech.end();
         this.chatError =
           error instanceof Error ? error.message : "Chat failed";
       } finally {
         this.chatPending = false;
+        this.chatStreaming = false;
       }
     },
     async maybeSendReminder() {
       if (reminderInFlight || this.chatPending) return;
-      if (!needsAttention(this.profile)) return;
+      if (!needsAttention(this.liveProfile)) return;
       const now = Date.now();
       if (now - lastReminderAt < REMINDER_MIN_MS) return;
       reminderInFlight = true;
       try {
-        const response = await requestReminder();
+        const response = await say({ kind: "reminder" });
         lastReminderAt = Date.now();
         this.profile = response.profile;
         this.chatResult = response.response;
@@ -311,10 +418,7 @@ export const useGameStore = defineStore("game", {
             at: Date.now(),
           };
           this.chatMessages.push(assistantMessage);
-          void playTtsWithSfx(
-            response.response.reply,
-            response.response.sfx_prompt
-          );
+          void playAudio(response.tts, response.sfx);
         }
       } catch (error) {
         console.warn("Reminder failed", error);
@@ -325,6 +429,9 @@ export const useGameStore = defineStore("game", {
     startReminderLoop() {
       if (reminderTimer) return;
       const schedule = () => {
+        reminderTimer = undefined;
+        // Idle until the profile stream reports a stat crossing LOW_STAT.
+        if (!needsAttention(this.liveProfile)) return;
         const delay = randomBetween(REMINDER_MIN_MS, REMINDER_MAX_MS);
         reminderTimer = window.setTimeout(async () => {
           await this.maybeSendReminder();
@@ -340,5 +447,34 @@ export const useGameStore = defineStore("game", {
       }
       reminderInFlight = false;
     },
+    startProfileStream() {
+      if (closeProfileStream) return;
+      closeProfileStream = subscribeProfile({
+        onProfile: (changes, decay) => {
+          clockOffsetMs = Date.now() - Date.parse(decay.as_of);
+          this.profile = { ...this.profile, ...changes } as Profile;
+          this.decay = decay;
+          this.now = Date.now();
+        },
+        onAttention: () => {
+          this.now = Date.now();
+          void this.maybeSendReminder();
+          this.startReminderLoop();
+        },
+      });
+      decayTimer = window.setInterval(() => {
+        this.now = Date.now();
+      }, DECAY_TICK_MS);
+    },
+    stopProfileStream() {
+      if (closeProfileStream) {
+        closeProfileStream();
+        closeProfileStream = null;
+      }
+      if (decayTimer) {
+        window.clearInterval(decayTimer);
+        decayTimer = undefined;
+      }
+    },
   },
 });
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from app import db  # noqa: E402
+from app import main  # noqa: E402
+from app.services import game, reminder_bank  # noqa: E402
+
+ACTIONS = ["feed", "sleep", "clean", "play"]
+
+
+@contextmanager
+def unpooled_conn() -> Iterator[sqlite3.Connection]:
+    # The previous behaviour: a fresh connection per request, default journaling.
+    conn = sqlite3.connect(db.DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def unpooled() -> Iterator[None]:
+    """Routes every connection through ``unpooled_conn`` while active.
+
+    Each module bound the helpers at import, so each binding is swapped;
+    writes go back to a plain deferred transaction on a fresh connection.
+    """
+    replaced = []
+    for module in (db, main, game, reminder_bank):
+        for name in ("get_conn", "write_transaction"):
+            if hasattr(module, name):
+                replaced.append((module, name, getattr(module, name)))
+                setattr(module, name, unpooled_conn)
+    try:
+        yield
+    finally:
+        for module, name, original in replaced:
+            setattr(module, name, original)
+
+
+@contextmanager
+def pooled() -> Iterator[None]:
+    yield
+
+
+def journal_mode() -> str:
+    with sqlite3.connect(db.DB_PATH) as conn:
+        return conn.execute("PRAGMA journal_mode").fetchone()[0].upper()
+
+
+def request(users: int, write_ratio: float) -> None:
+    user_id = f"user-{random.randrange(users)}"
+    if random.random() < write_ratio:
+        main.take_action(random.choice(ACTIONS), user_id)
+    else:
+        main.get_profile(user_id)
+
+
+def run(label: str, requests: int, workers: int, users: int, write_ratio: float) -> None:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(request, users, write_ratio) for _ in range(requests)
+        ]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - started
+    print(f"{label:>8}: {requests / elapsed:8.0f} req/s ({elapsed:.2f}s)")
+
+
+def main_() -> None:
+    parser = argparse.ArgumentParser(description="Profile/action throughput, pooled vs. not")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=40)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    for label, connections, journal in (
+        ("before", unpooled, "DELETE"),
+        ("after", pooled, "WAL"),
+    ):
+        with tempfile.TemporaryDirectory() as tmp, connections():
+            db.DB_PATH = Path(tmp) / "bench.sqlite"
+            with sqlite3.connect(db.DB_PATH) as conn:
+                conn.execute(f"PRAGMA journal_mode={journal}")
+            db.init_db()
+            run(label, args.requests, args.workers, args.users, args.write_ratio)
+            db.close_pool()
+            mode = journal_mode()
+            if mode != journal:
+                raise SystemExit(f"{label}: expected journal_mode={journal}, found {mode}")
+
+if __name__ == "__main__":
+    main_()
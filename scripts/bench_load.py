@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator
+
+import httpx
+
+from fake_providers import add_behaviour_arguments
+
+ROOT = Path(__file__).resolve().parents[1]
+ENDPOINTS = ("profile", "actions", "chat", "tts", "sfx", "stt")
+ACTIONS = ("feed", "sleep", "clean", "play")
+WORDS = "happy sleepy hungry playful fluffy tiny curious cat kitten purr meow yarn fish nap".split()
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+class Load:
+    """Issues requests against one backend and records per-endpoint timings."""
+
+    def __init__(self, client: httpx.AsyncClient, users: int, text_pool: int) -> None:
+        self.client = client
+        self.users = users
+        self.text_pool = text_pool
+        self.user_ids: list[str] = []
+        self.sessions: dict[str, str] = {}
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+
+    async def register(self) -> None:
+        # The server only accepts user ids it issued.
+        for _ in range(self.users):
+            response = await self.client.post("/api/users")
+            response.raise_for_status()
+            self.user_ids.append(response.json()["user_id"])
+
+    def _user(self) -> str:
+        return random.choice(self.user_ids)
+
+    def _text(self, words: int) -> str:
+        # A pool of repeated texts exercises the audio caches; 0 makes every
+        # text unique, so each request reaches the provider.
+        rng = random.Random(random.randrange(self.text_pool)) if self.text_pool else random
+        return " ".join(rng.choice(WORDS) for _ in range(words))
+
+    async def profile(self, user: str) -> httpx.Response:
+        return await self.client.get("/api/profile", headers={"X-User-Id": user})
+
+    async def actions(self, user: str) -> httpx.Response:
+        action = random.choice(ACTIONS)
+        return await self.client.post(f"/api/actions/{action}", headers={"X-User-Id": user})
+
+    async def chat(self, user: str) -> httpx.Response:
+        body = {
+            "session_id": self.sessions.get(user),
+            "message": {"role": "user", "content": f"Hi Kit, are you {random.choice(WORDS)}?"},
+        }
+        response = await self.client.post("/api/chat", json=body, headers={"X-User-Id": user})
+        if response.status_code == 200:
+            self.sessions[user] = response.json()["session_id"]
+        return response
+
+    async def tts(self, user: str) -> httpx.Response:
+        return await self.client.post("/api/tts", json={"text": self._text(12)})
+
+    async def sfx(self, user: str) -> httpx.Response:
+        return await self.client.post("/api/sfx", json={"prompt": self._text(3)})
+
+    async def stt(self, user: str) -> httpx.Response:
+        files = {"audio": ("speech.webm", os.urandom(4096), "audio/webm")}
+        return await self.client.post("/api/stt", files=files)
+
+    async def one(self, endpoint: str) -> None:
+        request: Callable[[str], Awaitable[httpx.Response]] = getattr(self, endpoint)
+        started = time.perf_counter()
+        try:
+            response = await request(self._user())
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        self.latencies.setdefault(endpoint, []).append(time.perf_counter() - started)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+
+async def drive(args: argparse.Namespace, base_url: str) -> dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        load = Load(client, args.users, args.text_pool)
+        await load.register()
+        remaining = args.requests
+        deadline = time.perf_counter() + args.duration if args.duration else None
+
+        async def worker() -> None:
+            nonlocal remaining
+            while True:
+                if deadline is not None:
+                    if time.perf_counter() >= deadline:
+                        return
+                elif remaining <= 0:
+                    return
+                else:
+                    remaining -= 1
+                await load.one(random.choice(args.endpoints))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+        providers = None
+        if args.fake_url:
+            providers = (await client.get(f"{args.fake_url}/stats")).json()
+
+    def summary(latencies: list[float], errors: int) -> dict[str, Any]:
+        def ms(value: float | None) -> float | None:
+            return round(value * 1000, 2) if value is not None else None
+
+        return {
+            "requests": len(latencies),
+            "errors": errors,
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "p50_ms": ms(percentile(latencies, 0.5)),
+            "p95_ms": ms(percentile(latencies, 0.95)),
+            "p99_ms": ms(percentile(latencies, 0.99)),
+        }
+
+    every = [latency for values in load.latencies.values() for latency in values]
+    return {
+        "config": {
+            "base_url": base_url,
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "endpoints": args.endpoints,
+            "text_pool": args.text_pool,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "endpoints": {
+            endpoint: summary(load.latencies[endpoint], load.errors.get(endpoint, 0))
+            for endpoint in args.endpoints
+            if endpoint in load.latencies
+        },
+        "total": summary(every, sum(load.errors.values())),
+        "provider_calls": providers,
+    }
+
+
+def wait_ready(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with status {process.returncode}")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+@contextmanager
+def local_stack(args: argparse.Namespace) -> Iterator[str]:
+    """Starts the fake providers and the backend on a scratch database and caches."""
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    app_url = f"http://127.0.0.1:{args.port}"
+    behaviour = [
+        f"--latency-median={args.latency_median}",
+        f"--latency-p95={args.latency_p95}",
+        f"--error-rate={args.error_rate}",
+        f"--error-status={args.error_status}",
+        f"--chunks={args.chunks}",
+        f"--chunk-delay={args.chunk_delay}",
+        f"--audio-frames={args.audio_frames}",
+    ]
+    with tempfile.TemporaryDirectory(prefix="bench-load-") as scratch:
+        env = os.environ | {
+            "DB_PATH": str(Path(scratch) / "bench.sqlite"),
+            "TTS_CACHE_DIR": str(Path(scratch) / "tts"),
+            "SFX_CACHE_DIR": str(Path(scratch) / "sfx"),
+            "LLM_PROVIDER": args.provider,
+            "OPENAI_API_KEY": "fake",
+            "OPENAI_BASE_URL": f"{fake_url}/v1",
+            "GEMINI_API_KEY": "fake",
+            "GEMINI_BASE_URL": fake_url,
+            "ELEVENLABS_API_KEY": "fake",
+            "ELEVENLABS_BASE_URL": fake_url,
+        }
+        env.pop("LLM_PROVIDERS", None)
+        processes = [
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    str(ROOT / "scripts" / "fake_providers.py"),
+                    f"--port={args.fake_port}",
+                    *behaviour,
+                ],
+                # Keep stdout for the JSON report.
+                stdout=sys.stderr,
+            )
+        ]
+        try:
+            wait_ready(f"{fake_url}/stats", processes[0])
+            processes.append(
+                subprocess.Popen(
+                    [
+                        sys.executable, "-m", "uvicorn", "app.main:app",
+                        "--port", str(args.port), "--log-level", "warning",
+                        "--workers", str(args.workers),
+                    ],
+                    cwd=ROOT / "backend",
+                    env=env,
+                    # Keep stdout for the JSON report.
+                    stdout=sys.stderr,
+                )
+            )
+            wait_ready(f"{app_url}/api/shop", processes[1])
+            args.fake_url = fake_url
+            yield app_url
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+                process.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Load-test the API against local fake providers (or a running server) "
+        "and print per-endpoint throughput and latency percentiles as JSON"
+    )
+    parser.add_argument("--url", help="benchmark this running server instead of a local stack")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--duration", type=float, help="run for N seconds instead of --requests")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--text-pool", type=int, default=20, help="distinct TTS/SFX texts (0 = all unique)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", type=Path, help="write the JSON report here as well")
+    local = parser.add_argument_group("local stack")
+    local.add_argument("--provider", choices=("openai", "gemini"), default="openai")
+    local.add_argument("--port", type=int, default=8800)
+    local.add_argument("--fake-port", type=int, default=8900)
+    local.add_argument("--workers", type=int, default=1)
+    add_behaviour_arguments(local)
+    args = parser.parse_args()
+    args.fake_url = None
+
+    if args.url:
+        report = asyncio.run(drive(args, args.url))
+    else:
+        with local_stack(args) as url:
+            report = asyncio.run(drive(args, url))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
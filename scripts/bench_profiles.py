@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from app import db  # noqa: E402
+from app.services import game  # noqa: E402
+
+
+def populate(total: int, start: int) -> None:
+    base = db.default_profile()
+    rows = [{**base, "user_id": f"user-{index}"} for index in range(start, total)]
+    with db.get_conn() as conn:
+        conn.executemany(
+            """
+            INSERT INTO profile (
+                user_id, name, coins, level, xp, hunger, energy, hygiene, fun, mood,
+                last_updated
+            ) VALUES (
+                :user_id, :name, :coins, :level, :xp, :hunger, :energy, :hygiene,
+                :fun, :mood, :last_updated
+            )
+            """,
+            rows,
+        )
+        conn.commit()
+
+
+def measure(total: int, samples: int) -> tuple[float, float]:
+    timings = []
+    with db.get_conn() as conn:
+        for _ in range(samples):
+            user_id = f"user-{random.randrange(total)}"
+            started = time.perf_counter()
+            game.fetch_profile(conn, user_id)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile lookup latency vs. table size")
+    parser.add_argument("--sizes", default="1,100,1000,10000,100000")
+    parser.add_argument("--samples", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "bench.sqlite"
+        db.init_db()
+        populated = 0
+        print(f"{'profiles':>10} {'p50 ms':>8} {'p95 ms':>8}")
+        for size in sorted(int(value) for value in args.sizes.split(",")):
+            populate(size, populated)
+            populated = size
+            p50, p95 = measure(size, args.samples)
+            print(f"{size:>10} {p50:>8.3f} {p95:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
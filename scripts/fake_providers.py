@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+# Stand-ins for the OpenAI Responses, Gemini and ElevenLabs endpoints the
+# backend calls. Point the SDKs here with OPENAI_BASE_URL=<url>/v1,
+# GEMINI_BASE_URL=<url> and ELEVENLABS_BASE_URL=<url>.
+
+REPLIES = [
+    "Meow! I'm so happy you're here. Want to play with my yarn?",
+    "Purr... that tickles! Could you brush my fur a bit more?",
+    "I'm getting sleepy. Maybe a short nap would help me recharge.",
+    "Ooh, is that a snack? My tummy is rumbling, meow!",
+    "Thanks for taking care of me. You're the best friend a cat could have.",
+]
+SFX_PROMPTS = ["soft purr", "happy meow", "tiny yawn", None]
+# A silent MPEG-1 Layer III frame (128 kbps, 44.1 kHz, 417 bytes).
+MP3_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+@dataclass
+class Behaviour:
+    latency_median: float
+    latency_p95: float
+    error_rate: float
+    error_status: int
+    chunks: int
+    chunk_delay: float
+    audio_frames: int
+
+    def latency(self) -> float:
+        # Log-normal: most calls near the median, with a long right tail.
+        if self.latency_median <= 0:
+            return 0.0
+        spread = max(self.latency_p95, self.latency_median) / self.latency_median
+        sigma = math.log(spread) / 1.645
+        return random.lognormvariate(math.log(self.latency_median), sigma)
+
+    def fails(self) -> bool:
+        return random.random() < self.error_rate
+
+
+def _reply_json() -> str:
+    return json.dumps(
+        {
+            "reply": random.choice(REPLIES),
+            "mood": random.choice(["happy", "neutral", "tired"]),
+            "action": "none",
+            "equip": None,
+            "animation": None,
+            "sfx_prompt": random.choice(SFX_PROMPTS),
+        }
+    )
+
+
+def _pieces(text: str, count: int) -> list[str]:
+    size = max(1, math.ceil(len(text) / max(1, count)))
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def create_app(behaviour: Behaviour) -> FastAPI:
+    app = FastAPI(title="Fake providers")
+    app.state.requests = {}
+
+    async def start(name: str) -> JSONResponse | None:
+        app.state.requests[name] = app.state.requests.get(name, 0) + 1
+        await asyncio.sleep(behaviour.latency())
+        if behaviour.fails():
+            error = {"code": behaviour.error_status, "message": "fake failure"}
+            return JSONResponse({"error": error}, status_code=behaviour.error_status)
+        return None
+
+    async def paced(items: list[Any]) -> AsyncIterator[Any]:
+        for index, item in enumerate(items):
+            if index:
+                await asyncio.sleep(behaviour.chunk_delay)
+            yield item
+
+    def sse(events: list[dict[str, Any]], named: bool) -> StreamingResponse:
+        async def body() -> AsyncIterator[bytes]:
+            async for event in paced(events):
+                prefix = f"event: {event['type']}\n" if named else ""
+                yield f"{prefix}data: {json.dumps(event)}\n\n".encode()
+
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    def stats() -> dict[str, int]:
+        return app.state.requests
+
+    @app.post("/v1/responses")
+    async def openai_responses(request: Request) -> Response:
+        payload = await request.json()
+        if (error := await start("openai")) is not None:
+            return error
+        text = _reply_json() if "text" in payload else "The user and Kit chatted happily."
+        response_id = f"resp_{uuid.uuid4().hex}"
+        response = {
+            "id": response_id,
+            "object": "response",
+            "created_at": int(time.time()),
+            "model": payload.get("model", "gpt-5"),
+            "status": "completed",
+            "output": [
+                {
+                    "type": "message",
+                    "id": f"msg_{uuid.uuid4().hex}",
+                    "role": "assistant",
+                    "status": "completed",
+                    "content": [{"type": "output_text", "text": text, "annotations": []}],
+                }
+            ],
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+            "usage": {
+                "input_tokens": 900,
+                "input_tokens_details": {"cached_tokens": 768},
+                "output_tokens": len(text) // 4,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": 900 + len(text) // 4,
+            },
+        }
+        if not payload.get("stream"):
+            return JSONResponse(response)
+        events = [
+            {
+                "type": "response.output_text.delta",
+                "item_id": response["output"][0]["id"],
+                "output_index": 0,
+                "content_index": 0,
+                "delta": piece,
+                "logprobs": [],
+                "sequence_number": index,
+            }
+            for index, piece in enumerate(_pieces(text, behaviour.chunks))
+        ]
+        events.append(
+            {"type": "response.completed", "response": response, "sequence_number": len(events)}
+        )
+        return sse(events, named=True)
+
+    @app.post("/v1beta/models/{target}")
+    async def gemini_generate(target: str) -> Response:
+        if (error := await start("gemini")) is not None:
+            return error
+        _, _, method = target.partition(":")
+        text = _reply_json() if method else ""
+
+        def chunk(piece: str, last: bool) -> dict[str, Any]:
+            data: dict[str, Any] = {
+                "candidates": [{"content": {"role": "model", "parts": [{"text": piece}]}}]
+            }
+            if last:
+                data["candidates"][0]["finishReason"] = "STOP"
+                data["usageMetadata"] = {
+                    "promptTokenCount": 900,
+                    "cachedContentTokenCount": 768,
+                    "candidatesTokenCount": len(text) // 4,
+                }
+            return data
+
+        if method != "streamGenerateContent":
+            return JSONResponse(chunk(text, True))
+        pieces = _pieces(text, behaviour.chunks)
+        return sse(
+            [chunk(piece, i == len(pieces) - 1) for i, piece in enumerate(pieces)], named=False
+        )
+
+    def audio() -> StreamingResponse:
+        frames = max(1, behaviour.audio_frames)
+        per_chunk = max(1, frames // max(1, behaviour.chunks))
+        chunks = [MP3_FRAME * min(per_chunk, frames - i) for i in range(0, frames, per_chunk)]
+        return StreamingResponse(paced(chunks), media_type="audio/mpeg")
+
+    @app.post("/v1/text-to-speech/{voice_id}/stream")
+    async def elevenlabs_tts(voice_id: str) -> Response:
+        if (error := await start("elevenlabs_tts")) is not None:
+            return error
+        return audio()
+
+    @app.post("/v1/sound-generation")
+    async def elevenlabs_sfx() -> Response:
+        if (error := await start("elevenlabs_sfx")) is not None:
+            return error
+        return audio()
+
+    @app.post("/v1/speech-to-text")
+    async def elevenlabs_stt() -> Response:
+        if (error := await start("elevenlabs_stt")) is not None:
+            return error
+        return JSONResponse(
+            {
+                "language_code": "eng",
+                "language_probability": 1.0,
+                "text": "Hello Kit, are you hungry?",
+                "words": [],
+            }
+        )
+
+    return app
+
+
+def add_behaviour_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-median", type=float, default=0.3, help="seconds before the first byte")
+    parser.add_argument("--latency-p95", type=float, default=0.9)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--chunks", type=int, default=8, help="pieces per streamed response")
+    parser.add_argument("--chunk-delay", type=float, default=0.02)
+    parser.add_argument("--audio-frames", type=int, default=120, help="MP3 frames per clip (~26ms each)")
+
+
+def behaviour_from(args: argparse.Namespace) -> Behaviour:
+    return Behaviour(
+        latency_median=args.latency_median,
+        latency_p95=args.latency_p95,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        chunks=args.chunks,
+        chunk_delay=args.chunk_delay,
+        audio_frames=args.audio_frames,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-ins for the LLM and voice providers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_behaviour_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(behaviour_from(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
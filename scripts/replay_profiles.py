@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from app import db  # noqa: E402
+from app.services import game  # noqa: E402
+
+STATS = ("coins", "level", "xp", "hunger", "energy", "hygiene", "fun", "mood")
+
+
+def differences(stored: dict, rebuilt: dict) -> list[str]:
+    diffs = [
+        f"{key}: {stored[key]!r} != {rebuilt[key]!r}"
+        for key in STATS
+        if abs(stored[key] - rebuilt[key]) > 1e-6
+    ]
+    for key in ("last_updated", "owned_items", "equipped_items"):
+        if stored[key] != rebuilt[key]:
+            diffs.append(f"{key}: {stored[key]!r} != {rebuilt[key]!r}")
+    return diffs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Rebuild every profile from its snapshot and event log and "
+        "compare it with the stored projection"
+    )
+    parser.add_argument("--db", type=Path, default=db.db_path())
+    args = parser.parse_args()
+
+    db.DB_PATH = args.db
+    db.init_db()
+    checked = mismatched = 0
+    with db.get_conn() as conn:
+        user_ids = [row["user_id"] for row in conn.execute("SELECT user_id FROM profile")]
+        for user_id in user_ids:
+            stored = db.load_profile(conn, user_id)
+            rebuilt = game.rebuild_profile(conn, user_id)
+            checked += 1
+            diffs = differences(stored, rebuilt)
+            if diffs:
+                mismatched += 1
+                print(f"{user_id}:")
+                for diff in diffs:
+                    print(f"  {diff}")
+    print(f"Checked {checked} profiles, {mismatched} mismatched")
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()